@@ -7,6 +7,7 @@ from config.opensearch_mappings import PRODUCT_MAPPING, GROUP_RECOMMENDATION_MAP
 from api.dto.request.NewUserRequest import NewUserRequest
 from api.dto.response.NewUserResponse import NewUserResponse
 from product.service.new_user_recommendation_service import NewUserRecommendationService
+from product.service.index_refresher import IndexRefresher
 from groupboard.service.group_recommendation_service import GroupRecommendationService
 
 # 로깅 설정
@@ -18,12 +19,23 @@ router = APIRouter()
 # RecommendationService 인스턴스 생성
 product_service = NewUserRecommendationService()
 
+# 새 FAISS 인덱스 bundle이 올라오면 재시작 없이 백그라운드에서 교체
+index_refresher = IndexRefresher(product_service)
+index_refresher.start()
+
 groupboard_service = GroupRecommendationService(
     s3_bucket="team6-mlops-bucket", 
     opensearch_index="group-recommendations",
     mapping=GROUP_RECOMMENDATION_MAPPING
 )
 
+@router.get("/new-user/index-status")
+def get_index_status():
+    """
+    신규 사용자 추천에 사용 중인 FAISS 인덱스 상태 및 교체 메트릭 조회
+    """
+    return index_refresher.status()
+
 @router.post("/new-user", response_model=NewUserResponse)
 def recommend_for_new_user(request: NewUserRequest):
     now = datetime.datetime.now()
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from product.service.recommendation_service import RecommendationService
+from product.service.realtime_recommendation_service import RealtimeRecommendationService
 import logging
 from config.opensearch_mappings import PRODUCT_MAPPING
 import datetime
@@ -13,6 +14,17 @@ router = APIRouter()
 # RecommendationService 인스턴스 생성
 service = RecommendationService()
 
+# 최근 추천 문서가 없는 사용자용 실시간 추천 (REALTIME_RECOMMENDATION_ENABLED로 활성화, 엔진은 백그라운드 warm-up)
+realtime_service = RealtimeRecommendationService(pipeline_service=service, repository=service.repository)
+realtime_service.start()
+
+@router.get("/recommendations-realtime/status")
+def get_realtime_status():
+    """
+    실시간 추천 엔진 상태 및 지연 시간 메트릭 조회
+    """
+    return realtime_service.status()
+
 @router.get("/recommendations/{user_id}")
 def get_recommendations(user_id: int):
     """
@@ -20,7 +32,13 @@ def get_recommendations(user_id: int):
     """
     try:
         recommendations = service.repository.get_recommendation_from_opensearch(str(user_id))
-        
+
+        # 최근 14일 추천 문서가 없으면 실시간 추천으로 대체 (비활성화/준비 전/시간 초과면 None)
+        if not recommendations or recommendations.get("status") != "success":
+            realtime = realtime_service.recommend(user_id, top_k=4)
+            if realtime is not None:
+                return realtime
+
         if not recommendations:
             raise HTTPException(
                 status_code=404, 
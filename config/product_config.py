@@ -0,0 +1,64 @@
+import os
+
+# 상품 임베딩 설정
+EMBEDDING_MODEL_NAME = 'jhgan/ko-sroberta-multitask'
+EMBEDDING_CACHE_DIR = 'embedding_cache'  # 상품 임베딩 디스크 캐시 경로
+CATEGORY_POOL_CACHE_DIR = 'category_pool_cache'  # 상품 1인가구 적합도 점수 디스크 캐시 경로 (None이면 사용 안 함)
+
+# 추천 카테고리 (카테고리 pool, FAISS 카테고리 sub-index, 추천 엔진 공통 - 대분류에 카테고리명이 포함되면 해당 카테고리)
+RECOMMENDATION_CATEGORIES = ['신선식품', '가공식품', '주방용품', '생활용품']
+
+# 임베딩 인코더 backend
+# - torch: sentence-transformers(PyTorch), onnx: ONNX Runtime (test/benchmark/bench_onnx_encoder.py로 비교)
+EMBEDDING_BACKEND = 'torch'
+ONNX_QUANTIZE = True            # onnx backend에서 int8 dynamic quantization 사용 여부
+ONNX_EXPORT_DIR = 'onnx_models' # ONNX 모델 내보내기 경로
+
+# FAISS 인덱스 설정
+# - flat: 정확 검색, hnsw/ivf_flat/ivf_pq: 근사 검색 (test/benchmark/bench_faiss_index.py로 비교)
+FAISS_INDEX_TYPE = 'flat'
+FAISS_INDEX_PARAMS = {}  # 예: {'ef_search': 128} 또는 {'nlist': 1024, 'nprobe': 16}
+# compact 모드 예: {'reduce_dim': 256, 'reduce_method': 'pca', 'storage': 'fp16'}
+# - 메모리 절감/recall 손실은 test/benchmark/bench_faiss_compact.py로 확인
+
+# FAISS 인덱스 bundle 설정
+FAISS_ARTIFACT_DIR = 'faiss_artifact'  # 로컬 bundle 디렉토리
+FAISS_S3_PREFIX = 'faiss_index'        # S3 경로: {FAISS_S3_PREFIX}/{YYYY-MM-DD}_index/
+FAISS_REFRESH_INTERVAL_SEC = 600      # API에서 새 bundle 확인 주기 (0이면 자동 교체 비활성화)
+
+# 사용자 활동 로그 스트리밍 로드 설정 (product/processor/activity_log_reader.py)
+LOG_STREAM_CHUNK_BYTES = 1 << 20  # S3 로그 파일 읽기 단위 (바이트)
+LOG_CHUNK_ROWS = 100_000          # 로그 행을 컬럼 배열로 변환하는 단위
+
+# 전체 사용자 추천 병렬 실행 설정 (product/service/sharded_runner.py)
+RECOMMENDATION_WORKERS = 0       # worker 프로세스 수 (0이면 CPU 코어 수, 1이면 현재 프로세스에서 실행)
+RECOMMENDATION_SHARD_SIZE = 2000 # shard당 사용자 수
+SINK_BATCH_SIZE = 500            # S3/OpenSearch 묶음 저장 단위
+SINK_S3_WORKERS = 8              # S3 동시 업로드 스레드 수
+
+# FAISS fallback 검색 깊이 (product/core/faiss_fallback.py)
+# - 작은 깊이로 검색해서 제외/삭제 상품 때문에 부족하면 깊이를 2배씩 늘려 재검색
+FAISS_FALLBACK_START_K = 16
+FAISS_FALLBACK_MAX_K = 1024
+FAISS_FALLBACK_CACHE_SIZE = 10_000  # 쿼리별 검색 결과 캐시 최대 개수 (LRU - 오래 유지되는 실시간 엔진의 메모리 상한)
+
+# 추천 히스토리 설정 (product/processor/recommendation_history.py)
+RECOMMENDATION_HISTORY_DB = 'recommendation_history/history.db'  # SQLite 저장 경로 (None이면 메모리에만 보관)
+HISTORY_MAX_USERS = 1_000_000    # 메모리에 보관할 최대 사용자 수 (LRU)
+HISTORY_FLUSH_EVERY = 1000       # 변경된 사용자가 이만큼 쌓이면 DB에 저장
+
+# 추천 파이프라인 단계별 지연 시간 예산(ms) (product/core/pipeline.py)
+# - 최근 소요 시간이 예산을 넘는 단계는 사용자별 추천(recommend)에서 건너뛰고 다음 fallback으로 진행
+# - emergency/finalize 단계는 예산 없이 항상 실행, 배치 추천(recommend_all)은 건너뛰지 않고 시간만 기록
+PIPELINE_STAGE_BUDGETS_MS = {
+    'preferred_category': 30,
+    'other_categories': 50,
+    'faiss_fallback': 80,
+}
+
+# 기존 사용자 실시간 추천 설정 (product/service/realtime_recommendation_service.py)
+# - API에서 최근 추천 문서가 없을 때 메모리에 준비된 추천 엔진으로 바로 계산 (환경 변수로 활성화)
+REALTIME_RECOMMENDATION_ENABLED = os.getenv('REALTIME_RECOMMENDATION_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+REALTIME_TIMEOUT_MS = 200        # 요청당 지연 시간 목표 - 엔진 대기가 이보다 길면 실시간 추천 생략
+REALTIME_SAVE_RESULTS = True     # 실시간 추천 결과를 S3/OpenSearch에 백그라운드로 저장
+REALTIME_ARTIFACT_DIR = 'faiss_artifact_realtime'  # 실시간 추천 엔진 전용 로컬 bundle 디렉토리 (신규 사용자 refresher와 분리)
@@ -0,0 +1,18 @@
+# MySQL 테이블 로컬 스냅샷 설정 (utils/storage/table_snapshot.py)
+TABLE_SNAPSHOT_DIR = 'table_snapshots'   # Parquet 스냅샷 저장 경로
+TABLE_SNAPSHOT_MIN_REFRESH_SEC = 60      # 마지막 갱신 후 이 시간 안에는 DB 조회 없이 스냅샷 사용
+TABLE_SNAPSHOT_FULL_REFRESH_HOURS = 24   # 이 시간이 지나면 증분 갱신 대신 전체 다시 읽기
+TABLE_SNAPSHOT_LOOKBACK_SEC = 300        # updated_at 워터마크 여유 (늦게 커밋된 변경 대비)
+
+# 테이블별 스냅샷 규칙
+# - primary_key: 변경 행 교체/삭제 행 제거 기준 컬럼
+# - watermark: 변경 행 조회 기준 컬럼 (None이면 primary_key보다 큰 새 행만 조회 - 추가만 되는 테이블용)
+# - categoricals: category dtype으로 보관할 컬럼 (값 종류가 적은 컬럼만)
+# 스냅샷에 primary_key/watermark 컬럼이 없으면 매번 전체 다시 읽기
+TABLE_SNAPSHOT_SPECS = {
+    'products': {'primary_key': 'product_id', 'watermark': 'updated_at'},
+    'categories': {'primary_key': 'category_id', 'watermark': None},
+    'users': {'primary_key': 'user_id', 'watermark': 'updated_at', 'categoricals': ['gender']},
+    'favorite_products': {'primary_key': 'favorite_product_id', 'watermark': 'updated_at', 'categoricals': ['product_type']},
+    'group_boards': {'primary_key': 'group_board_id', 'watermark': 'updated_at'},
+}
@@ -3,22 +3,24 @@ from datetime import datetime, timedelta
 from typing import Tuple
 from config.group_board_config import ANALYSIS_DAYS
 from utils.storage.mysql_manager import MySQLManager
+from utils.storage.table_snapshot import TableSnapshotStore
 
 class DataProcessor:
     """데이터 로드 및 전처리 담당 클래스"""
     
     def __init__(self):
         self.mysql = MySQLManager()
+        self.snapshots = TableSnapshotStore(self.mysql)
         self.users = None
         self.group_boards = None
         self.recent_activities = None
         
     def load_data(self) -> bool:
-        """백엔드 MySQL에서 데이터 추출해서 반환"""
+        """백엔드 MySQL에서 데이터 추출해서 반환 (로컬 스냅샷에서 변경된 행만 갱신)"""
         try:
-            favorite_products = self.mysql.read_table('favorite_products')
-            self.users = self.mysql.read_table('users')
-            self.group_boards = self.mysql.read_table('group_boards')
+            favorite_products = self.snapshots.read_table('favorite_products')
+            self.users = self.snapshots.read_table('users')
+            self.group_boards = self.snapshots.read_table('group_boards')
             self.recent_activities = self.filter_recent_group_favorites(favorite_products)
             
             return True
@@ -1,20 +1,94 @@
+import numpy as np
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, List, Set, Optional
 
+from config.product_config import CATEGORY_POOL_CACHE_DIR
 from product.processor.category_pool import CategoryPoolBuilder
-from product.processor.recommendation_data import RecommendationDataBuilder
+from product.processor.recommendation_data import RecommendationDataBuilder, RecommendationRecord
+from product.feature.behavior_booster import BehaviorBooster
 
 class CategoryRecommender:
     """
     카테고리별 추천 후보 추출 담당 클래스
     - 카테고리별로 미리 구축된 상품 pool에서 추천 후보 추출
+    - pool은 1인가구 적합도 점수 내림차순(stable)으로 한 번만 정렬해서 배열로 보관하고,
+      추천 시에는 제외 상품을 재사용하는 bitmask에 표시한 뒤 앞에서부터 훑어서 선택
     """
+    # 가격대 구간 (다양성 확보용): 0 = 8천원 미만, 1 = 2만원 미만, 2 = 그 이상
+    LOW_PRICE = 8000
+    MID_PRICE = 20000
 
-    def __init__(self, products_df: pd.DataFrame):
+    def __init__(self, products_df: pd.DataFrame, behavior_booster: Optional[BehaviorBooster] = None,
+                 cache_dir: Optional[str] = CATEGORY_POOL_CACHE_DIR):
+        """
+        Args:
+            cache_dir: 적합도 점수 디스크 캐시 경로 (None이면 메모리 캐시만 사용)
+        """
         self.products_df = products_df
+        self.behavior_booster = behavior_booster or BehaviorBooster(products_df)
+
+        # product_id → 상품 데이터프레임 행 위치 (같은 product_id가 여러 행이면 첫 행)
+        product_ids = products_df['product_id']
+        self.product_positions = pd.Series(np.arange(len(products_df)), index=product_ids)[~product_ids.duplicated().to_numpy()]
 
         # 카테고리별로 적합도 상위 상품 pool을 미리 생성
-        self.category_pools = CategoryPoolBuilder.build(products_df)
+        self.category_pools = CategoryPoolBuilder.build(products_df, cache_dir)
+
+        # 카테고리별 정렬된 pool 배열
+        self.pool_arrays = {
+            category: self.build_pool_arrays(pool) for category, pool in self.category_pools.items()
+        }
+
+    def build_pool_arrays(self, pool: pd.DataFrame) -> Dict:
+        """
+        pool DataFrame을 적합도 점수 내림차순(stable) 배열로 변환
+
+        Returns:
+            Dict: product_ids, product_index(상품 데이터프레임 행 위치), scores, price_bands 배열과
+                  product_id → pool 내 위치, 추천 데이터 생성용 행 목록, 제외 상품 표시용 bitmask
+        """
+        sorted_pool = pool.sort_values('flexible_single_score', ascending=False, kind='stable')
+        price = sorted_pool['price'].to_numpy(dtype=float) if 'price' in sorted_pool else np.zeros(len(sorted_pool))
+        # 가격이 비어 있으면(NaN) 비교가 모두 False라서 기존과 같이 high 구간
+        price_bands = np.where(price < self.LOW_PRICE, 0, np.where(price < self.MID_PRICE, 1, 2))
+        product_ids = sorted_pool['product_id'].to_numpy()
+
+        return {
+            'product_ids': product_ids,
+            'product_index': self.product_positions.reindex(product_ids).to_numpy(),
+            'scores': sorted_pool['flexible_single_score'].to_numpy(),
+            'price_bands': price_bands.tolist(),
+            'positions': {product_id: col for col, product_id in enumerate(product_ids.tolist())},
+            'rows': [product for _, product in sorted_pool.iterrows()],
+            'mask': bytearray(len(sorted_pool)),
+        }
+
+    def mark_excluded(self, pool: Dict, *id_sets: Set) -> List[int]:
+        """
+        제외할 상품을 pool bitmask에 표시 (합집합을 새로 만들지 않고 집합별로 표시)
+
+        Returns:
+            List[int]: 표시한 pool 내 위치 목록 - 선택 후 clear_excluded로 bitmask 초기화
+        """
+        positions, mask = pool['positions'], pool['mask']
+        marked = []
+        for ids in id_sets:
+            # 집합이 pool보다 크면 pool 쪽을 기준으로 확인
+            if len(ids) > len(positions):
+                cols = [col for product_id, col in positions.items() if product_id in ids]
+            else:
+                cols = [positions[product_id] for product_id in ids if product_id in positions]
+            for col in cols:
+                if not mask[col]:
+                    mask[col] = 1
+                    marked.append(col)
+        return marked
+
+    @staticmethod
+    def clear_excluded(pool: Dict, marked: List[int]):
+        mask = pool['mask']
+        for col in marked:
+            mask[col] = 0
 
     def recommend(self, category: str, count: int, previous_recs : set, used_product_ids: set, user_profile: Dict, is_preferred: bool) -> List:
         """
@@ -29,48 +103,111 @@ class CategoryRecommender:
             is_preferred: 선호 카테고리 여부 - True면 부스팅 적용
 
         Returns:
-            추천 후보 상품 딕셔너리 리스트
+            추천 후보 상품 RecommendationRecord 리스트
         """
 
         # 카테고리 pool이 없거나, 추천 개수가 0 이하이면 빈 리스트 반환
-        if category not in self.category_pools or count <= 0:
+        if category not in self.pool_arrays or count <= 0:
             return []
 
-        # pool에서 이미 추천된 상품, 이전에 추천된 상품 제외
-        pool = self.category_pools[category].copy()
-        pool = pool[~pool['product_id'].isin(used_product_ids | previous_recs)]
+        # pool에서 이미 추천된 상품, 이전에 추천된 상품 제외 (bitmask 표시)
+        pool = self.pool_arrays[category]
+        marked = self.mark_excluded(pool, used_product_ids, previous_recs)
+        try:
+            selected_cols = self.select(pool, count, is_preferred)
+        finally:
+            self.clear_excluded(pool, marked)
+
+        # 추천 데이터 구조화 - 부스팅 포함
+        return self.build_records(pool, selected_cols, user_profile, is_preferred)
 
-        # 1인가구 적합도 점수 기준으로 내림차순 정렬
-        pool = pool.sort_values('flexible_single_score', ascending=False)
+    def build_records(self, pool: Dict, cols: List[int], user_profile: Dict, is_preferred: bool) -> List[RecommendationRecord]:
+        """선택한 pool 상품들의 행동 기반 부스팅을 한 번에 계산해서 추천 데이터 생성"""
+        if not len(cols):
+            return []
+        boosts = self.behavior_booster.apply_batch(pool['product_index'][cols], user_profile)
+        return [
+            RecommendationDataBuilder.build_record(
+                pool['rows'][col], user_profile, is_preferred, self.products_df, behavior_boost=float(boost)
+            )
+            for col, boost in zip(cols, boosts)
+        ]
+
+    @staticmethod
+    def select(pool: Dict, count: int, is_preferred: bool) -> List[int]:
+        """
+        제외되지 않은 pool 상품을 점수 순으로 훑어서 count개 선택
 
-        selected = []           # 최종 추천 후보 리스트
-        price_ranges_used = set()  # 가격대 다양성 확보용
+        Returns:
+            List[int]: 선택한 pool 내 위치 목록
+        """
+        mask, price_bands = pool['mask'], pool['price_bands']
+        selected = []               # 최종 추천 후보 위치
+        price_ranges_used = set()   # 가격대 다양성 확보용
 
-        # pool에서 count만큼 상품을 선택
-        for _, product in pool.iterrows():
+        for col in range(len(mask)):
             if len(selected) >= count:
                 break
-
-            price = product.get('price', 0)
-
-            # 가격대별로 구간을 나눠 다양성 확보
-            price_range = 'low' if price < 8000 else 'mid' if price < 20000 else 'high'
+            if mask[col]:
+                continue
 
             # 선호 카테고리가 아닌 경우, 이미 선택한 가격대는 중복 피하기
-            if not is_preferred and price_range in price_ranges_used and len(selected) > 0:
+            if not is_preferred and price_bands[col] in price_ranges_used and len(selected) > 0:
                 continue
-
-            # 추천 데이터 구조화 - 부스팅 포함
-            rec_data = RecommendationDataBuilder.build(product, user_profile, is_preferred, self.products_df)
-            selected.append(rec_data)
-            price_ranges_used.add(price_range)
+            selected.append(col)
+            price_ranges_used.add(price_bands[col])
 
         # 만약 count만큼 못 뽑았으면, 가격대 중복 허용하고 추가로 선택
         if len(selected) < count:
-            remaining_pool = pool[~pool['id'].isin([rec['product_id'] for rec in selected])]
-            
-            for _, product in remaining_pool.head(count - len(selected)).iterrows():
-                rec_data = RecommendationDataBuilder.build(product, user_profile, is_preferred, self.products_df)
-                selected.append(rec_data)
+            chosen = set(selected)
+            for col in range(len(mask)):
+                if len(selected) >= count:
+                    break
+                if not mask[col] and col not in chosen:
+                    selected.append(col)
+        return selected
+
+    def recommend_batch(self, category: str, count: int, exclude_ids: List[Set], user_profiles: List[Dict], is_preferred: bool) -> List[List]:
+        """
+        여러 사용자에 대해 같은 카테고리에서 추천 후보를 한 번에 추출
+        - 사용자 × pool 상품 제외 여부를 bool 행렬로 만들고, 정렬된 pool에서 제외되지 않은 앞쪽 count개 선택
+        - 선호 카테고리(가격대 다양성 규칙 없음)거나 count가 1이면 recommend와 같은 결과
 
-        return selected
\ No newline at end of file
+        Args:
+            category: 추천할 카테고리명
+            count: 사용자별 추천할 상품 개수
+            exclude_ids: 사용자별 제외할 상품 ID 집합 (이전 추천 + 이번 추천)
+            user_profiles: 사용자 프로필 리스트
+            is_preferred: 선호 카테고리 여부 - True면 부스팅 적용
+
+        Returns:
+            사용자별 추천 후보 상품 RecommendationRecord 리스트
+        """
+        if category not in self.pool_arrays or count <= 0:
+            return [[] for _ in user_profiles]
+        if not is_preferred and count > 1:
+            return [self.recommend(category, count, set(), excluded, profile, is_preferred)
+                    for excluded, profile in zip(exclude_ids, user_profiles)]
+
+        pool = self.pool_arrays[category]
+        n_users, pool_size = len(user_profiles), len(pool['rows'])
+
+        # 제외 상품을 pool 내 위치로 변환해서 bool 행렬 표시
+        excluded = np.zeros((n_users, pool_size), dtype=bool)
+        positions = pool['positions']
+        rows, cols = [], []
+        for u, ids in enumerate(exclude_ids):
+            for product_id in ids:
+                col = positions.get(product_id)
+                if col is not None:
+                    rows.append(u)
+                    cols.append(col)
+        excluded[rows, cols] = True
+
+        # 남은 상품 중 앞에서부터 count개
+        available = ~excluded
+        take = available & (np.cumsum(available, axis=1) <= count)
+        return [
+            self.build_records(pool, np.flatnonzero(row_take), profile, is_preferred)
+            for row_take, profile in zip(take, user_profiles)
+        ]
@@ -1,14 +1,36 @@
-from typing import Dict, List, Set
+import random
+import numpy as np
+from typing import List, Set
+
+from product.processor.recommendation_data import RecommendationRecord
 
 class EmergencyRecommender:
     """
-    pool/Faiss 기반 추천이 모두 실패했을 때, 
+    pool/Faiss 기반 추천이 모두 실패했을 때,
     적정 가격대의 상품 중에서 랜덤으로 추천을 보장하는 클래스
+    - 적정 가격대(1,000~25,000원) 후보는 생성 시 한 번만 배열로 만들어 두고,
+      추천 시에는 사용자별 고정 시드로 후보를 뽑으면서 이미 사용된 상품은 건너뜀(rejection)
     """
+    MIN_PRICE = 1000
+    MAX_PRICE = 25000
+    # 이미 사용된 상품을 이 횟수(count 배수)만큼 뽑으면 남은 후보를 직접 모아서 샘플링
+    MAX_REJECTION_FACTOR = 20
+
     def __init__(self, products_df):
         self.products_df = products_df
 
-    def recommend(self, count: int, used_product_ids: set, user_id: int) -> list[dict]:
+        # 상품 정보를 파이썬 기본 타입 리스트로 보관 (추천 데이터 생성 시 행 조회 없이 사용)
+        self.product_ids = products_df['product_id'].tolist()
+        self.names = products_df['name'].tolist()
+        self.prices = products_df['price'].tolist()
+        self.category_paths = products_df['category_path'].tolist() if 'category_path' in products_df else [''] * len(products_df)
+        self.large_categories = products_df['large_category'].tolist() if 'large_category' in products_df else ['기타'] * len(products_df)
+
+        # 적정 가격대 후보 위치
+        price = products_df['price'].to_numpy(dtype=float)
+        self.eligible = np.flatnonzero((price >= self.MIN_PRICE) & (price <= self.MAX_PRICE)).tolist()
+
+    def recommend(self, count: int, used_product_ids: set, user_id: int) -> list[RecommendationRecord]:
         """
         Args:
             count: 추천할 상품 개수
@@ -16,50 +38,73 @@ class EmergencyRecommender:
             user_id: 사용자 ID - 랜덤 시드 고정용
 
         Returns:
-            list of dict: 추천 후보 상품의 딕셔너리 리스트 - 중복 추천 X
+            list of RecommendationRecord: 추천 후보 상품 리스트 - 중복 추천 X
         """
 
         # 추천 개수가 0 이하이면 빈 리스트 반환
         if count <= 0:
             return []
 
-        # 사용되지 않았고, 가격이 1,000~25,000원인 상품만 필터링
-        available = self.products_df[
-            (~self.products_df['id'].isin(used_product_ids)) &
-            (self.products_df['price'] <= 25000) &
-            (self.products_df['price'] >= 1000)
-        ]
+        # 사용자별 고정 시드로 적정 가격대 후보에서 랜덤 샘플링 (사용된 상품 제외)
+        rng = random.Random(user_id)
+        selected = self.sample(self.eligible, count, used_product_ids, rng)
 
-        # 만약 적정 가격대 상품이 없다면, 전체에서 일부만 선택 
-        if available.empty:
-            available = self.products_df[
-                ~self.products_df['id'].isin(used_product_ids)
-            ].head(count * 2)
+        # 만약 적정 가격대에 남은 상품이 없다면, 전체에서 앞쪽 일부만 후보로 선택
+        if not selected:
+            fallback = [pos for pos in range(len(self.product_ids))
+                        if self.product_ids[pos] not in used_product_ids][:count * 2]
+            selected = self.sample(fallback, count, used_product_ids, rng)
 
-        # 사용자별 고정 시드로 랜덤 샘플링 
-        selected = available.sample(n=min(count, len(available)), random_state=user_id)
-
-        # 추천 결과 데이터(딕셔너리) 리스트 생성
+        # 추천 결과 데이터(RecommendationRecord) 리스트 생성
         # - 점수, 부스팅 등은 기본값으로 고정
-        emergency_recs = []
-        for _, p in selected.iterrows():
-            rec_data = {
-                'product_id': p['id'],
-                'name': p['name'],
-                'price': p.get('price', 0),
-                'category_path': p.get('category_path', ''),
-                'large_category': p.get('large_category', '기타'),
-                'single_household_score': 6.0,     # 기본 적합도 점수
-                'base_similarity': 0.6,            # 기본 유사도
-                'final_score': 0.6,                # 최종 점수(고정)
-                'boost_ratio': 1.5,                # 고정 부스팅 배수
-                'behavior_boost': 1.0,             # 행동 부스팅 없음
-                'user_type': 'emergency_guaranteed',# 응급 추천 유형
-                'recommendation_reason': '다양성 확보 | 적당한 선택',
-                'premium_score': 6.0,
-                'appeal_score': 6.0
-            }
-            emergency_recs.append(rec_data)
-
-        return emergency_recs
-        
\ No newline at end of file
+        return [self.build_record(pos) for pos in selected]
+
+    def sample(self, candidates: List[int], count: int, used_product_ids: Set, rng: random.Random) -> List[int]:
+        """
+        후보 위치 중 사용되지 않은 상품을 최대 count개 중복 없이 샘플링
+
+        Returns:
+            List[int]: 선택한 상품 데이터프레임 행 위치 목록
+        """
+        if not candidates:
+            return []
+
+        selected, chosen_ids = [], set()
+        rejections, max_rejections = 0, count * self.MAX_REJECTION_FACTOR
+        while len(selected) < count and rejections < max_rejections:
+            pos = candidates[rng.randrange(len(candidates))]
+            product_id = self.product_ids[pos]
+            if product_id in used_product_ids or product_id in chosen_ids:
+                rejections += 1
+                continue
+            selected.append(pos)
+            chosen_ids.add(product_id)
+
+        # 사용된 상품이 대부분이라 계속 거절되면 남은 후보를 직접 모아서 샘플링
+        if len(selected) < count:
+            remaining = []
+            for pos in candidates:
+                product_id = self.product_ids[pos]
+                if product_id not in used_product_ids and product_id not in chosen_ids:
+                    remaining.append(pos)
+                    chosen_ids.add(product_id)  # 같은 product_id가 여러 행이면 한 번만
+            selected += rng.sample(remaining, min(count - len(selected), len(remaining)))
+        return selected
+
+    def build_record(self, pos: int) -> RecommendationRecord:
+        return RecommendationRecord(
+            product_id=self.product_ids[pos],
+            name=self.names[pos],
+            price=self.prices[pos],
+            category_path=self.category_paths[pos],
+            large_category=self.large_categories[pos],
+            single_household_score=6.0,     # 기본 적합도 점수
+            base_similarity=0.6,            # 기본 유사도
+            final_score=0.6,                # 최종 점수(고정)
+            boost_ratio=1.5,                # 고정 부스팅 배수
+            behavior_boost=1.0,             # 행동 부스팅 없음
+            user_type='emergency_guaranteed',# 응급 추천 유형
+            recommendation_reason='다양성 확보 | 적당한 선택',
+            premium_score=6.0,
+            appeal_score=6.0
+        )
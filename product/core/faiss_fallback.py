@@ -1,19 +1,251 @@
+import hashlib
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Set
+from collections import Counter, OrderedDict
+from typing import Dict, List, Set, Optional, Hashable
 
-from product.processor.recommendation_data import RecommendationDataBuilder
+from config.product_config import FAISS_FALLBACK_START_K, FAISS_FALLBACK_MAX_K, FAISS_FALLBACK_CACHE_SIZE
+from product.processor.recommendation_data import RecommendationDataBuilder, RecommendationRecord
+from product.feature.behavior_booster import BehaviorBooster
 
 class FaissFallbackRecommender:
     """
     FAISS 벡터 기반 유사도 추천 담당 클래스
-    - pool/카테고리 기반 추천만으로 충분하지 않을 때, 
+    - pool/카테고리 기반 추천만으로 충분하지 않을 때,
     사용자 임베딩과 상품 벡터 간 유사도(최근접 이웃)를 기반으로 추가 추천 후보를 보충하는 역할
+    - 검색은 작은 깊이(start_k)부터 시작해서, 제외 상품/카탈로그에서 삭제된 상품을 빼고 count개가
+      안 되면 깊이를 2배씩 늘려 재검색 (max_k까지)
+    - 쿼리 텍스트별 검색 결과(유사도 순 상품 목록)는 실행 중 캐시해서 같은 쿼리는 다시 검색하지 않음
+      (최근 사용한 cache_size개까지만 보관하는 LRU - 사용자마다 쿼리가 달라도 메모리가 일정 수준에서 멈춤)
     """
-    def __init__(self, products_df, faiss_manager, embedding_generator):
+    def __init__(self, products_df, faiss_manager, embedding_generator, behavior_booster: Optional[BehaviorBooster] = None,
+                 start_k: int = FAISS_FALLBACK_START_K, max_k: int = FAISS_FALLBACK_MAX_K,
+                 cache_size: int = FAISS_FALLBACK_CACHE_SIZE):
         self.products_df = products_df
         self.faiss_manager = faiss_manager
+        self.behavior_booster = behavior_booster or BehaviorBooster(products_df)
+        self.start_k = start_k
+        self.max_k = max_k
+        self.cache_size = cache_size
+
+        # 검색 결과(product_id)를 상품 행 위치로 변환하기 위한 인덱스
+        self.product_index = pd.Index(products_df['product_id'])
+        self.product_ids = products_df['product_id'].to_numpy()
         self.embedding_generator = embedding_generator
-    
+
+        # 배치로 미리 계산한 사용자 임베딩 - {user_id: 행 번호}
+        self.user_embeddings = None
+        self.user_embedding_rows = {}
+
+        # {(카테고리 또는 None, 쿼리 key): 검색 결과} LRU 캐시와 메트릭
+        self.rank_cache = OrderedDict()
+        self.metrics = Counter()
+        self.depth_counts = Counter()
+
+    def set_user_embeddings(self, user_embeddings: np.ndarray, user_embedding_rows: Dict):
+        """
+        EmbeddingGenerator.generate_user_embeddings 결과를 등록해서
+        사용자마다 모델을 호출하지 않고 미리 계산한 임베딩을 사용
+        """
+        self.user_embeddings = user_embeddings
+        self.user_embedding_rows = user_embedding_rows
+        self.clear_cache()
+
+    def clear_cache(self):
+        self.rank_cache = OrderedDict()
+
+    def cache_get(self, key: Hashable) -> Optional[Dict]:
+        entry = self.rank_cache.get(key)
+        if entry is not None:
+            self.rank_cache.move_to_end(key)
+        return entry
+
+    def cache_put(self, key: Hashable, entry: Dict):
+        """검색 결과 저장 - cache_size를 넘으면 가장 오래 사용하지 않은 결과부터 제거"""
+        self.rank_cache[key] = entry
+        self.rank_cache.move_to_end(key)
+        while len(self.rank_cache) > self.cache_size:
+            self.rank_cache.popitem(last=False)
+            self.metrics['cache_evictions'] += 1
+
+    def get_query_embedding(self, user_profile: Dict) -> np.ndarray:
+        """
+        사용자 쿼리 임베딩 반환 - 미리 계산된 임베딩이 있으면 재사용
+        """
+        row = self.user_embedding_rows.get(user_profile.get('user_id'))
+        if self.user_embeddings is not None and row is not None:
+            return self.user_embeddings[row]
+        query_embedding, _ = self.embedding_generator.generate_user_embedding(user_profile)
+        return query_embedding
+
+    def query_key(self, user_profile: Dict) -> Hashable:
+        """
+        검색 결과 캐시 key
+        - 미리 계산된 임베딩 행은 고유 쿼리 텍스트마다 하나이므로 행 번호를 그대로 사용
+        - 그 외에는 쿼리 텍스트 hash
+        """
+        row = self.user_embedding_rows.get(user_profile.get('user_id'))
+        if self.user_embeddings is not None and row is not None:
+            return ('row', row)
+        query_text = self.embedding_generator.build_query_text(user_profile)
+        return ('text', hashlib.sha1(query_text.encode('utf-8')).hexdigest())
+
+    def has_category_index(self, category: str) -> bool:
+        return category in self.faiss_manager.category_indexes
+
+    def index_size(self, category: Optional[str]) -> int:
+        index = self.faiss_manager.index if category is None else self.faiss_manager.category_indexes.get(category)
+        return index.ntotal if index is not None else 0
+
+    def search_ranked(self, queries: np.ndarray, depth: int, category: Optional[str]) -> List[Dict]:
+        """
+        제외 없이 depth개씩 검색해서 쿼리별 유사도 순 상품 목록 반환 (캐시 저장 형식)
+        - 카탈로그에 없는 상품(인덱스 구축 이후 삭제된 상품)은 목록에서 제외
+        """
+        if category is None:
+            _, labels = self.faiss_manager.search_batch(queries, depth)
+            positions = self.faiss_manager.resolve_positions(labels, self.product_index)
+        else:
+            _, labels = self.faiss_manager.search_category(category, queries, depth)
+            positions = self.product_index.get_indexer(labels.ravel()).reshape(labels.shape)
+
+        exhausted_depth = depth >= self.index_size(category)
+        entries = []
+        for row_labels, row_positions in zip(labels, positions):
+            row_positions = row_positions[row_positions >= 0]
+            entries.append({
+                'positions': row_positions,
+                'product_ids': self.product_ids[row_positions].tolist(),
+                'depth': depth,
+                # 인덱스 상품을 모두 가져왔으면 더 깊이 검색해도 결과가 같음
+                'exhausted': exhausted_depth or bool((row_labels < 0).any()),
+            })
+        return entries
+
+    @staticmethod
+    def select(entry: Dict, count: int, exclude_ids: Set) -> np.ndarray:
+        """캐시된 유사도 순 상품 목록에서 제외 상품을 빼고 앞에서부터 count개의 행 위치 선택"""
+        if not exclude_ids:
+            return entry['positions'][:count]
+        cols = []
+        for col, product_id in enumerate(entry['product_ids']):
+            if product_id not in exclude_ids:
+                cols.append(col)
+                if len(cols) >= count:
+                    break
+        return entry['positions'][cols]
+
+    def candidate_positions(self, user_profiles: List[Dict], counts: List[int], exclude_ids: List[Set],
+                            category: Optional[str] = None) -> List[np.ndarray]:
+        """
+        사용자별로 제외 상품을 뺀 유사 상품 count개의 행 위치를 유사도 순으로 반환
+        - 캐시된 결과로 부족한 쿼리만 깊이를 2배로 늘려서 다시 배치 검색
+        - 검색 실패는 [WARN] 출력 후 오류 카운터에 기록하고 해당 사용자는 빈 결과
+
+        Returns:
+            List[np.ndarray]: 사용자별 상품 데이터프레임 행 위치 배열
+        """
+        results = [np.empty(0, dtype=int) for _ in user_profiles]
+        pending = [row for row, count in enumerate(counts) if count > 0]
+        if not pending:
+            return results
+
+        self.metrics['requests'] += len(pending)
+        keys = {}
+        for row in pending:
+            try:
+                keys[row] = (category, self.query_key(user_profiles[row]))
+            except Exception as e:
+                self.metrics['errors'] += 1
+                print(f"[WARN] FAISS 쿼리 생성 실패(user_id={user_profiles[row].get('user_id')}): {e}")
+        pending = [row for row in pending if row in keys]
+        # 이번 호출에서 검색한 결과 - 묶음의 고유 쿼리가 cache_size보다 많아서 캐시에서 밀려나도 재검색하지 않도록 보관
+        searched = {}
+        first_round = True
+        while pending:
+            # 캐시로 충분한 사용자는 바로 선택, 부족한 쿼리는 다음 검색 깊이 결정
+            searches = {}  # {key: (대표 사용자 행, 검색 깊이)}
+            next_pending = []
+            for row in pending:
+                count, entry = counts[row], searched.get(keys[row]) or self.cache_get(keys[row])
+                if entry is not None:
+                    selected = self.select(entry, count, exclude_ids[row])
+                    if len(selected) >= count or entry['exhausted'] or entry['depth'] >= self.max_k:
+                        results[row] = selected
+                        self.metrics['cache_hits'] += first_round
+                        self.metrics['filled'] += len(selected) >= count
+                        self.depth_counts[entry['depth']] += 1
+                        continue
+                    depth = entry['depth'] * 2
+                else:
+                    depth = self.start_k
+                while depth < count:
+                    depth *= 2
+                depth = min(depth, self.max_k)
+                searches[keys[row]] = (row, max(depth, searches.get(keys[row], (row, 0))[1]))
+                next_pending.append(row)
+
+            # 같은 깊이끼리 묶어서 배치 검색 후 캐시 갱신
+            failed = set()
+            by_depth = {}
+            for key, (row, depth) in searches.items():
+                by_depth.setdefault(depth, []).append((key, row))
+            for depth, items in by_depth.items():
+                try:
+                    queries = np.stack([self.get_query_embedding(user_profiles[row]) for _, row in items])
+                    entries = self.search_ranked(queries, depth, category)
+                except Exception as e:
+                    self.metrics['errors'] += len(items)
+                    failed.update(key for key, _ in items)
+                    print(f"[WARN] FAISS 유사도 검색 실패({category or '전체'}, 깊이 {depth}, 쿼리 {len(items)}개): {e}")
+                    continue
+                self.metrics['searches'] += len(items)
+                for (key, _), entry in zip(items, entries):
+                    searched[key] = entry
+                    self.cache_put(key, entry)
+
+            pending = [row for row in next_pending if keys[row] not in failed]
+            first_round = False
+        return results
+
+    def recommend_category(self, user_profile: Dict, category: str, count: int,
+                           exclude_ids: Set, used_product_ids: Set, is_preferred: bool) -> List:
+        """
+        카테고리 sub-index에서 사용자 임베딩과 가장 가까운 상품으로 카테고리 추천 부족분을 보충
+
+        Args:
+            user_profile: 추천 대상 사용자의 프로필
+            category: 보충할 카테고리명 (large_category)
+            count: 보충할 상품 개수
+            exclude_ids: 제외할 상품 ID 집합 (이전 추천 + 이번 추천)
+            used_product_ids: 이번 추천에서 이미 선택된 상품 ID 집합 - 선택한 상품 추가
+            is_preferred: 선호 카테고리 여부 - True면 부스팅 적용
+
+        Returns:
+            list: 추천 후보 상품의 RecommendationRecord 리스트
+        """
+        if count <= 0 or not self.has_category_index(category):
+            return []
+
+        positions = self.candidate_positions([user_profile], [count], [exclude_ids], category)[0]
+        category_recs = self.build_records(positions, user_profile, is_preferred)
+        used_product_ids.update(rec.product_id for rec in category_recs)
+        return category_recs
+
+    def build_records(self, positions: np.ndarray, user_profile: Dict, is_preferred: bool) -> List[RecommendationRecord]:
+        """
+        상품 행 위치들의 행동 기반 부스팅을 한 번에 계산해서 추천 데이터 생성
+        """
+        if not len(positions):
+            return []
+        boosts = self.behavior_booster.apply_batch(positions, user_profile)
+        return [
+            RecommendationDataBuilder.build_record(
+                self.products_df.iloc[idx], user_profile, is_preferred, self.products_df, behavior_boost=float(boost)
+            )
+            for idx, boost in zip(positions, boosts)
+        ]
+
     def recommend(self, user_profile: Dict, count: int, used_product_ids: Set) -> List:
         """
         FAISS를 이용해 유사도 기반 추천 후보를 반환
@@ -24,7 +256,7 @@ class FaissFallbackRecommender:
             used_product_ids: 이미 추천된 상품 ID 집합
 
         Returns:
-            list: 추천 후보 상품의 딕셔너리 리스트
+            list: 추천 후보 상품의 RecommendationRecord 리스트
         """
 
         # 추천 개수가 0 이하이면 빈 리스트 반환
@@ -32,26 +264,59 @@ class FaissFallbackRecommender:
             return []
 
         try:
-            # 사용자 프로필로부터 쿼리 임베딩(벡터) 생성
-            query_embedding, _ = self.embedding_generator.generate_user_embedding(user_profile)
+            # 이미 추천된 상품을 제외하고 유사한 상품 count개의 행 위치 검색
+            positions = self.candidate_positions([user_profile], [count], [used_product_ids])[0]
 
-            # FAISS 인덱스에서 쿼리 임베딩과 유사한 상품 인덱스 top-100 검색
-            _, indices = self.faiss_manager.search(query_embedding, k=100)
+            # 유사도 순으로 추천 데이터 구조화 - 부스팅 포함
+            fallback_recs = self.build_records(positions, user_profile, False)
+            used_product_ids.update(rec.product_id for rec in fallback_recs)
+            return fallback_recs
 
-            fallback_recs = []
-            # 유사도 순으로 상품을 순회, 이미 추천된 상품은 제외하고 추천 후보로 추가
-            for idx in indices:
+        except Exception as e:
+            self.metrics['errors'] += 1
+            print(f"[WARN] FAISS 유사도 추천 실패(user_id={user_profile.get('user_id')}): {e}")
+            return []
 
-                if len(fallback_recs) >= count:
-                    break
-                product = self.products_df.iloc[idx]
+    def recommend_batch(self, user_profiles: List[Dict], counts: List[int], exclude_ids: List[Set],
+                        category: Optional[str] = None, is_preferred: bool = False) -> List[List]:
+        """
+        여러 사용자의 유사도 기반 추천 후보를 FAISS 배치 검색으로 반환
+        - category를 주면 해당 카테고리 sub-index에서 검색 (recommend_category와 같은 결과)
 
-                if product['id'] not in used_product_ids:
-                    # 추천 데이터 구조화 - 부스팅 포함 
-                    rec_data = RecommendationDataBuilder.build(product, user_profile, False, self.products_df)
-                    fallback_recs.append(rec_data)
-                    used_product_ids.add(product['id'])
-            return fallback_recs
+        Args:
+            user_profiles: 추천 대상 사용자 프로필 리스트
+            counts: 사용자별 추천할 상품 개수
+            exclude_ids: 사용자별 제외할 상품 ID 집합
+            category: 카테고리명 - None이면 전체 인덱스 검색
+            is_preferred: 선호 카테고리 여부 - True면 부스팅 적용
+
+        Returns:
+            사용자별 추천 후보 상품 RecommendationRecord 리스트
+        """
+        if category is not None and not self.has_category_index(category):
+            return [[] for _ in user_profiles]
 
-        except Exception:
-            return []
\ No newline at end of file
+        positions = self.candidate_positions(user_profiles, counts, exclude_ids, category)
+        return [
+            self.build_records(row_positions, profile, is_preferred)
+            for row_positions, profile in zip(positions, user_profiles)
+        ]
+
+    def get_metrics(self) -> Dict:
+        """
+        fallback 메트릭
+        - fill_rate: 요청한 개수를 모두 채운 비율
+        - cache_hit_rate: 검색 없이 캐시된 결과로 처리한 비율
+        - depth_counts: 최종 검색 깊이별 요청 수
+        """
+        requests = self.metrics['requests']
+        return {
+            'requests': requests,
+            'fill_rate': self.metrics['filled'] / requests if requests else None,
+            'cache_hit_rate': self.metrics['cache_hits'] / requests if requests else None,
+            'searches': self.metrics['searches'],
+            'errors': self.metrics['errors'],
+            'cached_queries': len(self.rank_cache),
+            'cache_evictions': self.metrics['cache_evictions'],
+            'depth_counts': dict(sorted(self.depth_counts.items())),
+        }
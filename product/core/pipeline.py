@@ -0,0 +1,137 @@
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional, Set
+
+@dataclass
+class RequestContext:
+    """사용자 한 명의 추천 요청 상태 - 단계들이 recommendations/used_product_ids를 채워 나감"""
+    user_id: int
+    user_profile: Dict
+    top_k: int
+    previous_recs: Set
+    used_product_ids: Set = field(default_factory=set)
+    recommendations: List = field(default_factory=list)
+
+    def is_full(self) -> bool:
+        return len(self.recommendations) >= self.top_k
+
+
+@dataclass
+class BatchContext:
+    """사용자 묶음의 추천 상태 - 사용자 행(r)별 리스트"""
+    user_ids: List[int]
+    profiles: List[Dict]
+    top_k: int
+    previous: List[Set]
+    used: List[Set]
+    recs: List[List]
+    preferred: List[str]
+
+    def is_full(self) -> bool:
+        return all(len(row_recs) >= self.top_k for row_recs in self.recs)
+
+
+@dataclass
+class StageResult:
+    """단계 실행 기록 한 건"""
+    stage: str
+    status: str          # ok / skipped(예산 초과 예상) / not_needed(이미 채워짐) / error
+    elapsed_ms: float
+    yielded: int         # 단계에서 추가한 추천 수 (re-ranker는 결과 수)
+
+
+class PipelineStage:
+    """
+    추천 파이프라인 단계
+    - run(context)는 추가한 추천 수를 반환
+    - fills=True(후보 생성 단계)는 추천이 이미 다 채워졌으면 실행하지 않음, False(re-ranker)는 항상 실행
+    - budget_ms가 있고 skippable이면, 최근 소요 시간(EWMA)이 예산을 넘는 동안 건너뛰고 다음 fallback 단계로 진행
+    """
+    def __init__(self, name: str, run: Callable, budget_ms: Optional[float] = None,
+                 skippable: bool = True, fills: bool = True):
+        self.name = name
+        self.run = run
+        self.budget_ms = budget_ms
+        self.skippable = skippable
+        self.fills = fills
+
+
+class RecommendationPipeline:
+    """
+    추천 단계(후보 생성 → fallback → re-ranker)를 순서대로 실행하는 파이프라인
+    - 단계별 호출/건너뜀/오류 횟수, 추천 수, 소요 시간(누적, EWMA), 예산 초과 횟수를 집계
+    - 건너뛴 단계는 EWMA를 SKIP_DECAY만큼 줄여서, 일시적으로 느렸던 단계도 다시 실행될 기회를 줌
+    - 단계에서 예외가 나면 [WARN] 출력 후 다음 단계로 진행
+    """
+    EWMA_ALPHA = 0.2
+    SKIP_DECAY = 0.8
+
+    def __init__(self, stages: List[PipelineStage]):
+        self.stages = stages
+        self.stats = {
+            stage.name: {'calls': 0, 'skipped': 0, 'errors': 0, 'yielded': 0, 'total_ms': 0.0, 'ewma_ms': None, 'overruns': 0}
+            for stage in stages
+        }
+
+    def should_skip(self, stage: PipelineStage) -> bool:
+        ewma_ms = self.stats[stage.name]['ewma_ms']
+        return stage.skippable and stage.budget_ms is not None and ewma_ms is not None and ewma_ms > stage.budget_ms
+
+    def run(self, context) -> List[StageResult]:
+        """
+        context에 대해 모든 단계를 순서대로 실행
+
+        Returns:
+            List[StageResult]: 이번 요청/묶음의 단계별 실행 기록
+        """
+        trace = []
+        for stage in self.stages:
+            stats = self.stats[stage.name]
+            if stage.fills and context.is_full():
+                trace.append(StageResult(stage.name, 'not_needed', 0.0, 0))
+                continue
+            if self.should_skip(stage):
+                stats['skipped'] += 1
+                stats['ewma_ms'] *= self.SKIP_DECAY
+                trace.append(StageResult(stage.name, 'skipped', 0.0, 0))
+                continue
+
+            start = time.perf_counter()
+            status, yielded = 'ok', 0
+            try:
+                yielded = stage.run(context)
+            except Exception as e:
+                status = 'error'
+                stats['errors'] += 1
+                print(f"[WARN] 추천 파이프라인 단계({stage.name}) 실패, 다음 단계로 진행: {e}")
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            stats['calls'] += 1
+            stats['yielded'] += yielded
+            stats['total_ms'] += elapsed_ms
+            stats['ewma_ms'] = elapsed_ms if stats['ewma_ms'] is None else \
+                (1 - self.EWMA_ALPHA) * stats['ewma_ms'] + self.EWMA_ALPHA * elapsed_ms
+            if stage.budget_ms is not None and elapsed_ms > stage.budget_ms:
+                stats['overruns'] += 1
+            trace.append(StageResult(stage.name, status, elapsed_ms, yielded))
+        return trace
+
+    @staticmethod
+    def trace_to_dicts(trace: List[StageResult]) -> List[Dict]:
+        return [asdict(result) for result in trace]
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """단계별 집계 (평균 소요 시간 포함)"""
+        return {
+            name: {**stats, 'avg_ms': stats['total_ms'] / stats['calls'] if stats['calls'] else None}
+            for name, stats in self.stats.items()
+        }
+
+    def summary(self) -> str:
+        """로그 출력용 한 줄 요약 - 단계: 실행 횟수, 추천 수, 평균 소요 시간, 건너뜀/오류 횟수"""
+        parts = []
+        for name, stats in self.get_stats().items():
+            avg = f"{stats['avg_ms']:.1f}ms" if stats['avg_ms'] is not None else "-"
+            parts.append(f"{name}(실행 {stats['calls']}, 추천 {stats['yielded']}, 평균 {avg}, "
+                         f"건너뜀 {stats['skipped']}, 오류 {stats['errors']})")
+        return ", ".join(parts)
@@ -1,25 +1,90 @@
+import numpy as np
 import pandas as pd
 import random
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from product.processor.recommendation_history import RecommendationHistoryManager
 from product.core.category_recommender import CategoryRecommender
 from product.core.faiss_fallback import FaissFallbackRecommender
 from product.core.emergency_recommender import EmergencyRecommender
+from product.feature.behavior_booster import BehaviorBooster
+from product.processor.recommendation_data import RecommendationBatchBuilder
+from product.core.pipeline import RecommendationPipeline, PipelineStage, RequestContext, BatchContext
+from config.product_config import CATEGORY_POOL_CACHE_DIR, PIPELINE_STAGE_BUDGETS_MS, RECOMMENDATION_CATEGORIES
 
 class RecommendationEngine:
     """
     1인가구 특화 추천 시스템 엔진
     """
-    def __init__(self, products_df, faiss_manager, embedding_generator, user_profiles: Dict):
+    CATEGORIES = RECOMMENDATION_CATEGORIES
+
+    def __init__(self, products_df, faiss_manager, embedding_generator, user_profiles: Dict,
+                 history_manager: Optional[RecommendationHistoryManager] = None,
+                 stage_budgets_ms: Optional[Dict[str, float]] = None,
+                 cache_dir: Optional[str] = CATEGORY_POOL_CACHE_DIR):
         self.products_df = products_df
         self.user_profiles = user_profiles
 
-        self.history_manager = RecommendationHistoryManager()
-        self.category_recommender = CategoryRecommender(products_df)
-        self.faiss_fallback = FaissFallbackRecommender(products_df, faiss_manager, embedding_generator)
+        # 추천 히스토리 - 저장소(SQLite)를 쓰는 manager를 주면 실행 간에도 유지
+        self.history_manager = history_manager or RecommendationHistoryManager()
+        # 행동 기반 부스팅 lookup은 한 번만 구축해서 공유
+        self.behavior_booster = BehaviorBooster(products_df)
+        self.category_recommender = CategoryRecommender(products_df, self.behavior_booster, cache_dir)
+        self.faiss_fallback = FaissFallbackRecommender(products_df, faiss_manager, embedding_generator, self.behavior_booster)
         self.emergency_recommender = EmergencyRecommender(products_df)
+
+        # 추천 단계 파이프라인 - 사용자별 추천(예산 초과 단계는 건너뜀)과 배치 추천(시간 기록만)
+        self.pipeline = self.build_pipeline(stage_budgets_ms)
+        self.batch_pipeline = self.build_batch_pipeline()
+        self.last_batch_trace = []
+
+    def build_pipeline(self, stage_budgets_ms: Optional[Dict[str, float]] = None) -> RecommendationPipeline:
+        """
+        사용자별 추천 단계: 선호 카테고리 → 나머지 카테고리 → FAISS fallback → emergency → 최종 정리
+        - emergency는 추천 개수 보장을 위해 건너뛰지 않음
+        """
+        budgets = PIPELINE_STAGE_BUDGETS_MS if stage_budgets_ms is None else stage_budgets_ms
+        return RecommendationPipeline([
+            PipelineStage('preferred_category', self.stage_preferred_category, budgets.get('preferred_category')),
+            PipelineStage('other_categories', self.stage_other_categories, budgets.get('other_categories')),
+            PipelineStage('faiss_fallback', self.stage_faiss_fallback, budgets.get('faiss_fallback')),
+            PipelineStage('emergency', self.stage_emergency, skippable=False),
+            PipelineStage('finalize', self.stage_finalize, skippable=False, fills=False),
+        ])
+
+    def build_batch_pipeline(self) -> RecommendationPipeline:
+        """배치 추천 단계 - 사용자별 추천과 같은 결과를 위해 예산 없이 모든 단계 실행"""
+        return RecommendationPipeline([
+            PipelineStage('preferred_category', self.batch_stage_preferred_category),
+            PipelineStage('other_categories', self.batch_stage_other_categories),
+            PipelineStage('faiss_fallback', self.batch_stage_faiss_fallback),
+            PipelineStage('emergency', self.batch_stage_emergency, skippable=False),
+        ])
+
+    def set_user_embeddings(self, user_embeddings, user_embedding_rows: Dict):
+        """
+        배치로 미리 계산한 사용자 임베딩을 FAISS fallback에 등록
+        """
+        self.faiss_fallback.set_user_embeddings(user_embeddings, user_embedding_rows)
     
+    def recommend_category(self, category: str, count: int, previous_recs: set, used_product_ids: set,
+                           user_profile: Dict, is_preferred: bool) -> List:
+        """
+        카테고리 pool에서 추천하고, pool이 부족하면 같은 카테고리의 FAISS sub-index에서
+        사용자 임베딩과 가까운 상품으로 보충 (전체 카탈로그 FAISS fallback 이전 단계)
+        """
+        recs = self.category_recommender.recommend(
+            category, count, previous_recs, used_product_ids, user_profile, is_preferred
+        )
+        used_product_ids.update([rec.product_id for rec in recs])
+
+        if len(recs) < count:
+            recs += self.faiss_fallback.recommend_category(
+                user_profile, category, count - len(recs),
+                used_product_ids | previous_recs, used_product_ids, is_preferred
+            )
+        return recs
+
     def recommend(self, user_id: int, top_k: int = 4) -> pd.DataFrame:
         """
         사용자별 맞춤 추천 생성
@@ -36,48 +101,200 @@ class RecommendationEngine:
             return pd.DataFrame()
         
         user_profile = self.user_profiles[user_id]
+        context = RequestContext(
+            user_id=user_id,
+            user_profile=user_profile,
+            top_k=top_k,
+            previous_recs=self.history_manager.get(user_id)  # 이전 추천 상품 ID 집합
+        )
+        trace = self.pipeline.run(context)
 
-        previous_recs = self.history_manager.get(user_id)  # 이전 추천 상품 ID 집합
-        used_product_ids = set()                        
-        preferred_category = user_profile.get('base_interest_category', '가공식품')
-        recommendations = []
+        # 최종 추천 결과 DataFrame 변환 (중복 제거는 finalize 단계에서 처리)
+        final_df = pd.DataFrame([rec.to_dict() for rec in context.recommendations])
+        final_df.attrs['pipeline_trace'] = RecommendationPipeline.trace_to_dicts(trace)
+        self.history_manager.add(user_id, [rec.product_id for rec in context.recommendations])  # 추천 히스토리 업데이트
+        return final_df
 
-        # 선호 카테고리에서 2개 추천
-        recommendations += self.category_recommender.recommend(
-            preferred_category, 2, previous_recs, used_product_ids, user_profile, True
+    def stage_preferred_category(self, context: RequestContext) -> int:
+        """선호 카테고리에서 2개 추천"""
+        preferred_category = context.user_profile.get('base_interest_category', '가공식품')
+        recs = self.recommend_category(
+            preferred_category, 2, context.previous_recs, context.used_product_ids, context.user_profile, True
         )
-        used_product_ids.update([rec['product_id'] for rec in recommendations])
+        context.recommendations += recs
+        return len(recs)
 
-        # 나머지 카테고리에서 1개씩 추천
-        other_categories = [c for c in ['신선식품', '가공식품', '주방용품', '생활용품'] if c != preferred_category]
-        random.seed(user_id)  # 사용자별 고정 시드
-        random.shuffle(other_categories)
+    def stage_other_categories(self, context: RequestContext) -> int:
+        """나머지 카테고리에서 1개씩 추천"""
+        preferred_category = context.user_profile.get('base_interest_category', '가공식품')
+        other_categories = [c for c in self.CATEGORIES if c != preferred_category]
+        random.Random(context.user_id).shuffle(other_categories)  # 사용자별 고정 시드
+        added = 0
         for category in other_categories:
-            if len(recommendations) >= top_k:
+            if context.is_full():
                 break
-            recs = self.category_recommender.recommend(
-                category, 1, previous_recs, used_product_ids, user_profile, False
+            recs = self.recommend_category(
+                category, 1, context.previous_recs, context.used_product_ids, context.user_profile, False
             )
-            recommendations += recs
-            used_product_ids.update([rec['product_id'] for rec in recs])
+            context.recommendations += recs
+            added += len(recs)
+        return added
 
-        # 부족하면 FAISS fallback(유사도 기반 추천)으로 보충
-        if len(recommendations) < top_k:
-            fallback = self.faiss_fallback.recommend(
-                user_profile, top_k - len(recommendations), used_product_ids
-            )
-            recommendations += fallback
-            used_product_ids.update([rec['product_id'] for rec in fallback])
+    def stage_faiss_fallback(self, context: RequestContext) -> int:
+        """부족하면 FAISS fallback(유사도 기반 추천)으로 보충"""
+        fallback = self.faiss_fallback.recommend(
+            context.user_profile, context.top_k - len(context.recommendations), context.used_product_ids
+        )
+        context.recommendations += fallback
+        context.used_product_ids.update([rec.product_id for rec in fallback])
+        return len(fallback)
+
+    def stage_emergency(self, context: RequestContext) -> int:
+        """그래도 부족하면 emergency 추천으로 보충"""
+        emergency = self.emergency_recommender.recommend(
+            context.top_k - len(context.recommendations), context.used_product_ids, context.user_id
+        )
+        context.recommendations += emergency
+        return len(emergency)
 
-        # 그래도 부족하면 emergency 추천으로 보충
-        if len(recommendations) < top_k:
-            emergency = self.emergency_recommender.recommend(
-                top_k - len(recommendations), used_product_ids, user_id
+    def stage_finalize(self, context: RequestContext) -> int:
+        """top_k개로 자르고 상품 중복 제거"""
+        context.recommendations = self.dedupe(context.recommendations[:context.top_k])
+        return len(context.recommendations)
+
+    @staticmethod
+    def dedupe(recs: List) -> List:
+        final, seen = [], set()
+        for rec in recs:
+            if rec.product_id not in seen:
+                seen.add(rec.product_id)
+                final.append(rec)
+        return final
+
+    def recommend_all(self, user_ids: List[int], top_k: int = 4, batch_size: int = 1024) -> Dict[int, List[Dict]]:
+        """
+        여러 사용자의 추천을 batch_size명씩 묶어서 생성
+        - recommend와 같은 단계(선호 카테고리 → 나머지 카테고리 → FAISS fallback → emergency)와
+          같은 결과를 내지만, 단계별로 사용자들을 카테고리/필요 개수 기준으로 묶어서 한 번에 처리
+
+        Args:
+            user_ids: 추천 대상 사용자 ID 리스트 (중복 없이)
+            top_k: 사용자별 추천할 상품 개수
+            batch_size: 한 번에 처리할 사용자 수
+
+        Returns:
+            Dict[int, List[Dict]]: {user_id: 추천 결과 리스트} - recommend 결과의 to_dict(orient='records')와 같은 형식
+        """
+        results = {}
+        for start in range(0, len(user_ids), batch_size):
+            results.update(self.recommend_batch(user_ids[start:start + batch_size], top_k))
+        print(f"[INFO] FAISS fallback 메트릭: {self.faiss_fallback.get_metrics()}")
+        print(f"[INFO] 배치 추천 단계별 메트릭: {self.batch_pipeline.summary()}")
+        return results
+
+    def recommend_batch(self, user_ids: List[int], top_k: int = 4) -> Dict[int, List[Dict]]:
+        """
+        사용자 묶음에 대한 추천 생성 (recommend_all 내부 단계)
+        - 단계별 소요 시간/추천 수는 last_batch_trace와 batch_pipeline 집계에 기록
+        """
+        results = {user_id: [] for user_id in user_ids if user_id not in self.user_profiles}
+        user_ids = [user_id for user_id in user_ids if user_id in self.user_profiles]
+        profiles = [self.user_profiles[user_id] for user_id in user_ids]
+        self.history_manager.preload(user_ids)
+        context = BatchContext(
+            user_ids=user_ids,
+            profiles=profiles,
+            top_k=top_k,
+            previous=[self.history_manager.get(user_id) for user_id in user_ids],
+            used=[set() for _ in user_ids],
+            recs=[[] for _ in user_ids],
+            preferred=[profile.get('base_interest_category', '가공식품') for profile in profiles]
+        )
+        self.last_batch_trace = self.batch_pipeline.run(context)
+
+        # 최종 결과 - 상품 중복 제거 후 히스토리 업데이트, 컬럼 배열에 모아서 payload로 한 번에 변환
+        batch_builder = RecommendationBatchBuilder(capacity=len(user_ids) * top_k)
+        for user_id, row_recs in zip(user_ids, context.recs):
+            final = self.dedupe(row_recs[:top_k])
+            self.history_manager.add(user_id, [rec.product_id for rec in final])
+            batch_builder.add(user_id, final)
+        results.update(batch_builder.to_payloads())
+        return results
+
+    def fill_category_batch(self, context: BatchContext, rows: np.ndarray, category: str, count: int, is_preferred: bool) -> int:
+        """rows 사용자들을 category pool에서 count개씩 추천하고, 부족분은 카테고리 sub-index로 보충"""
+        used, previous, profiles, recs = context.used, context.previous, context.profiles, context.recs
+        added = 0
+        picked = self.category_recommender.recommend_batch(
+            category, count, [used[r] | previous[r] for r in rows], [profiles[r] for r in rows], is_preferred
+        )
+        for r, row_recs in zip(rows, picked):
+            recs[r] += row_recs
+            used[r].update(rec.product_id for rec in row_recs)
+            added += len(row_recs)
+
+        short = [(r, count - len(row_recs)) for r, row_recs in zip(rows, picked) if len(row_recs) < count]
+        if short:
+            short, needs = zip(*short)
+            filled = self.faiss_fallback.recommend_batch(
+                [profiles[r] for r in short],
+                list(needs),
+                [used[r] | previous[r] for r in short],
+                category=category,
+                is_preferred=is_preferred
             )
-            recommendations += emergency
+            for r, row_recs in zip(short, filled):
+                recs[r] += row_recs
+                used[r].update(rec.product_id for rec in row_recs)
+                added += len(row_recs)
+        return added
 
-        # 최종 추천 결과 DataFrame 변환 및 중복 제거
-        final_df = pd.DataFrame(recommendations[:top_k]).drop_duplicates(subset=['product_id']).head(top_k)
-        self.history_manager.update(user_id, final_df)  # 추천 히스토리 업데이트
-        return final_df
+    def batch_stage_preferred_category(self, context: BatchContext) -> int:
+        """선호 카테고리에서 2개씩"""
+        added = 0
+        preferred = np.array(context.preferred)
+        for category in set(context.preferred):
+            added += self.fill_category_batch(context, np.flatnonzero(preferred == category), category, 2, True)
+        return added
+
+    def batch_stage_other_categories(self, context: BatchContext) -> int:
+        """나머지 카테고리에서 1개씩 - 사용자별 고정 시드로 섞은 순서대로, top_k가 찰 때까지"""
+        orders = []
+        for user_id, category in zip(context.user_ids, context.preferred):
+            other_categories = [c for c in self.CATEGORIES if c != category]
+            random.Random(user_id).shuffle(other_categories)  # stage_other_categories와 같은 순서
+            orders.append(other_categories)
+
+        added = 0
+        for step in range(len(self.CATEGORIES)):
+            active = [r for r in range(len(context.user_ids)) if len(context.recs[r]) < context.top_k and step < len(orders[r])]
+            for category in self.CATEGORIES:
+                rows = np.array([r for r in active if orders[r][step] == category], dtype=int)
+                if len(rows):
+                    added += self.fill_category_batch(context, rows, category, 1, False)
+        return added
+
+    def batch_stage_faiss_fallback(self, context: BatchContext) -> int:
+        """부족하면 FAISS fallback(전체 인덱스 유사도 검색)으로 보충"""
+        recs, used, top_k = context.recs, context.used, context.top_k
+        short = [r for r in range(len(context.user_ids)) if len(recs[r]) < top_k]
+        filled = self.faiss_fallback.recommend_batch(
+            [context.profiles[r] for r in short], [top_k - len(recs[r]) for r in short], [used[r] for r in short]
+        )
+        added = 0
+        for r, row_recs in zip(short, filled):
+            recs[r] += row_recs
+            used[r].update(rec.product_id for rec in row_recs)
+            added += len(row_recs)
+        return added
 
+    def batch_stage_emergency(self, context: BatchContext) -> int:
+        """그래도 부족하면 emergency 추천으로 보충"""
+        added = 0
+        for r, user_id in enumerate(context.user_ids):
+            need = context.top_k - len(context.recs[r])
+            if need > 0:
+                emergency = self.emergency_recommender.recommend(need, context.used[r], user_id)
+                context.recs[r] += emergency
+                added += len(emergency)
+        return added
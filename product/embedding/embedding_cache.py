@@ -0,0 +1,196 @@
+import os
+import json
+import hashlib
+import numpy as np
+from typing import Dict, List, Iterable
+
+class EmbeddingCache:
+    """
+    상품 텍스트 임베딩을 디스크에 보관하는 content-addressed 캐시
+    - 키: (모델명, 임베딩 텍스트 해시) → 모델별 디렉토리 + 텍스트 sha1
+    - 임베딩 행렬은 float32 .npy 파일을 memory-map으로 열어서 사용
+    - 키 인덱스는 행 순서대로 저장된 해시 배열(.npy)
+    """
+
+    MATRIX_FILE = 'embeddings.npy'
+    KEYS_FILE = 'keys.npy'
+    MANIFEST_FILE = 'manifest.json'
+
+    def __init__(self, cache_dir: str, model_name: str):
+        self.model_name = model_name
+        self.cache_dir = os.path.join(cache_dir, model_name.replace('/', '__'))
+        self.matrix_path = os.path.join(self.cache_dir, self.MATRIX_FILE)
+        self.keys_path = os.path.join(self.cache_dir, self.KEYS_FILE)
+        self.manifest_path = os.path.join(self.cache_dir, self.MANIFEST_FILE)
+
+        self.matrix = None                # 디스크 행렬 (np.memmap)
+        self.keys: List[str] = []         # 행 번호 → 키
+        self.key_to_row: Dict[str, int] = {}
+
+        # 아직 디스크에 쓰지 않은 변경분
+        self.pending: Dict[str, np.ndarray] = {}
+        self.evicted: set = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    @staticmethod
+    def make_key(text: str) -> str:
+        """임베딩 텍스트의 sha1 해시를 캐시 키로 사용"""
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def load(self):
+        """디스크의 임베딩 행렬과 키 인덱스를 memory-map으로 로드"""
+        if not (os.path.exists(self.matrix_path) and os.path.exists(self.keys_path)):
+            return
+        try:
+            matrix = np.load(self.matrix_path, mmap_mode='r')
+            keys = np.load(self.keys_path).tolist()
+        except Exception as e:
+            print(f"[WARN] 임베딩 캐시 로드 실패, 캐시를 비우고 시작합니다: {e}")
+            return
+
+        # 행렬과 키 인덱스 길이가 다르면 쓰기 도중 중단된 캐시이므로 무시
+        if matrix.ndim != 2 or matrix.shape[0] != len(keys):
+            print("[WARN] 임베딩 캐시 행렬/키 인덱스 불일치, 캐시를 비우고 시작합니다.")
+            return
+
+        self.matrix = matrix
+        self.keys = keys
+        self.key_to_row = {key: row for row, key in enumerate(keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys_after_save())
+
+    def __contains__(self, key: str) -> bool:
+        if key in self.pending:
+            return True
+        return key in self.key_to_row and key not in self.evicted
+
+    def lookup(self, keys: Iterable[str]) -> np.ndarray:
+        """
+        키 목록에서 캐시에 있는 키를 확인하고 hit/miss 횟수를 기록
+
+        Returns:
+            np.ndarray: 키별 hit 여부(bool)
+        """
+        hit_mask = np.array([key in self for key in keys], dtype=bool)
+        self.hits += int(hit_mask.sum())
+        self.misses += int((~hit_mask).sum())
+        return hit_mask
+
+    def get(self, keys: List[str]) -> np.ndarray:
+        """
+        키 목록 순서대로 임베딩 행렬을 조립해서 반환 (모든 키가 캐시에 있어야 함)
+        """
+        if not keys:
+            return np.empty((0, self.dimension or 0), dtype=np.float32)
+
+        result = np.empty((len(keys), self.dimension), dtype=np.float32)
+        disk_pos, disk_rows = [], []
+        for i, key in enumerate(keys):
+            if key in self.pending:
+                result[i] = self.pending[key]
+            else:
+                disk_pos.append(i)
+                disk_rows.append(self.key_to_row[key])
+
+        # memmap fancy indexing은 필요한 행만 메모리로 읽어 옴
+        if disk_rows:
+            result[disk_pos] = self.matrix[np.asarray(disk_rows)]
+        return result
+
+    def put(self, keys: List[str], vectors: np.ndarray):
+        """새로 인코딩한 임베딩을 캐시에 추가 (save 호출 시 디스크 반영)"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        for key, vector in zip(keys, vectors):
+            self.pending[key] = vector
+            self.evicted.discard(key)
+
+    def evict(self, keep_keys: Iterable[str]) -> int:
+        """
+        keep_keys에 없는 항목(더 이상 존재하지 않는 상품)을 캐시에서 제거
+
+        Returns:
+            int: 제거된 항목 수
+        """
+        keep = set(keep_keys)
+        stale_disk = {key for key in self.keys if key not in keep}
+        stale_pending = [key for key in self.pending if key not in keep]
+        for key in stale_pending:
+            del self.pending[key]
+        newly_evicted = stale_disk - self.evicted
+        self.evicted |= stale_disk
+        return len(newly_evicted) + len(stale_pending)
+
+    @property
+    def dimension(self):
+        if self.matrix is not None:
+            return self.matrix.shape[1]
+        if self.pending:
+            return next(iter(self.pending.values())).shape[0]
+        return None
+
+    def keys_after_save(self) -> List[str]:
+        kept = [key for key in self.keys if key not in self.evicted and key not in self.pending]
+        return kept + list(self.pending.keys())
+
+    def save(self):
+        """
+        변경분을 반영한 새 행렬/키 인덱스를 임시 파일에 쓴 뒤 교체
+        - 행렬 → 키 인덱스 순서로 교체해서, 중간에 중단되어도 load 시 길이 검사로 걸러짐
+        """
+        if not self.pending and not self.evicted:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        new_keys = self.keys_after_save()
+        dimension = self.dimension
+
+        # 모두 제거된 경우 빈 파일은 memory-map 할 수 없으므로 캐시 파일 삭제
+        if not new_keys:
+            self.matrix = None
+            for path in (self.matrix_path, self.keys_path, self.manifest_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.keys, self.key_to_row = [], {}
+            self.pending, self.evicted = {}, set()
+            return
+
+        tmp_matrix_path = self.matrix_path + '.tmp'
+        out = np.lib.format.open_memmap(
+            tmp_matrix_path, mode='w+', dtype=np.float32, shape=(len(new_keys), dimension)
+        )
+        kept_keys = [key for key in self.keys if key not in self.evicted and key not in self.pending]
+        if kept_keys:
+            out[:len(kept_keys)] = self.matrix[np.asarray([self.key_to_row[k] for k in kept_keys])]
+        if self.pending:
+            out[len(kept_keys):] = np.stack(list(self.pending.values()))
+        out.flush()
+        del out
+
+        tmp_keys_path = self.keys_path + '.tmp.npy'
+        np.save(tmp_keys_path, np.asarray(new_keys, dtype='U40'))
+
+        # 기존 memmap을 닫고 파일 교체
+        self.matrix = None
+        os.replace(tmp_matrix_path, self.matrix_path)
+        os.replace(tmp_keys_path, self.keys_path)
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({'model_name': self.model_name, 'dimension': dimension, 'size': len(new_keys)}, f)
+
+        self.pending = {}
+        self.evicted = set()
+        self.load()
+
+    def stats(self) -> Dict:
+        """캐시 hit/miss 및 크기 요약"""
+        total = self.hits + self.misses
+        return {
+            'model_name': self.model_name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self),
+        }
@@ -1,47 +1,101 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional
 from sklearn.preprocessing import normalize
 
+from config.product_config import EMBEDDING_MODEL_NAME, EMBEDDING_BACKEND, ONNX_QUANTIZE
+from product.embedding.embedding_cache import EmbeddingCache
+
 class EmbeddingGenerator:
     """
     SBERT 모델을 활용해 상품/사용자 텍스트를 벡터로 변환하는 클래스 
     """
 
-    def __init__(self, model_name: str = 'jhgan/ko-sroberta-multitask'):
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME, backend: str = EMBEDDING_BACKEND, quantize: bool = ONNX_QUANTIZE):
         """
         SBERT 모델 로딩
+
+        Args:
+            model_name: SBERT 모델명
+            backend: 'torch'(sentence-transformers) 또는 'onnx'(ONNX Runtime)
+            quantize: onnx backend에서 int8 dynamic quantization 사용 여부
         """
+        if backend == 'onnx':
+            from product.embedding.onnx_encoder import OnnxSentenceEncoder
+            self.model = OnnxSentenceEncoder(model_name, quantize=quantize)
+            self.model_name = model_name
+            # backend별 임베딩 값이 조금씩 달라서 캐시 키를 분리
+            self.embedding_id = f"{model_name}@onnx-int8" if quantize else f"{model_name}@onnx"
+            return
+        if backend != 'torch':
+            raise ValueError(f"지원하지 않는 임베딩 backend입니다: {backend}")
+
+        from sentence_transformers import SentenceTransformer
         try:
-            from sentence_transformers import SentenceTransformer
             self.model = SentenceTransformer(model_name)
+            self.model_name = model_name
         except Exception as e:
             print(f"모델 로딩 실패({e}), 다국어 모델로 대체합니다.")
-            self.model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+            self.model_name = 'paraphrase-multilingual-MiniLM-L12-v2'
+            self.model = SentenceTransformer(self.model_name)
+        self.embedding_id = self.model_name
     
-    def generate_product_embeddings(self, products_df : pd.DataFrame) -> Tuple[np.ndarray, List[str]]:
+    def generate_product_embeddings(
+            self,
+            products_df: pd.DataFrame,
+            cache: Optional[EmbeddingCache] = None,
+            evict_stale: bool = True
+        ) -> Tuple[np.ndarray, List[str]]:
         """
         상품명 + 카테고리 텍스트로 임베딩 생성 
         
         Args:
-            카테고리 전처리, 1인 가구 점수 계산 전처리 완료된 df
+            products_df: 카테고리 전처리, 1인 가구 점수 계산 전처리 완료된 df
+            cache: 임베딩 디스크 캐시 - 주어지면 새로 추가/변경된 텍스트만 인코딩
+            evict_stale: 현재 카탈로그에 없는 캐시 항목 제거 여부
 
         Returns:
             임베딩 배열과 임베딩에 사용된 텍스트 리스트
         """
+        product_texts = self.build_product_texts(products_df)
+
+        if cache is None:
+            return self.encode_texts(product_texts), product_texts
+
+        # 캐시에 없는 텍스트만 중복 없이 인코딩
+        keys = [cache.make_key(text) for text in product_texts]
+        hit_mask = cache.lookup(keys)
+        miss_texts = {keys[i]: product_texts[i] for i in np.flatnonzero(~hit_mask)}
+        if miss_texts:
+            new_embeddings = self.encode_texts(list(miss_texts.values()))
+            cache.put(list(miss_texts.keys()), new_embeddings)
+
+        # 더 이상 존재하지 않는 상품의 임베딩 제거 후 디스크 반영
+        evicted = cache.evict(keys) if evict_stale else 0
+        cache.save()
 
-        # 상품명과 카테고리 텍스트를 합쳐서 임베딩용 텍스트 리스트 생성
-        product_texts = [
+        stats = cache.stats()
+        print(f"[INFO] 임베딩 캐시 hit {stats['hits']}개, miss {stats['misses']}개, "
+              f"제거 {evicted}개, 캐시 크기 {stats['size']}개")
+
+        # 캐시에서 상품 순서대로 임베딩 조립
+        return cache.get(keys), product_texts
+
+    def build_product_texts(self, products_df: pd.DataFrame) -> List[str]:
+        """
+        상품명과 카테고리 텍스트를 합쳐서 임베딩용 텍스트 리스트 생성
+        """
+        return [
             f"{row['name']} {row.get('category_text', '')}".strip()
             for _, row in products_df.iterrows()
         ]
-        
-        # SBERT로 각 텍스트를 임베딩 벡터로 변환
-        embeddings = self.model.encode(product_texts, show_progress_bar=True, batch_size=32)
-        
-        # 임베딩 벡터 L2 정규화 
-        embeddings = normalize(embeddings, norm='l2', axis=1)
-        return embeddings, product_texts
+
+    def encode_texts(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        SBERT로 텍스트 리스트를 L2 정규화된 임베딩 벡터로 변환
+        """
+        embeddings = self.model.encode(texts, show_progress_bar=True, batch_size=batch_size)
+        return normalize(embeddings, norm='l2', axis=1)
     
     def generate_user_embedding(self, user_profile: Dict) -> Tuple[np.ndarray, str]:
         """
@@ -65,6 +119,31 @@ class EmbeddingGenerator:
         embedding = normalize(embedding.reshape(1, -1), norm='l2')
 
         return embedding, query_text
+
+    def generate_user_embeddings(self, user_profiles: Dict[Any, Dict], batch_size: int = 256) -> Tuple[np.ndarray, Dict[Any, int]]:
+        """
+        전체 사용자 프로필의 쿼리 텍스트를 한 번에 임베딩
+        - 나이대/성별/관심사가 같은 사용자는 쿼리 텍스트가 같으므로 고유 텍스트만 인코딩
+
+        Args:
+            user_profiles: {user_id: 사용자 프로필}
+            batch_size: SBERT 인코딩 배치 크기
+
+        Returns:
+            고유 쿼리 텍스트별 임베딩 행렬과 {user_id: 행 번호} 매핑
+        """
+        text_rows = {}  # {쿼리 텍스트: 행 번호}
+        user_rows = {}
+        for user_id, user_profile in user_profiles.items():
+            query_text = self.build_query_text(user_profile)
+            user_rows[user_id] = text_rows.setdefault(query_text, len(text_rows))
+
+        if not text_rows:
+            return np.empty((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32), user_rows
+
+        embeddings = self.encode_texts(list(text_rows), batch_size=batch_size)
+        print(f"[INFO] 사용자 {len(user_rows)}명, 고유 쿼리 텍스트 {len(text_rows)}개 임베딩 완료")
+        return embeddings, user_rows
     
     def build_query_text(self, user_profile: Dict) -> str:
         """
@@ -1,38 +1,298 @@
 import os
-from typing import Tuple
+from typing import Tuple, Dict, Optional, List, Set
 import numpy as np
+import pandas as pd
 import faiss
 import boto3
 
+from config.product_config import FAISS_INDEX_TYPE, FAISS_INDEX_PARAMS, RECOMMENDATION_CATEGORIES
+from utils.category_match import CategoryMatcher
+
 class FAISSIndexManager:
     """
     FAISS 내부 VectorDB를 활용해 L2 정규화된 벡터의 
     코사인 유사도 기반 고속 검색 인덱스를 생성/검색/저장/복구하는 클래스 
+    - index_type으로 정확 검색(flat)과 근사 검색(hnsw, ivf_flat, ivf_pq) 인덱스 선택
+    - product_ids를 주면 product_id 기반 인덱스로 구축되어 검색 결과로 product_id를 반환하고
+      add/remove/upsert로 상품 변경분만 반영 가능
+    - build_category_indexes로 카테고리 pool과 같은 기준의 카테고리별 sub-index를 만들어 카테고리 안에서만 유사 상품 검색 가능
+    - compact 모드: reduce_dim으로 차원 축소(PCA/앞쪽 차원 truncation), storage로 float16/8bit 양자화 저장
     """
-    def __init__(self):
+    INDEX_TYPES = ('flat', 'hnsw', 'ivf_flat', 'ivf_pq')
+    REDUCE_METHODS = ('pca', 'truncate')
+
+    # storage → faiss.index_factory 벡터 저장 코드
+    STORAGE_CODES = {
+        'float32': 'Flat',
+        'fp16': 'SQfp16',
+        'sq8': 'SQ8',
+    }
+
+    DEFAULT_INDEX_PARAMS = {
+        'hnsw_m': 32,             # HNSW 그래프 이웃 수
+        'ef_construction': 40,    # HNSW 구축 시 탐색 폭
+        'ef_search': 64,          # HNSW 검색 시 탐색 폭
+        'nlist': None,            # IVF 클러스터 수 (None이면 상품 수 기준 자동 결정)
+        'nprobe': 8,              # IVF 검색 시 탐색할 클러스터 수
+        'pq_m': 16,               # PQ 서브 벡터 수 (임베딩 차원의 약수)
+        'pq_nbits': 8,            # PQ 서브 벡터당 비트 수
+        'reduce_dim': None,       # 축소할 차원 (None이면 원본 차원 유지)
+        'reduce_method': 'pca',   # 차원 축소 방식 (pca, truncate)
+        'storage': 'float32',     # 벡터 저장 형식 (float32, fp16, sq8) - ivf_pq는 PQ 코드로 저장
+    }
+
+    def __init__(self, index_type: str = FAISS_INDEX_TYPE, index_params: Optional[Dict] = None):
+        if index_type not in self.INDEX_TYPES:
+            raise ValueError(f"지원하지 않는 인덱스 타입입니다: {index_type} (지원: {self.INDEX_TYPES})")
+        self.index_type = index_type
+        self.index_params = {**self.DEFAULT_INDEX_PARAMS, **FAISS_INDEX_PARAMS, **(index_params or {})}
+        if self.index_params['storage'] not in self.STORAGE_CODES:
+            raise ValueError(f"지원하지 않는 저장 형식입니다: {self.index_params['storage']} (지원: {tuple(self.STORAGE_CODES)})")
+        if self.index_params['reduce_method'] not in self.REDUCE_METHODS:
+            raise ValueError(f"지원하지 않는 차원 축소 방식입니다: {self.index_params['reduce_method']} (지원: {self.REDUCE_METHODS})")
+        if self.index_params['reduce_dim'] is not None:
+            self.check_pq_params(self.index_params['reduce_dim'])
         self.index = None
-        self.normalized_embeddings = None
+
+        # product_id 기반 인덱스 여부와 인덱스에 들어 있는 product_id 목록
+        self.id_mapped = False
+        self.product_ids = None
+
+        # memory-map으로 로드한 인덱스는 읽기 전용 (add/remove 불가)
+        self.read_only = False
+
+        # 카테고리별 product_id 기반 sub-index (bundle에는 저장하지 않음)
+        self.category_indexes: Dict[str, faiss.Index] = {}
     
-    def build_index(self, embeddings: np.ndarray) -> faiss.IndexFlatIP:
+    def build_index(self, embeddings: np.ndarray, product_ids: Optional[np.ndarray] = None) -> faiss.Index:
         """
         상품 임베딩 배열을 받아 L2 정규화하고 FAISS 인덱스를 생성
+        - 근사 검색 인덱스(IVF 계열)는 상품 임베딩으로 학습 후 추가
 
         Args:
             embeddings (np.ndarray): (N, D) 임베딩 배열
+            product_ids (np.ndarray): (N,) 임베딩 행별 product_id - 주면 product_id 기반 인덱스로 구축
 
         Returns:
-            faiss.IndexFlatIP: FAISS 인덱스 객체
-        """
-        # L2 정규화 
-        self.normalized_embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
-        dimension = embeddings.shape[1]
-        
-        # FAISS의 벡터 내적 기반 인덱스 생성 - 코사도 유사도 기반 검색 
-        self.index = faiss.IndexFlatIP(dimension)
-        
-        # FAISS는 float32 타입만 지원하므로 형 변환
-        self.index.add(self.normalized_embeddings.astype('float32'))
+            faiss.Index: FAISS 인덱스 객체
+        """
+        # L2 정규화 - FAISS는 float32 타입만 지원하므로 float32로 바로 정규화 (float64 사본을 만들지 않음)
+        vectors = self.normalize(embeddings)
+        dimension = vectors.shape[1]
+
+        # FAISS의 벡터 내적 기반 인덱스 생성 - 코사인 유사도 기반 검색
+        index = self.create_index(dimension, len(vectors))
+        if self.index_type == 'hnsw':
+            self.base_index(index).hnsw.efConstruction = self.index_params['ef_construction']
+
+        # IVF 계열은 클러스터/코드북 학습이 필요
+        if not index.is_trained:
+            index.train(vectors)
+
+        self.read_only = False
+        self.category_indexes = {}
+        self.id_mapped = product_ids is not None
+        if self.id_mapped:
+            # IVF 계열은 자체적으로 id를 저장하고, 나머지는 IDMap2로 감싸서 id 매핑
+            is_ivf = faiss.try_extract_index_ivf(index) is not None
+            self.index = index if is_ivf else faiss.IndexIDMap2(index)
+            self.product_ids = np.empty(0, dtype='int64')
+            self.add(product_ids, vectors)
+        else:
+            self.index = index
+            self.product_ids = None
+            self.index.add(vectors)
+
+        self.apply_search_params()
         return self.index
+
+    def create_index(self, dimension: int, n_vectors: int) -> faiss.Index:
+        """
+        factory 문자열로 인덱스 생성
+        - truncate 차원 축소는 factory 문자열로 표현할 수 없어서 앞쪽 reduce_dim 차원만 남기는
+          LinearTransform을 인덱스 앞에 붙임
+        """
+        reduce_dim = self.index_params['reduce_dim']
+        if reduce_dim is not None and not 0 < reduce_dim <= dimension:
+            raise ValueError(f"reduce_dim({reduce_dim})은 1 이상 임베딩 차원({dimension}) 이하여야 합니다.")
+        self.check_pq_params(reduce_dim or dimension)
+
+        if reduce_dim is None or reduce_dim == dimension or self.index_params['reduce_method'] == 'pca':
+            return faiss.index_factory(dimension, self.factory_string(n_vectors, dimension), faiss.METRIC_INNER_PRODUCT)
+
+        # 앞쪽 차원만 남긴 뒤 다시 L2 정규화
+        factory = f"L2norm,{self.storage_factory_string(n_vectors)}"
+        index = faiss.index_factory(reduce_dim, factory, faiss.METRIC_INNER_PRODUCT)
+        truncate = faiss.LinearTransform(dimension, reduce_dim, False)
+        faiss.copy_array_to_vector(np.eye(reduce_dim, dimension, dtype='float32').ravel(), truncate.A)
+        truncate.is_trained = True
+
+        # factory로 만든 IndexPreTransform이 변환 객체를 소유(own_fields)하므로 Python 쪽 소유권은 해제
+        index.prepend_transform(truncate)
+        truncate.this.disown()
+        return index
+
+    def check_pq_params(self, dimension: int):
+        """
+        ivf_pq는 PQ에 들어가는 벡터 차원(reduce_dim 또는 임베딩 차원)이 pq_m으로 나누어떨어져야 함
+        - FAISS 학습 단계의 오류 대신 설정 시점에 원인을 알려줌
+        """
+        pq_m = self.index_params['pq_m']
+        if self.index_type == 'ivf_pq' and dimension % pq_m:
+            divisors = [m for m in range(1, dimension + 1) if dimension % m == 0]
+            raise ValueError(f"ivf_pq의 pq_m({pq_m})이 벡터 차원({dimension})의 약수가 아닙니다. (가능한 값: {divisors})")
+
+    @staticmethod
+    def base_index(index: faiss.Index) -> faiss.Index:
+        """차원 축소 변환(IndexPreTransform) 안쪽의 실제 인덱스"""
+        if isinstance(index, faiss.IndexPreTransform):
+            return faiss.downcast_index(index.index)
+        return index
+
+    def normalize(self, vectors: np.ndarray) -> np.ndarray:
+        """(N, D) 벡터를 L2 정규화된 float32 배열로 변환"""
+        vectors = np.ascontiguousarray(np.atleast_2d(vectors), dtype='float32')
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    def check_id_mapped(self):
+        if self.index is None:
+            raise ValueError("FAISS 인덱스가 구축되지 않았습니다.")
+        if not self.id_mapped:
+            raise ValueError("product_id 기반 인덱스가 아닙니다. build_index에 product_ids를 전달하세요.")
+
+    def check_writable(self):
+        self.check_id_mapped()
+        if self.read_only:
+            raise ValueError("memory-map으로 로드한 읽기 전용 인덱스는 수정할 수 없습니다.")
+
+    def add(self, product_ids: np.ndarray, vectors: np.ndarray):
+        """
+        상품 임베딩을 product_id와 함께 인덱스에 추가
+        - 이미 인덱스에 있는 product_id는 upsert 사용
+        """
+        self.check_writable()
+        product_ids = np.asarray(product_ids, dtype='int64')
+        if len(np.unique(product_ids)) != len(product_ids):
+            raise ValueError("추가할 product_id에 중복이 있습니다.")
+        duplicated = np.intersect1d(product_ids, self.product_ids)
+        if len(duplicated):
+            raise ValueError(f"이미 인덱스에 있는 product_id입니다: {duplicated[:10].tolist()} (upsert 사용)")
+
+        self.index.add_with_ids(self.normalize(vectors), product_ids)
+        self.product_ids = np.concatenate([self.product_ids, product_ids])
+
+    def remove(self, product_ids: np.ndarray) -> int:
+        """
+        product_id에 해당하는 상품을 인덱스에서 삭제
+
+        Returns:
+            int: 삭제된 상품 수
+        """
+        self.check_writable()
+        product_ids = np.asarray(product_ids, dtype='int64')
+        if not len(product_ids):
+            return 0
+        try:
+            removed = self.index.remove_ids(faiss.IDSelectorBatch(product_ids))
+        except RuntimeError as e:
+            raise NotImplementedError(f"{self.index_type} 인덱스는 삭제를 지원하지 않아 재구축이 필요합니다: {e}")
+        self.product_ids = self.product_ids[~np.isin(self.product_ids, product_ids)]
+        return removed
+
+    def upsert(self, product_ids: np.ndarray, vectors: np.ndarray):
+        """
+        product_id가 인덱스에 있으면 임베딩을 교체하고, 없으면 추가
+        """
+        product_ids = np.asarray(product_ids, dtype='int64')
+        existing = product_ids[np.isin(product_ids, self.product_ids)]
+        self.remove(existing)
+        self.add(product_ids, vectors)
+
+    def resolve_positions(self, labels: np.ndarray, product_index: pd.Index) -> np.ndarray:
+        """
+        검색 결과 label을 상품 데이터프레임의 행 위치로 변환
+        - product_id 기반 인덱스: product_id → 행 위치 (카탈로그에 없는 상품은 -1)
+        - 위치 기반 인덱스: label이 곧 행 위치
+
+        Args:
+            labels: search 결과 label 배열 (batch 검색 결과의 2차원 배열도 가능)
+            product_index: 상품 데이터프레임의 product_id 순서로 만든 pd.Index
+
+        Returns:
+            np.ndarray: 행 위치 배열 (-1은 매핑 불가)
+        """
+        labels = np.asarray(labels)
+        if self.id_mapped:
+            return product_index.get_indexer(labels.ravel()).reshape(labels.shape)
+        return np.where((labels >= 0) & (labels < len(product_index)), labels, -1)
+
+    def factory_string(self, n_vectors: int, dimension: Optional[int] = None) -> str:
+        """
+        index_type과 파라미터로 faiss.index_factory 문자열 생성
+        - PCA 차원 축소면 "PCA{d},L2norm,"을 앞에 붙여서 축소 후 다시 정규화 (코사인 유사도 유지)
+        - truncate 차원 축소는 create_index에서 처리
+        - 학습 데이터가 부족하면 정확 검색(Flat)으로 대체
+        """
+        params = self.index_params
+        reduce_dim = params['reduce_dim']
+        prefix = ''
+        if params['reduce_method'] == 'pca' and reduce_dim is not None and reduce_dim != dimension:
+            prefix = f"PCA{reduce_dim},L2norm,"
+        return prefix + self.storage_factory_string(n_vectors)
+
+    def storage_factory_string(self, n_vectors: int) -> str:
+        """차원 변환을 제외한 인덱스 구조 + 벡터 저장 형식 factory 문자열"""
+        params = self.index_params
+        code = self.STORAGE_CODES[params['storage']]
+        if self.index_type == 'hnsw':
+            return f"HNSW{params['hnsw_m']},{code}"
+
+        if self.index_type in ('ivf_flat', 'ivf_pq'):
+            # FAISS 권장: 클러스터당 학습 벡터 39개 이상, 클러스터 수는 약 4*sqrt(N)
+            nlist = params['nlist'] or int(min(4 * np.sqrt(n_vectors), n_vectors // 39))
+            min_train = 39 * nlist
+            if self.index_type == 'ivf_pq':
+                min_train = max(min_train, 2 ** params['pq_nbits'])
+            if nlist < 1 or n_vectors < min_train:
+                print(f"[WARN] 상품 수({n_vectors})가 {self.index_type} 학습에 부족하여 Flat 인덱스로 대체합니다.")
+                return code
+            if self.index_type == 'ivf_flat':
+                return f"IVF{nlist},{code}"
+            return f"IVF{nlist},PQ{params['pq_m']}x{params['pq_nbits']}"
+
+        return code
+
+    def memory_bytes(self) -> int:
+        """현재 인덱스의 직렬화 크기(byte) - 벡터 저장 형식/차원 축소에 따른 메모리 사용량 비교용"""
+        if self.index is None:
+            return 0
+        return int(faiss.serialize_index(self.index).nbytes)
+
+    def set_search_params(self, ef_search: Optional[int] = None, nprobe: Optional[int] = None):
+        """
+        검색 파라미터 조정 (recall/속도 trade-off)
+        - ef_search: HNSW 탐색 폭, 클수록 정확하고 느림
+        - nprobe: IVF 탐색 클러스터 수, 클수록 정확하고 느림
+        """
+        if ef_search is not None:
+            self.index_params['ef_search'] = ef_search
+        if nprobe is not None:
+            self.index_params['nprobe'] = nprobe
+        self.apply_search_params()
+
+    def apply_search_params(self):
+        """
+        현재 인덱스에 해당하는 검색 파라미터만 적용
+        - 파일에서 로드한 인덱스는 타입을 알 수 없으므로 적용 가능한 파라미터만 반영
+        """
+        if self.index is None:
+            return
+        parameter_space = faiss.ParameterSpace()
+        for name, key in (('efSearch', 'ef_search'), ('nprobe', 'nprobe')):
+            try:
+                parameter_space.set_index_parameter(self.index, name, self.index_params[key])
+            except RuntimeError:
+                continue
        
     def search(self, query_embedding: np.ndarray, k: int=50) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -44,6 +304,8 @@ class FAISSIndexManager:
 
         Returns:
             Tuple[np.ndarray, np.ndarray]: (유사도 점수 배열, 상품 인덱스 배열)
+                - product_id 기반 인덱스는 상품 인덱스 대신 product_id 배열 반환
+                - 결과가 k개보다 적으면 -1로 채워짐
         """
         if self.index is None:
             raise ValueError("FAISS 인덱스가 구축되지 않았습니다.")
@@ -55,36 +317,203 @@ class FAISSIndexManager:
         scores, indices = self.index.search(query_embedding, k)
         return scores[0], indices[0]
     
+    def search_batch(self, query_embeddings: np.ndarray, k: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        여러 사용자 임베딩을 한 번의 FAISS 호출로 검색
+        - FAISS가 쿼리들을 OpenMP로 모든 코어에 나눠서 처리
+
+        Args:
+            query_embeddings (np.ndarray): (Q, D) 쿼리 임베딩 배열
+            k (int): 쿼리별 반환할 유사 상품 개수
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (Q, k) 유사도 점수 배열, (Q, k) label 배열
+        """
+        if self.index is None:
+            raise ValueError("FAISS 인덱스가 구축되지 않았습니다.")
+        return self.index.search(self.normalize(query_embeddings), k)
+
+    def search_excluding(
+            self,
+            query_embeddings: np.ndarray,
+            k: int,
+            exclude: Optional[List[Set]] = None
+        ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        쿼리별 제외 집합에 있는 label을 빼고 정확히 k개씩 검색
+        - 쿼리별로 k + |제외 집합| 개를 검색하면 제외 후에도 k개가 남는 것이 보장되므로 재검색 루프가 없음
+        - 검색 깊이가 비슷한 쿼리끼리(2의 거듭제곱 단위) 묶어서 한 번에 batch 검색
+
+        Args:
+            query_embeddings (np.ndarray): (Q, D) 또는 (D,) 쿼리 임베딩
+            k (int): 쿼리별 반환할 유사 상품 개수
+            exclude (List[Set]): 쿼리별 제외할 label 집합 (product_id 기반 인덱스면 product_id)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (Q, k) 유사도 점수 배열, (Q, k) label 배열
+                - 인덱스 상품이 부족하면 점수 -inf, label -1로 채워짐
+        """
+        if self.index is None:
+            raise ValueError("FAISS 인덱스가 구축되지 않았습니다.")
+        return self.search_index_excluding(self.index, query_embeddings, k, exclude)
+
+    def build_category_indexes(
+            self,
+            embeddings: np.ndarray,
+            product_ids: np.ndarray,
+            categories,
+            target_categories: Optional[List[str]] = None
+        ) -> Dict[str, int]:
+        """
+        카테고리 pool과 같은 기준(대분류에 카테고리명 포함)으로 카테고리별 product_id 기반 sub-index 구축
+        - 전체 인덱스의 학습된 구조(차원 축소, 저장 형식, IVF/PQ 코드북)를 복사한 빈 인덱스에 카테고리 상품만 추가
+          → compact/PQ 설정이 sub-index에도 그대로 적용되고 카테고리별 재학습이 없음
+        - IVF는 카테고리 상품 비율만큼 nprobe를 늘려서 전체 인덱스와 비슷한 수의 후보를 탐색
+
+        Args:
+            embeddings (np.ndarray): (N, D) 상품 임베딩 배열
+            product_ids (np.ndarray): (N,) 임베딩 행별 product_id
+            categories: (N,) 임베딩 행별 large_category
+            target_categories: sub-index를 만들 카테고리명 (None이면 RECOMMENDATION_CATEGORIES)
+
+        Returns:
+            Dict[str, int]: 카테고리별 상품 수
+        """
+        self.check_id_mapped()
+        vectors = self.normalize(embeddings)
+        product_ids = np.asarray(product_ids, dtype='int64')
+
+        # faiss.clone_index는 PCA/L2norm 변환을 복사하지 못해서 직렬화로 복사
+        template = faiss.deserialize_index(faiss.serialize_index(self.index))
+        template.reset()
+        template_bytes = faiss.serialize_index(template)
+
+        self.category_indexes = {}
+        for category in target_categories or RECOMMENDATION_CATEGORIES:
+            rows = CategoryMatcher.positions(categories, category)
+            if not len(rows):
+                continue
+            index = faiss.deserialize_index(template_bytes)
+            index.add_with_ids(vectors[rows], product_ids[rows])
+
+            ivf = faiss.try_extract_index_ivf(index)
+            if ivf is not None:
+                scale = max(self.index.ntotal, 1) / len(rows)
+                ivf.nprobe = int(min(ivf.nlist, np.ceil(self.index_params['nprobe'] * scale)))
+            self.category_indexes[category] = index
+
+        sizes = {name: index.ntotal for name, index in self.category_indexes.items()}
+        print(f"[INFO] 카테고리별 sub-index 구축 완료: {sizes}")
+        return sizes
+
+    def search_category(
+            self,
+            category: str,
+            query_embeddings: np.ndarray,
+            k: int,
+            exclude: Optional[List[Set]] = None
+        ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        특정 large_category 안에서만 제외 집합을 빼고 유사 상품 k개씩 검색
+        - 카테고리 sub-index가 없으면 모두 점수 -inf, product_id -1로 채워진 결과 반환
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (Q, k) 유사도 점수 배열, (Q, k) product_id 배열
+        """
+        index = self.category_indexes.get(category)
+        if index is None:
+            n_queries = len(np.atleast_2d(query_embeddings))
+            return np.full((n_queries, k), -np.inf, dtype='float32'), np.full((n_queries, k), -1, dtype='int64')
+        return self.search_index_excluding(index, query_embeddings, k, exclude)
+
+    def search_index_excluding(
+            self,
+            index: faiss.Index,
+            query_embeddings: np.ndarray,
+            k: int,
+            exclude: Optional[List[Set]] = None
+        ) -> Tuple[np.ndarray, np.ndarray]:
+        """search_excluding / search_category 공통 검색 로직"""
+        queries = self.normalize(query_embeddings)
+        n_queries = len(queries)
+        exclude = exclude if exclude is not None else [set()] * n_queries
+
+        out_scores = np.full((n_queries, k), -np.inf, dtype='float32')
+        out_labels = np.full((n_queries, k), -1, dtype='int64')
+        if k <= 0 or index.ntotal == 0:
+            return out_scores, out_labels
+
+        # 쿼리별 필요한 검색 깊이를 2의 거듭제곱으로 올림해서 그룹화
+        depths = np.array([k + len(excluded) for excluded in exclude])
+        depths = np.minimum(2 ** np.ceil(np.log2(depths)).astype(int), index.ntotal)
+
+        for depth in np.unique(depths):
+            rows = np.flatnonzero(depths == depth)
+            scores, labels = index.search(queries[rows], int(depth))
+
+            for row, row_scores, row_labels in zip(rows, scores, labels):
+                keep = row_labels >= 0
+                if exclude[row]:
+                    keep &= ~np.isin(row_labels, list(exclude[row]))
+                selected = np.flatnonzero(keep)[:k]
+                out_scores[row, :len(selected)] = row_scores[selected]
+                out_labels[row, :len(selected)] = row_labels[selected]
+
+        return out_scores, out_labels
+
+    @staticmethod
+    def ids_path(index_path: str) -> str:
+        """product_id 매핑 파일 경로 - 인덱스 파일 옆에 저장"""
+        return f"{index_path}.ids.npy"
+
     def save_index_to_local(self, local_path: str):
         """
         현재 인덱스를 로컬 파일로 저장
+        - product_id 기반 인덱스는 product_id 매핑 파일도 함께 저장
         """
         if self.index is None:
             raise ValueError("저장할 인덱스가 없습니다.")
         faiss.write_index(self.index, local_path)
+        if self.id_mapped:
+            np.save(self.ids_path(local_path), self.product_ids)
+        elif os.path.exists(self.ids_path(local_path)):
+            os.remove(self.ids_path(local_path))
     
     def load_index_from_local(self, local_path: str):
         """
         로컬 파일에서 인덱스를 로드
+        - product_id 매핑 파일이 있으면 product_id 기반 인덱스로 로드
         """
         if not os.path.exists(local_path):
             raise FileNotFoundError(f"인덱스 파일이 존재하지 않습니다:{local_path}")
         self.index = faiss.read_index(local_path)
+        self.read_only = False
+        self.id_mapped = os.path.exists(self.ids_path(local_path))
+        self.product_ids = np.load(self.ids_path(local_path)) if self.id_mapped else None
+        self.apply_search_params()
     
     def save_index_to_S3(self, local_path: str, bucket: str, s3_key: str):
         """
-        로컬 인덱스 파일을 S3에 업로드
+        로컬 인덱스 파일(및 product_id 매핑 파일)을 S3에 업로드
         """
         s3 = boto3.client('s3')
         s3.upload_file(local_path, bucket, s3_key)
+        if os.path.exists(self.ids_path(local_path)):
+            s3.upload_file(self.ids_path(local_path), bucket, self.ids_path(s3_key))
     
     def load_index_from_s3(self, local_path: str, bucket: str, s3_key: str):
         """
-        S3에서 인덱스 파일을 다운로드 후 로컬에 저장 및 인덱스 로드
+        S3에서 인덱스 파일(및 product_id 매핑 파일)을 다운로드 후 로컬에 저장 및 인덱스 로드
         """
         s3 = boto3.client('s3')
         s3.download_file(bucket, s3_key, local_path)
-        self.index = faiss.read_index(local_path)
+        try:
+            s3.download_file(bucket, self.ids_path(s3_key), self.ids_path(local_path))
+        except Exception:
+            # 매핑 파일이 없는 이전 형식의 위치 기반 인덱스
+            if os.path.exists(self.ids_path(local_path)):
+                os.remove(self.ids_path(local_path))
+        self.load_index_from_local(local_path)
     
     def auto_load_index(self, local_path: str, bucket: str, s3_key: str):
         """
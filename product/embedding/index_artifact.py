@@ -0,0 +1,224 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import datetime
+import numpy as np
+import faiss
+import boto3
+from typing import Dict, List, Optional
+
+from product.embedding.faiss_manager import FAISSIndexManager
+
+class IndexArtifact:
+    """
+    FAISS 인덱스 배포 단위(bundle)를 생성/업로드/다운로드/로드하는 클래스
+    - index.faiss: product_id 기반 FAISS 인덱스
+    - product_ids.npy: 인덱스에 들어 있는 product_id 배열
+    - manifest.json: 모델명, 카탈로그 버전, 인덱스 정보, 파일 크기, checksum
+    bundle은 버전 디렉토리({artifact_dir}.v-*)에 쓴 뒤 artifact_dir 심볼릭 링크를 원자적으로 교체해서
+    항상 완전한 상태로만 보이게 함
+    """
+    FORMAT_VERSION = 1
+    INDEX_FILE = 'index.faiss'
+    IDS_FILE = 'product_ids.npy'
+    MANIFEST_FILE = 'manifest.json'
+
+    @staticmethod
+    def catalog_version(product_ids: np.ndarray, product_texts: List[str]) -> str:
+        """
+        상품 ID와 임베딩 텍스트로 카탈로그 버전(내용 해시) 생성
+        """
+        digest = hashlib.sha256()
+        digest.update(np.asarray(product_ids, dtype='int64').tobytes())
+        for text in product_texts:
+            digest.update(text.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()[:16]
+
+    @classmethod
+    def checksum(cls, artifact_dir: str) -> str:
+        """인덱스 파일 + product_id 파일의 sha256"""
+        digest = hashlib.sha256()
+        for name in (cls.INDEX_FILE, cls.IDS_FILE):
+            with open(os.path.join(artifact_dir, name), 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def write(cls, faiss_manager: FAISSIndexManager, artifact_dir: str, model_name: str, catalog_version: str) -> Dict:
+        """
+        product_id 기반 인덱스를 bundle로 저장 (버전 디렉토리에 쓴 뒤 링크 교체)
+
+        Returns:
+            Dict: manifest
+        """
+        faiss_manager.check_id_mapped()
+        tmp_dir = cls.version_dir(artifact_dir)
+        try:
+            manifest = cls.write_files(faiss_manager, tmp_dir, model_name, catalog_version)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        cls.publish(tmp_dir, artifact_dir)
+        print(f"[INFO] 인덱스 bundle 저장 완료: {artifact_dir} (상품 {manifest['ntotal']}개, 카탈로그 {catalog_version})")
+        return manifest
+
+    @classmethod
+    def write_files(cls, faiss_manager: FAISSIndexManager, tmp_dir: str, model_name: str, catalog_version: str) -> Dict:
+        """bundle 파일(인덱스, product_id, manifest)을 디렉토리에 저장"""
+        faiss.write_index(faiss_manager.index, os.path.join(tmp_dir, cls.INDEX_FILE))
+        np.save(os.path.join(tmp_dir, cls.IDS_FILE), np.asarray(faiss_manager.product_ids, dtype='int64'))
+
+        manifest = {
+            'format_version': cls.FORMAT_VERSION,
+            'model_name': model_name,
+            'catalog_version': catalog_version,
+            'index_type': faiss_manager.index_type,
+            'index_params': faiss_manager.index_params,
+            'dimension': faiss_manager.index.d,
+            'ntotal': faiss_manager.index.ntotal,
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'files': {
+                name: os.path.getsize(os.path.join(tmp_dir, name))
+                for name in (cls.INDEX_FILE, cls.IDS_FILE)
+            },
+            'checksum': cls.checksum(tmp_dir),
+        }
+        with open(os.path.join(tmp_dir, cls.MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return manifest
+
+    @staticmethod
+    def version_dir(artifact_dir: str) -> str:
+        """
+        새 bundle을 쓸 버전 디렉토리 생성
+        - 호출마다 고유한 이름이라 같은 artifact_dir에 동시에 써도 서로의 파일을 지우지 않음
+        """
+        parent = os.path.dirname(artifact_dir) or '.'
+        os.makedirs(parent, exist_ok=True)
+        return tempfile.mkdtemp(prefix=f"{os.path.basename(artifact_dir)}.v-", dir=parent)
+
+    @staticmethod
+    def publish(version_dir: str, artifact_dir: str):
+        """
+        artifact_dir 심볼릭 링크가 완성된 버전 디렉토리를 가리키도록 교체
+        - 임시 링크를 만든 뒤 os.replace로 덮어쓰므로 artifact_dir이 비는 순간이 없고,
+          중간에 프로세스가 죽어도 이전 bundle이나 새 bundle 중 하나가 그대로 남음
+        - 교체된 이전 버전 디렉토리는 삭제 (이미 mmap으로 열린 인덱스는 삭제 후에도 유효)
+        - 이전 형식의 일반 디렉토리는 최초 1회만 이름을 바꾼 뒤 링크로 전환
+        """
+        previous = None
+        if os.path.islink(artifact_dir):
+            previous = os.path.join(os.path.dirname(artifact_dir), os.readlink(artifact_dir))
+        elif os.path.isdir(artifact_dir):
+            previous = f"{version_dir}.legacy"
+            os.rename(artifact_dir, previous)
+
+        link = f"{version_dir}.link"
+        os.symlink(os.path.basename(version_dir), link)
+        os.replace(link, artifact_dir)
+
+        if previous and os.path.realpath(previous) != os.path.realpath(version_dir):
+            shutil.rmtree(previous, ignore_errors=True)
+
+    @classmethod
+    def read_manifest(cls, artifact_dir: str) -> Optional[Dict]:
+        path = os.path.join(artifact_dir, cls.MANIFEST_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @classmethod
+    def is_complete(cls, artifact_dir: str, manifest: Dict) -> bool:
+        """manifest에 기록된 파일이 모두 있고 크기가 같은지 확인 (checksum 재계산 없이 빠르게)"""
+        for name, size in manifest.get('files', {}).items():
+            path = os.path.join(artifact_dir, name)
+            if not os.path.exists(path) or os.path.getsize(path) != size:
+                return False
+        return True
+
+    @classmethod
+    def validate(cls, manifest: Dict, model_name: Optional[str] = None):
+        if manifest.get('format_version') != cls.FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 bundle 형식입니다: {manifest.get('format_version')}")
+        if model_name and manifest.get('model_name') != model_name:
+            raise ValueError(f"bundle 모델({manifest.get('model_name')})이 현재 모델({model_name})과 다릅니다.")
+
+    @classmethod
+    def load(cls, artifact_dir: str, faiss_manager: FAISSIndexManager, model_name: Optional[str] = None, mmap: bool = True) -> Dict:
+        """
+        bundle의 manifest를 검증하고 인덱스를 로드
+        - mmap=True면 인덱스를 memory-map으로 열어서 로드 시간/메모리 절약 (읽기 전용)
+
+        Returns:
+            Dict: manifest
+        """
+        # 링크를 한 번만 해석해서 로드 중에 bundle이 교체돼도 같은 버전의 파일만 읽음
+        artifact_dir = os.path.realpath(artifact_dir)
+        manifest = cls.read_manifest(artifact_dir)
+        if manifest is None:
+            raise FileNotFoundError(f"bundle manifest가 없습니다: {artifact_dir}")
+        cls.validate(manifest, model_name)
+        if not cls.is_complete(artifact_dir, manifest):
+            raise ValueError(f"bundle 파일이 manifest와 일치하지 않습니다: {artifact_dir}")
+
+        index_path = os.path.join(artifact_dir, cls.INDEX_FILE)
+        flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap else 0
+        faiss_manager.index = faiss.read_index(index_path, flags)
+        faiss_manager.index_type = manifest.get('index_type', faiss_manager.index_type)
+        faiss_manager.id_mapped = True
+        faiss_manager.read_only = mmap
+        faiss_manager.product_ids = np.load(os.path.join(artifact_dir, cls.IDS_FILE))
+        faiss_manager.apply_search_params()
+        return manifest
+
+    @classmethod
+    def upload(cls, artifact_dir: str, bucket: str, s3_prefix: str):
+        """
+        bundle을 S3에 업로드 - manifest를 마지막에 올려서 manifest가 보이면 bundle이 완전함을 보장
+        """
+        s3 = boto3.client('s3')
+        for name in (cls.INDEX_FILE, cls.IDS_FILE, cls.MANIFEST_FILE):
+            s3.upload_file(os.path.join(artifact_dir, name), bucket, f"{s3_prefix}/{name}")
+        print(f"[INFO] 인덱스 bundle S3 업로드 완료: s3://{bucket}/{s3_prefix}")
+
+    @classmethod
+    def download(cls, artifact_dir: str, bucket: str, s3_prefix: str) -> Dict:
+        """
+        S3 bundle을 로컬로 동기화
+        - 로컬 manifest의 checksum이 S3 manifest와 같고 파일이 온전하면 다운로드 생략
+        - 새로 받은 bundle은 checksum 검증 후 교체
+
+        Returns:
+            Dict: manifest
+        """
+        s3 = boto3.client('s3')
+        response = s3.get_object(Bucket=bucket, Key=f"{s3_prefix}/{cls.MANIFEST_FILE}")
+        remote_manifest = json.loads(response['Body'].read().decode('utf-8'))
+
+        local_manifest = cls.read_manifest(artifact_dir)
+        if (local_manifest and local_manifest.get('checksum') == remote_manifest.get('checksum')
+                and cls.is_complete(artifact_dir, local_manifest)):
+            print(f"[INFO] 로컬 bundle checksum 일치, 다운로드 생략: {artifact_dir}")
+            return local_manifest
+
+        tmp_dir = cls.version_dir(artifact_dir)
+        try:
+            for name in (cls.INDEX_FILE, cls.IDS_FILE):
+                s3.download_file(bucket, f"{s3_prefix}/{name}", os.path.join(tmp_dir, name))
+            if cls.checksum(tmp_dir) != remote_manifest.get('checksum'):
+                raise ValueError(f"다운로드한 bundle checksum 불일치: s3://{bucket}/{s3_prefix}")
+            with open(os.path.join(tmp_dir, cls.MANIFEST_FILE), 'w', encoding='utf-8') as f:
+                json.dump(remote_manifest, f, ensure_ascii=False, indent=2)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        cls.publish(tmp_dir, artifact_dir)
+        print(f"[INFO] 인덱스 bundle 다운로드 완료: s3://{bucket}/{s3_prefix} → {artifact_dir}")
+        return remote_manifest
@@ -0,0 +1,112 @@
+import os
+import numpy as np
+from typing import List
+
+from config.product_config import ONNX_EXPORT_DIR
+
+class OnnxSentenceEncoder:
+    """
+    SBERT 모델을 ONNX로 내보내고 ONNX Runtime(CPU)으로 실행하는 인코더
+    - sentence-transformers와 같은 attention mask 기반 mean pooling 적용
+    - quantize=True면 int8 dynamic quantization 모델 사용
+    - encode 인터페이스는 SentenceTransformer.encode와 호환
+    """
+
+    def __init__(self, model_name: str, export_dir: str = ONNX_EXPORT_DIR, quantize: bool = True, max_seq_length: int = 128):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        self.model_name = model_name
+        self.max_seq_length = max_seq_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.dimension = AutoConfig.from_pretrained(model_name).hidden_size
+
+        model_path = self.export(model_name, export_dir, quantize, self.tokenizer)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+    @staticmethod
+    def export(model_name: str, export_dir: str, quantize: bool, tokenizer) -> str:
+        """
+        HuggingFace 모델을 ONNX로 내보내고 (선택) int8 dynamic quantization 적용
+        - 이미 내보낸 파일이 있으면 재사용
+
+        Returns:
+            str: 사용할 ONNX 모델 파일 경로
+        """
+        model_dir = os.path.join(export_dir, model_name.replace('/', '__'))
+        fp32_path = os.path.join(model_dir, 'model.onnx')
+        int8_path = os.path.join(model_dir, 'model.int8.onnx')
+
+        if not os.path.exists(fp32_path):
+            import torch
+            from transformers import AutoModel
+
+            os.makedirs(model_dir, exist_ok=True)
+            model = AutoModel.from_pretrained(model_name)
+            model.eval()
+            dummy = tokenizer(['1인용 미니 밥솥'], return_tensors='pt')
+
+            # 배치 크기와 문장 길이는 동적으로 지정
+            dynamic_axes = {'input_ids': {0: 'batch', 1: 'sequence'},
+                            'attention_mask': {0: 'batch', 1: 'sequence'},
+                            'last_hidden_state': {0: 'batch', 1: 'sequence'}}
+            with torch.no_grad():
+                torch.onnx.export(
+                    model,
+                    (dummy['input_ids'], dummy['attention_mask']),
+                    fp32_path,
+                    input_names=['input_ids', 'attention_mask'],
+                    output_names=['last_hidden_state'],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=17
+                )
+            print(f"[INFO] ONNX 모델 내보내기 완료: {fp32_path}")
+
+        if not quantize:
+            return fp32_path
+
+        if not os.path.exists(int8_path):
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+            print(f"[INFO] int8 quantization 완료: {int8_path}")
+        return int8_path
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, sentences: List[str], batch_size: int = 32, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        """
+        문장 리스트를 임베딩 배열로 변환 (정규화 전)
+        - 길이가 비슷한 문장끼리 배치를 구성해서 padding 낭비를 줄임
+        """
+        if isinstance(sentences, str):
+            sentences = [sentences]
+
+        embeddings = np.empty((len(sentences), self.dimension), dtype=np.float32)
+        order = np.argsort([-len(sentence) for sentence in sentences], kind='stable')
+        batches = range(0, len(sentences), batch_size)
+        if show_progress_bar:
+            from tqdm import tqdm
+            batches = tqdm(batches, desc='Batches')
+
+        for start in batches:
+            batch_idx = order[start:start + batch_size]
+            tokens = self.tokenizer(
+                [sentences[i] for i in batch_idx],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors='np'
+            )
+            feeds = {name: tokens[name].astype(np.int64) for name in self.input_names}
+            hidden = self.session.run(None, feeds)[0]
+
+            # mean pooling - padding 토큰은 평균에서 제외
+            mask = tokens['attention_mask'][..., None].astype(np.float32)
+            embeddings[batch_idx] = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        return embeddings
@@ -0,0 +1,62 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List
+
+class KeywordMatcher:
+    """
+    여러 키워드의 상품명 포함 여부를 한 번에 계산하는 클래스
+    - 키워드 목록을 lookahead 정규식 하나로 묶어서 상품명마다 한 번만 훑음 (키워드별 substring 검사 반복 X)
+      - (?=(...))는 폭이 0인 매칭이라 모든 시작 위치에서 겹치는 키워드까지 찾음
+      - 같은 위치에서 시작하는 키워드는 가장 긴 것 하나만 잡히므로, 그 키워드의 접두어인
+        다른 키워드도 함께 포함된 것으로 처리 (예: '개별포장'이 잡히면 '개별'도 포함)
+    - 결과는 (상품 수, 키워드 수) bool 행렬이고, 가중치 합/포함 여부는 열 연산으로 계산
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(keywords))
+        self.columns: Dict[str, int] = {keyword: col for col, keyword in enumerate(self.keywords)}
+
+        # 긴 키워드를 먼저 시도해야 접두어 관계인 키워드 중 긴 쪽이 잡힘
+        alternatives = sorted(self.keywords, key=len, reverse=True)
+        self.pattern = re.compile("(?=(" + "|".join(map(re.escape, alternatives)) + "))")
+
+        # 잡힌 키워드 → 함께 포함되는 키워드(자기 자신 + 접두어) 열 번호
+        self.closure = {
+            keyword: [self.columns[other] for other in self.keywords if keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+
+    @staticmethod
+    def normalize_names(names: pd.Series) -> pd.Series:
+        """상품명을 문자열 소문자로 변환 (기존 str(name).lower()와 같음 - 결측값은 'nan')"""
+        return names.astype(str).str.lower()
+
+    def matches(self, names: pd.Series) -> np.ndarray:
+        """
+        Args:
+            names: 소문자로 변환된 상품명 Series
+
+        Returns:
+            np.ndarray: (상품 수, 키워드 수) 키워드 포함 여부 행렬
+        """
+        result = np.zeros((len(names), len(self.keywords)), dtype=bool)
+        if not len(names) or not self.keywords:
+            return result
+
+        found = pd.Series(names.to_numpy(), dtype=object).str.findall(self.pattern).explode().dropna()
+        if found.empty:
+            return result
+        cols = found.map(self.closure).explode()
+        result[cols.index.to_numpy(dtype=np.int64), cols.to_numpy(dtype=np.int64)] = True
+        return result
+
+    def count(self, matches: np.ndarray, keywords: List[str]) -> np.ndarray:
+        """상품별로 keywords 중 포함된 키워드 수 (목록에 중복된 키워드는 중복해서 셈)"""
+        if not keywords:
+            return np.zeros(len(matches), dtype=np.int64)
+        return matches[:, [self.columns[keyword] for keyword in keywords]].sum(axis=1)
+
+    def any(self, matches: np.ndarray, keywords: List[str]) -> np.ndarray:
+        """상품별로 keywords 중 하나라도 포함되었는지 여부"""
+        return self.count(matches, keywords) > 0
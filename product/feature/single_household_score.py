@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
 
+from product.feature.keyword_scorer import KeywordMatcher
+
 class SingleHouseHoldScoreCalculator:
     """
     상품의 1인가구 적합도 점수를 계산하는 클래스
@@ -13,6 +16,54 @@ class SingleHouseHoldScoreCalculator:
     # 1인가구에 적합한 보조 키워드 목록 
     GOOD_KEYWORDS = ['간편', '소량', '작은', '컴팩트', '휴대용', '간단', '즉석', '소형']
 
+    # 카테고리별 특화 키워드
+    PROCESSED_FOOD_KEYWORDS = ['즉석', '간편', '밀키트']
+    KITCHEN_KEYWORDS = ['실리콘', '미니', '소형']
+
+    # 키워드 matcher는 처음 사용할 때 한 번만 생성
+    _keyword_matcher = None
+
+    @classmethod
+    def keyword_matcher(cls) -> KeywordMatcher:
+        if cls._keyword_matcher is None:
+            cls._keyword_matcher = KeywordMatcher(
+                cls.LEGENDARY_KEYWORDS + cls.GOOD_KEYWORDS + cls.PROCESSED_FOOD_KEYWORDS + cls.KITCHEN_KEYWORDS
+            )
+        return cls._keyword_matcher
+
+    @classmethod
+    def calculate_batch(cls, products_df: pd.DataFrame) -> pd.Series:
+        """
+        calculate와 같은 점수를 전체 상품에 대해 열 단위로 한 번에 계산
+
+        Args:
+            products_df (pd.DataFrame): 상품 데이터 (name, price, large_category 컬럼)
+
+        Returns:
+            pd.Series: 상품별 1인가구 적합도 점수 (0~25점, products_df와 같은 index)
+        """
+        matcher = cls.keyword_matcher()
+        matches = matcher.matches(KeywordMatcher.normalize_names(products_df['name']))
+
+        # 핵심 키워드 15점씩, 보조 키워드 8점씩
+        score = 15.0 * matcher.count(matches, cls.LEGENDARY_KEYWORDS) + 8.0 * matcher.count(matches, cls.GOOD_KEYWORDS)
+
+        # 가격대별 추가 점수
+        price = products_df['price'].to_numpy(dtype=float) if 'price' in products_df else np.zeros(len(products_df))
+        score += np.where(price <= 5000, 10.0, np.where(price <= 15000, 7.0, np.where(price <= 30000, 4.0, 0.0)))
+
+        # 카테고리별 특화 키워드 보너스 (가공식품이 우선)
+        if 'large_category' in products_df:
+            category = products_df['large_category'].astype(str)
+            processed = category.str.contains('가공식품', regex=False).to_numpy()
+            kitchen = ~processed & category.str.contains('주방용품', regex=False).to_numpy()
+            bonus = (processed & matcher.any(matches, cls.PROCESSED_FOOD_KEYWORDS)) | \
+                    (kitchen & matcher.any(matches, cls.KITCHEN_KEYWORDS))
+            score += np.where(bonus, 5.0, 0.0)
+
+        # 최대 점수 25점으로 제한
+        return pd.Series(np.minimum(score, 25.0), index=products_df.index)
+
     @classmethod
     def calculate(cls, product: pd.Series) -> float:
         """
@@ -50,11 +101,11 @@ class SingleHouseHoldScoreCalculator:
         category = product.get('large_category', '')
 
         # 가공식품이면서 즉석/간편/밀키트가 상품명에 포함되면 5점 추가
-        if '가공식품' in category and any(w in name_lower for w in ['즉석', '간편', '밀키트']):
+        if '가공식품' in category and any(w in name_lower for w in cls.PROCESSED_FOOD_KEYWORDS):
             score += 5.0
 
         # 주방용품이면서 실리콘/미니/소형이 상품명에 포함되면 5점 추가
-        elif '주방용품' in category and any(w in name_lower for w in ['실리콘', '미니', '소형']):
+        elif '주방용품' in category and any(w in name_lower for w in cls.KITCHEN_KEYWORDS):
             score += 5.0
 
         # 최대 점수 25점으로 제한
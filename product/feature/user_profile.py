@@ -1,9 +1,8 @@
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
-from product.processor.data_processor import DataProcessor
-
 class UserProfiler:
     """
     사용자 행동 로그(검색, 로그, 찜)을 바탕으로
@@ -52,30 +51,53 @@ class UserProfiler:
     def create_user_profiles(self, users_df: pd.DataFrame) -> Dict[Any, Dict]:
         """
         모든 유저에 대해 행동 로그과 기본 정보를 종합해 프로필을 만들어 반환
+        - 각 로그를 user_id 기준으로 한 번만 정렬/그룹화하고, 사용자별로는 그룹 offset으로 잘라서 사용
+          (사용자마다 전체 로그를 필터링하지 않음)
+        - 사용자별 로그 순서는 원래 로그 행 순서를 유지
         """
         profiles = {}
 
-        for _, user in users_df.iterrows():
-            user_id = user['user_id']
+        # 사용자별 최근 N개 행동데이터 (로그 행 순서)
+        search_groups = self.group_by_user(self.search_logs)
+        click_groups = self.group_by_user(self.click_logs)
+        favorite_groups = self.group_by_user(self.favorite_products)
+
+        searches = self.column(self.search_logs, 'keyword')
+        clicks = self.column(self.click_logs, 'product_id')
+        favorites = self.column(self.favorite_products, 'product_id')
+        search_lists = self.group_lists(search_groups, searches, searches.notna())
+        click_lists = self.group_lists(click_groups, clicks, clicks.notna())
+        favorite_lists = self.group_lists(favorite_groups, favorites, favorites.notna(), astype=int)
+
+        # 클릭 로그 item_category('대분류 > 중분류 > ...')에서 대분류만 추출
+        # - 같은 경로가 반복되므로 고유 경로에 대해서만 split 후 행별로 펼침 (결측 경로 코드 -1은 끝에 붙인 False/None)
+        path_codes, paths = pd.factorize(self.column(self.click_logs, 'item_category'))
+        paths = pd.Series(paths, dtype=object)
+        has_path = np.append(paths.str.contains('>', regex=False, na=False).to_numpy(dtype=bool), False)[path_codes]
+        large_categories = np.append(paths.str.split('>', n=1).str[0].str.strip().to_numpy(dtype=object), None)[path_codes]
+        click_category_lists = self.group_lists(click_groups, pd.Series(large_categories), pd.Series(has_path))
+
+        # 찜한 상품 카테고리 조회용 product_id → 대분류 (같은 product_id가 여러 행이면 첫 행)
+        category_map = self.product_category_map()
+
+        # iterrows와 같은 값(행 단위 dtype 변환 포함)을 쓰도록 DataFrame.values에서 행 값을 가져옴
+        columns = {col: pos for pos, col in enumerate(users_df.columns)}
+        for row in users_df.values:
+            user_id = row[columns['user_id']]
 
             # 기본 정보 추출
-            base_interest = user.get('interest_category', None)
-            age = UserProfiler.calculate_age(user.get('birth', None))
-            gender = user.get('gender', None)
-
-            # 행동 로그 추출
-            user_searches = self.filter_by_user(self.search_logs, user_id)
-            user_clicks = self.filter_by_user(self.click_logs, user_id)
-            user_favorites = self.filter_by_user(self.favorite_products, user_id)
+            base_interest = row[columns['interest_category']] if 'interest_category' in columns else None
+            age = UserProfiler.calculate_age(row[columns['birth']] if 'birth' in columns else None)
+            gender = row[columns['gender']] if 'gender' in columns else None
 
-            # 최근 N개 행동데이터 추출 
-            search_keywords = user_searches['keyword'].dropna().tolist()[:10]
-            clicked_product_ids = user_clicks['product_id'].dropna().tolist()[:20]
-            favorite_product_ids = user_favorites['product_id'].dropna().astype(int).tolist()[:10]
+            # 최근 N개 행동데이터 추출
+            search_keywords = self.user_list(search_groups, search_lists, user_id)[:10]
+            clicked_product_ids = self.user_list(click_groups, click_lists, user_id)[:20]
+            favorite_product_ids = self.user_list(favorite_groups, favorite_lists, user_id)[:10]
 
             # 선호 카테고리 추출
-            favorite_categories = self.extract_categories_from_products(favorite_product_ids)
-            clicked_categories = self.extract_categories_from_clicks(user_clicks)
+            favorite_categories = [category_map[pid] for pid in favorite_product_ids if category_map.get(pid)]
+            clicked_categories = list(self.user_list(click_groups, click_category_lists, user_id))
 
             # 활동량 기반 사용자 타입 분류
             total_actions = len(search_keywords) + len(clicked_product_ids) + len(favorite_product_ids)
@@ -105,6 +127,65 @@ class UserProfiler:
 
         return profiles
 
+    @staticmethod
+    def column(df: Optional[pd.DataFrame], name: str) -> pd.Series:
+        """로그 컬럼 (로그나 컬럼이 없으면 빈 값으로 채운 Series)"""
+        if df is None:
+            return pd.Series([], dtype=object)
+        if name in df:
+            return df[name]
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+    @staticmethod
+    def group_by_user(df: Optional[pd.DataFrame]) -> Tuple[Dict[Any, int], np.ndarray, np.ndarray]:
+        """
+        로그를 user_id 기준으로 한 번 정렬(stable)해서 그룹화
+
+        Returns:
+            Tuple: (user_id → 그룹 번호, user_id 순으로 정렬된 행 위치, 그룹별 시작 offset)
+                - user_id가 비어 있는 행은 제외
+        """
+        if df is None or df.empty:
+            return {}, np.array([], dtype=np.int64), np.zeros(1, dtype=np.int64)
+
+        codes, uniques = pd.factorize(df['user_id'])
+        order = np.argsort(codes, kind='stable')
+        order = order[np.count_nonzero(codes < 0):]
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(codes[codes >= 0], minlength=len(uniques)))])
+        groups = {user_id: group for group, user_id in enumerate(uniques.tolist())}
+        return groups, order, offsets
+
+    @staticmethod
+    def group_lists(groups: Tuple, values: pd.Series, mask: pd.Series, astype=None) -> List[List]:
+        """
+        그룹별 값 리스트 (mask가 False인 행 제외, 로그 행 순서 유지)
+        - 기존 filter_by_user(...)[column].dropna().tolist()와 같은 값/타입
+        """
+        _, order, offsets = groups
+        keep = mask.to_numpy(dtype=bool)[order]
+        selected = values.iloc[order[keep]]
+        if astype is not None:
+            selected = selected.astype(astype)
+        selected = selected.tolist()
+
+        bounds = np.concatenate([[0], np.cumsum(keep)])[offsets].tolist()
+        return [selected[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    @staticmethod
+    def user_list(groups: Tuple, lists: List[List], user_id: Any) -> List:
+        """사용자의 그룹 값 리스트 (로그가 없는 사용자는 빈 리스트)"""
+        group = groups[0].get(user_id)
+        return lists[group] if group is not None else []
+
+    def product_category_map(self) -> Dict[Any, Any]:
+        """
+        product_id → 대분류 카테고리 (같은 product_id는 첫 행 기준)
+        """
+        if self.products is None or 'large_category' not in self.products:
+            return {}
+        first_rows = self.products.drop_duplicates('product_id', keep='first')
+        return dict(zip(first_rows['product_id'].tolist(), first_rows['large_category'].tolist()))
+
     def filter_by_user(self, df: pd.DataFrame, user_id: Any) -> pd.DataFrame:
         """
         특정 사용자의 데이터만 필터링해서 반환
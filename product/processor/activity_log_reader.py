@@ -0,0 +1,150 @@
+import json
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config.product_config import LOG_CHUNK_ROWS
+from utils.storage.json_stream import JsonArrayStream
+
+class LogTableBuffer:
+    """
+    로그 행을 chunk_rows개씩 모아서 컬럼별 typed numpy 배열로 변환해두는 버퍼
+    - 행 dict 목록을 끝까지 들고 있지 않아서, 메모리에는 컬럼 배열 + 변환 전 행 chunk 1개만 남음
+    - 정수 컬럼은 int64 배열, 나머지는 object 배열로 보관하고 DataFrame 생성 시 infer_objects로 기존과 같이 dtype 추론
+    """
+    SHARED_STRINGS_MAX = 100_000  # 컬럼별 공유 문자열 최대 개수
+
+    def __init__(self, columns: Dict[str, Any], chunk_rows: int = LOG_CHUNK_ROWS):
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+        self.pending: List[Tuple] = []
+        self.chunks: Dict[str, List[np.ndarray]] = {name: [] for name in columns}
+        self.rows = 0
+        self.shared: Dict[str, Dict[str, str]] = {name: {} for name in columns}
+
+    def append(self, row: Tuple):
+        self.pending.append(row)
+        self.rows += 1
+        if len(self.pending) >= self.chunk_rows:
+            self.seal()
+
+    def seal(self):
+        """모아둔 행을 컬럼별 배열 chunk로 변환"""
+        if not self.pending:
+            return
+        for (name, dtype), values in zip(self.columns.items(), zip(*self.pending)):
+            if dtype is object:
+                values = self.share_strings(self.shared[name], values)
+            try:
+                self.chunks[name].append(np.array(values, dtype=dtype))
+            except OverflowError:
+                # int64 범위를 넘는 값은 object로 보관
+                self.chunks[name].append(np.array(values, dtype=object))
+        self.pending = []
+
+    @classmethod
+    def share_strings(cls, shared: Dict[str, str], values: Tuple) -> List:
+        """
+        반복되는 문자열(카테고리, 상품명, 키워드 등)은 같은 객체를 공유하도록 변환
+        - 컬럼별로 SHARED_STRINGS_MAX개까지만 등록 (타임스탬프처럼 고유한 값이 많은 컬럼 대비)
+        """
+        if len(shared) >= cls.SHARED_STRINGS_MAX:
+            return [shared.get(value, value) if type(value) is str else value for value in values]
+        return [shared.setdefault(value, value) if type(value) is str else value for value in values]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        컬럼 배열로 DataFrame 생성 - 행이 없으면 기존 pd.DataFrame([])과 같이 컬럼 없는 빈 DataFrame
+        - object 배열은 DataFrame 생성자가 값 타입을 추론하지 않으므로 infer_objects로 기존(dict 목록)과 같이 추론
+          (예: 숫자 searched_at/clicked_at은 int64/float64)
+        """
+        self.seal()
+        if not self.rows:
+            return pd.DataFrame()
+        return pd.DataFrame({name: np.concatenate(chunks) for name, chunks in self.chunks.items()}).infer_objects()
+
+
+class ActivityLogReader:
+    """
+    사용자 활동 로그(JSON 배열)를 검색/클릭 로그 DataFrame으로 변환하는 클래스
+    - 로그 파일을 chunk 단위로 읽으면서 원소를 하나씩 파싱하고, 검색/클릭 이벤트를 바로 컬럼 버퍼에 추가
+    - 이벤트 분리/정제 규칙은 DataProcessor.split_by_event, clean_search_logs, clean_click_logs와 같음
+    """
+    SEARCH_COLUMNS = {'user_id': np.int64, 'keyword': object, 'searched_at': object, 'search_result_count': np.int64}
+    CLICK_COLUMNS = {
+        'user_id': np.int64, 'product_id': np.int64, 'item_name': object,
+        'clicked_at': object, 'item_category': object, 'item_price': np.int64
+    }
+
+    def __init__(self, chunk_rows: int = LOG_CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+
+    @staticmethod
+    def parse_message(log: Any) -> Optional[Dict]:
+        """로그 원소의 message(문자열이면 JSON 파싱) - dict가 아니면 None"""
+        if not isinstance(log, dict):
+            return None
+        msg = log.get('message', {})
+        if isinstance(msg, str):
+            try:
+                msg = json.loads(msg)
+            except Exception:
+                return None
+        return msg if isinstance(msg, dict) else None
+
+    @staticmethod
+    def search_row(msg: Dict) -> Optional[Tuple]:
+        """검색 이벤트 정제 (SEARCH_COLUMNS 순서) - 필수 값이 없거나 변환에 실패하면 None"""
+        try:
+            user_id = int(msg['user_id'])
+            keyword = str(msg['search_keyword']).strip()
+            if not keyword:
+                return None
+            return user_id, keyword, msg.get('searched_at', ''), int(msg.get('search_result_count', 0))
+        except Exception:
+            return None
+
+    @staticmethod
+    def click_row(msg: Dict) -> Optional[Tuple]:
+        """클릭 이벤트 정제 (CLICK_COLUMNS 순서) - 필수 값이 없거나 변환에 실패하면 None"""
+        try:
+            return (
+                int(msg['user_id']),
+                int(msg['item_id']),
+                str(msg.get('item_name', '')),
+                msg.get('clicked_at', ''),
+                str(msg.get('item_category', '')),
+                int(msg.get('item_price', 0))
+            )
+        except Exception:
+            return None
+
+    def read_logs(self, logs: Iterable[Any]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        로그 원소들을 검색/클릭 로그 DataFrame으로 변환
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: (검색 로그, 클릭 로그)
+        """
+        search = LogTableBuffer(self.SEARCH_COLUMNS, self.chunk_rows)
+        click = LogTableBuffer(self.CLICK_COLUMNS, self.chunk_rows)
+
+        for log in logs:
+            msg = self.parse_message(log)
+            if msg is None:
+                continue
+            event_type = msg.get('event_type')
+            if event_type == 'search':
+                row = self.search_row(msg)
+                if row is not None:
+                    search.append(row)
+            elif event_type == 'click':
+                row = self.click_row(msg)
+                if row is not None:
+                    click.append(row)
+
+        return search.to_dataframe(), click.to_dataframe()
+
+    def read(self, chunks: Iterable[bytes]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """JSON 배열 로그 파일의 바이트 chunk들을 스트리밍으로 파싱해서 검색/클릭 로그 DataFrame으로 변환"""
+        return self.read_logs(JsonArrayStream.iter_items(chunks))
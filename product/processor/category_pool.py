@@ -1,46 +1,127 @@
+import os
+import glob
+import hashlib
+import numpy as np
 import pandas as pd
+from typing import Dict, Optional
 
+from config.product_config import CATEGORY_POOL_CACHE_DIR, RECOMMENDATION_CATEGORIES
 from product.feature.single_household_score import SingleHouseHoldScoreCalculator
+from utils.category_match import CategoryMatcher
 
 class CategoryPoolBuilder:
     """
     카테고리별 1인가구 특화 상품 pool을 미리 구축하는 클래스
     - 각 카테고리별로 1인가구 적합도 점수가 높은 상품만 선별하여 pool 생성
     - 추천 엔진이 빠르게 카테고리별 후보군을 선택할 수 있도록 미리 pool 생성
+    - 적합도 점수는 전체 카탈로그에 대해 한 번만 계산하고, 카탈로그 내용 해시를 키로 메모리/디스크에 캐시
+      (카탈로그가 바뀌지 않았으면 API 프로세스와 추천 flow 모두 캐시된 점수로 바로 pool 생성)
     """
+    TARGET_CATEGORIES = RECOMMENDATION_CATEGORIES
+    SCORE_COLUMNS = ['name', 'price', 'large_category']  # 적합도 점수 계산에 사용하는 컬럼
+
+    # 현재 프로세스에서 마지막으로 계산/로드한 점수 {카탈로그 해시: 점수 배열}
+    _score_cache: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def catalog_hash(cls, products_df: pd.DataFrame) -> str:
+        """
+        적합도 점수 계산에 사용하는 컬럼(상품명, 가격, 대분류)의 행 순서 포함 내용 해시
+        """
+        columns = [col for col in cls.SCORE_COLUMNS if col in products_df]
+        digest = hashlib.sha256("|".join(columns).encode('utf-8'))
+        digest.update(np.int64(len(products_df)).tobytes())
+        if columns:
+            digest.update(pd.util.hash_pandas_object(products_df[columns], index=False).to_numpy().tobytes())
+        return digest.hexdigest()[:16]
+
+    @classmethod
+    def single_scores(cls, products_df: pd.DataFrame, cache_dir: Optional[str] = CATEGORY_POOL_CACHE_DIR) -> np.ndarray:
+        """
+        전체 상품의 1인가구 적합도 점수 (products_df 행 순서)
+
+        Args:
+            products_df: 전체 상품 데이터프레임
+            cache_dir: 점수 디스크 캐시 경로 (None이면 메모리 캐시만 사용)
+
+        Returns:
+            np.ndarray: 상품별 적합도 점수 (float64)
+        """
+        version = cls.catalog_hash(products_df)
+        if version in cls._score_cache:
+            return cls._score_cache[version]
+
+        path = os.path.join(cache_dir, f"single_score_{version}.npy") if cache_dir else None
+        scores = None
+        if path and os.path.exists(path):
+            try:
+                scores = np.load(path)
+                if scores.shape != (len(products_df),):
+                    print("[WARN] 적합도 점수 캐시 크기 불일치, 다시 계산합니다.")
+                    scores = None
+            except Exception as e:
+                print(f"[WARN] 적합도 점수 캐시 로드 실패, 다시 계산합니다: {e}")
+                scores = None
+
+        if scores is None:
+            scores = SingleHouseHoldScoreCalculator.calculate_batch(products_df).to_numpy(dtype=np.float64)
+            if path:
+                try:
+                    # 임시 파일에 쓴 뒤 교체해서 다른 프로세스가 쓰는 도중의 파일을 읽지 않도록 함
+                    os.makedirs(cache_dir, exist_ok=True)
+                    tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+                    np.save(tmp_path, scores)
+                    os.replace(tmp_path, path)
+                    cls.remove_stale_scores(cache_dir, path)
+                except Exception as e:
+                    print(f"[WARN] 적합도 점수 캐시 저장 실패: {e}")
+            print(f"[INFO] 상품 {len(products_df)}개 1인가구 적합도 점수 계산 완료 (카탈로그 {version})")
+
+        # 메모리에는 최신 카탈로그 점수만 보관
+        cls._score_cache = {version: scores}
+        return scores
+
     @staticmethod
-    def build(products_df: pd.DataFrame) -> pd.DataFrame:
+    def remove_stale_scores(cache_dir: str, keep_path: str):
+        """
+        이전 카탈로그의 점수 캐시 파일 삭제 (카탈로그가 바뀔 때마다 파일이 쌓이지 않도록 최신 파일만 유지)
+        - 다른 프로세스가 쓰는 중인 임시 파일은 건드리지 않음
+        """
+        for stale_path in glob.glob(os.path.join(cache_dir, "single_score_*.npy")):
+            if stale_path == keep_path or ".tmp." in os.path.basename(stale_path):
+                continue
+            try:
+                os.remove(stale_path)
+            except OSError as e:
+                print(f"[WARN] 이전 적합도 점수 캐시 삭제 실패: {stale_path}, {e}")
+
+    @classmethod
+    def build(cls, products_df: pd.DataFrame, cache_dir: Optional[str] = CATEGORY_POOL_CACHE_DIR) -> Dict[str, pd.DataFrame]:
         """
         Args:
-            전체 상품 데이터프레임
+            products_df: 전체 상품 데이터프레임
+            cache_dir: 적합도 점수 디스크 캐시 경로 (None이면 메모리 캐시만 사용)
 
         Returns:
             {카테고리명: pool DataFrame} 구조의 카테고리별 상품 pool 딕셔너리
         """
         category_pools = {}
-        target_categories = ['신선식품', '가공식품', '주방용품', '생활용품']
+        scores = cls.single_scores(products_df, cache_dir)
 
-        for category in target_categories:
-            # 해당 카테고리 상품만 추출
-            cat_products = products_df[
-                products_df['large_category'].str.contains(category, na=False)
-            ].copy()
+        for category in cls.TARGET_CATEGORIES:
+            # 해당 카테고리 상품 위치 (원래 행 순서)
+            positions = CategoryMatcher.positions(products_df['large_category'], category)
 
-            if not cat_products.empty:
+            if len(positions):
+                # 상위 70%만 선별
+                cat_scores = scores[positions]
+                threshold = pd.Series(cat_scores).quantile(0.3)
+                qualified = positions[cat_scores >= threshold]
 
-                # 1인가구 적합도 점수 계산
-                cat_products['flexible_single_score'] = cat_products.apply(
-                    SingleHouseHoldScoreCalculator.calculate, axis=1
-                )
+                # pool 내 상품 수를 80개로 제한 (행 위치를 기존 DataFrame.sample과 같은 난수로 추출)
+                sampled = pd.Series(qualified).sample(n=min(len(qualified), 80), random_state=42).to_numpy()
+                pool = products_df.iloc[sampled].copy()
+                pool['flexible_single_score'] = scores[sampled]
+                category_pools[category] = pool.reset_index(drop=True)
 
-                # 상위 70%만 선별
-                threshold = cat_products['flexible_single_score'].quantile(0.3)
-                qualified = cat_products[cat_products['flexible_single_score'] >= threshold]
-                
-                # pool 내 상품 수를 80개로 제한
-                category_pools[category] = qualified.sample(
-                    n=min(len(qualified), 80), random_state=42
-                ).reset_index(drop=True)
-                
         return category_pools
-        
@@ -2,13 +2,17 @@ import os
 import json
 import pandas as pd
 from typing import Tuple, List, Optional, Dict
+from config.product_config import LOG_STREAM_CHUNK_BYTES
+from product.processor.activity_log_reader import ActivityLogReader
 from utils.storage.mysql_manager import MySQLManager
 from utils.storage.s3_manager import S3Manager
+from utils.storage.table_snapshot import TableSnapshotStore
 
 class DataProcessor:
     """데이터 로드 및 전처리 담당 클래스"""
     def __init__(self):
         self.mysql = MySQLManager()
+        self.snapshots = TableSnapshotStore(self.mysql)
         self.s3manager = S3Manager("team6-mlops-bucket")
         self.products = None
         self.categories = None
@@ -19,12 +23,12 @@ class DataProcessor:
         self.key = f"logs/user_activity_logs_final.json"
         
     def load_db_data(self) -> bool:
-        """백엔드 MySQL에서 데이터 추출해서 반환"""
+        """백엔드 MySQL에서 데이터 추출해서 반환 (로컬 스냅샷에서 변경된 행만 갱신)"""
         try:
-            self.products= self.mysql.read_table('products')
-            self.categories = self.mysql.read_table('categories')
-            self.users = self.mysql.read_table('users')
-            favorite_products = self.mysql.read_table('favorite_products')
+            self.products= self.snapshots.read_table('products')
+            self.categories = self.snapshots.read_table('categories')
+            self.users = self.snapshots.read_table('users')
+            favorite_products = self.snapshots.read_table('favorite_products')
             
             # 상품 찜 데이터만 필터링 
             self.favorite_products = favorite_products[
@@ -42,20 +46,15 @@ class DataProcessor:
         - 검색 로그 DataFrame
         - 클릭 로그 DataFrame
         으로 저장 
+        - S3 객체를 chunk 단위로 읽으면서 원소별로 파싱해서 컬럼 버퍼에 바로 추가 (전체 로그를 메모리에 올리지 않음)
         """
-        # 파일 포맷 판별
         try:
-            logs = self.s3manager.download(self.key)
+            chunks = self.s3manager.stream(self.key, chunk_size=LOG_STREAM_CHUNK_BYTES)
+            self.search_logs, self.click_logs = ActivityLogReader().read(chunks)
         except Exception as e:
             print(f"[ERROR] 로그 파일 읽기 실패: {e}")
             return pd.DataFrame(), pd.DataFrame()
 
-        # 이벤트별 분리
-        search_logs, click_logs = self.split_by_event(logs)
-
-        # 정제 및 DataFrame 변환
-        self.search_logs = self.clean_search_logs(search_logs)
-        self.click_logs = self.clean_click_logs(click_logs)
         print(f"[INFO] 검색 로그 {len(self.search_logs)}개, 클릭 로그 {len(self.click_logs)}개 로드 완료")
 
         return True
@@ -102,17 +101,9 @@ class DataProcessor:
         search, click = [], []  
 
         for log in logs:  # logs 리스트를 한 개씩 꺼내서
-            msg = log.get('message', {})  # log에서 message라는 값을 꺼냄. 없으면 빈 dict
-
-            # 만약 message가 문자열이면, json.loads로 딕셔너리로 바꿔줌
-            if isinstance(msg, str):
-                try:
-                    msg = json.loads(msg)
-                except Exception:
-                    continue  # 변환 실패하면 무시하고 다음으로
-
-            # message가 딕셔너리가 아니면 무시
-            if not isinstance(msg, dict):
+            # message를 꺼내서 딕셔너리로 변환 (문자열이면 json.loads, 실패하거나 딕셔너리가 아니면 무시)
+            msg = ActivityLogReader.parse_message(log)
+            if msg is None:
                 continue
 
             # 이벤트 타입 가져오기
@@ -130,38 +121,12 @@ class DataProcessor:
     
     def clean_search_logs(self, logs: List[Dict]) -> pd.DataFrame:
         """검색 로그 데이터 정제 및 데이터프레임 변환"""
-        rows = []
-        for log in logs:
-            try:
-                user_id = int(log['user_id'])
-                keyword = str(log['search_keyword']).strip()
-                if not keyword:
-                    continue
-                rows.append({
-                    'user_id': user_id,
-                    'keyword': keyword,
-                    'searched_at': log.get('searched_at', ''),
-                    'search_result_count': int(log.get('search_result_count', 0))
-                })
-            except Exception:
-                continue
+        columns = list(ActivityLogReader.SEARCH_COLUMNS)
+        rows = [dict(zip(columns, row)) for row in map(ActivityLogReader.search_row, logs) if row is not None]
         return pd.DataFrame(rows)
 
     def clean_click_logs(self, logs: List[Dict]) -> pd.DataFrame:
         """클릭 로그 데이터 정제 및 데이터프레임 변환"""
-        rows = []
-        for log in logs:
-            try:
-                user_id = int(log['user_id'])
-                product_id = int(log['item_id'])
-                rows.append({
-                    'user_id': user_id,
-                    'product_id': product_id,
-                    'item_name': str(log.get('item_name', '')),
-                    'clicked_at': log.get('clicked_at', ''),
-                    'item_category': str(log.get('item_category', '')),
-                    'item_price': int(log.get('item_price', 0))
-                })
-            except Exception:
-                continue
+        columns = list(ActivityLogReader.CLICK_COLUMNS)
+        rows = [dict(zip(columns, row)) for row in map(ActivityLogReader.click_row, logs) if row is not None]
         return pd.DataFrame(rows)
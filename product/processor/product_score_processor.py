@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
 
+from product.feature.keyword_scorer import KeywordMatcher
+
 class ProductSingleScoreProcessor:
     """상품/카테고리 조인 및 1인 가구 적합도 점수 계산 """
 
@@ -23,41 +26,47 @@ class ProductSingleScoreProcessor:
         merged['small_category'] = merged['small_category'].fillna('기타')
         return merged
 
+    # 키워드 matcher는 처음 사용할 때 한 번만 생성
+    _keyword_matcher = None
+
+    @classmethod
+    def keyword_matcher(cls) -> KeywordMatcher:
+        if cls._keyword_matcher is None:
+            cls._keyword_matcher = KeywordMatcher(cls.PRIMARY_KEYWORDS + cls.SECONDARY_KEYWORDS)
+        return cls._keyword_matcher
+
     # 클래스 변수에 접근 
     @classmethod
     def calc_score(cls, products_df: pd.DataFrame) -> pd.DataFrame:
         """
         상품명과 가격을 바탕으로 1인 가구 적합도 점수(0~10점) 계산
+        - 키워드 포함 여부와 가격 점수를 열 단위로 한 번에 계산
+
         Args:
-            row (pd.Series): 상품 데이터의 한 행
+            products_df (pd.DataFrame): 상품 데이터 (name, price 컬럼)
 
         Returns:
-            float: 계산된 적합도 점수(0~10)
+            pd.DataFrame: single_household_score 컬럼이 추가된 상품 데이터
         """
-        def score(row):
-            name = str(row.get('name', '')).lower()
-            price = float(row.get('price', 0))
-            s = 0
-
-            # 주요 키워드가 상품명에 포함되어 있으면 3점씩 추가 
-            for kw in cls.PRIMARY_KEYWORDS:
-                if kw in name:
-                    s += 3
-            
-            # 보조 키워드가 상품명에 포함되어 있으면 1.5점씩 추가 
-            for kw in cls.SECONDARY_KEYWORDS:
-                if kw in name:
-                    s += 1.5
-
-            # 가격 기반 추가 점수         
-            if price < 10000:
-                s += 1
-            elif price < 30000:
-                s += 0.5
-            
-            # 최대 10점으로 제한 
-            return min(s, 10)
-
         df = products_df.copy()
-        df['single_household_score'] = df.apply(score, axis=1)
-        return df
\ No newline at end of file
+        names = df['name'] if 'name' in df else pd.Series('', index=df.index)
+        matcher = cls.keyword_matcher()
+        matches = matcher.matches(KeywordMatcher.normalize_names(names))
+
+        # 주요 키워드는 3점씩, 보조 키워드는 1.5점씩
+        primary = matcher.count(matches, cls.PRIMARY_KEYWORDS)
+        secondary = matcher.count(matches, cls.SECONDARY_KEYWORDS)
+
+        # 가격 기반 추가 점수 (가격이 비어 있으면 추가 점수 없음)
+        price = df['price'].to_numpy(dtype=float) if 'price' in df else np.zeros(len(df))
+        price_bonus = np.where(price < 10000, 1.0, np.where(price < 30000, 0.5, 0.0))
+
+        # 최대 10점으로 제한
+        score = np.minimum(3 * primary + 1.5 * secondary + price_bonus, 10)
+
+        # 기존 행 단위 계산은 1.5/0.5점이 더해진 행이 하나도 없으면 정수 컬럼이 되므로 dtype도 맞춤
+        if len(df) and not ((secondary > 0) | ((price >= 10000) & (price < 30000))).any():
+            df['single_household_score'] = score.astype(np.int64)
+        else:
+            df['single_household_score'] = score
+        return df
@@ -1,9 +1,38 @@
+import numpy as np
 import pandas as pd
-from typing import Dict
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional
 
 from product.feature.behavior_booster import BehaviorBooster
 
 
+@dataclass(slots=True)
+class RecommendationRecord:
+    """
+    추천 결과 한 건 - 필드 순서는 저장(S3/OpenSearch) payload의 키 순서와 같음
+    """
+    product_id: int                 # 상품 고유 ID
+    name: str                       # 상품명
+    price: float                    # 가격
+    category_path: str              # 카테고리 경로
+    large_category: str             # 대분류
+    single_household_score: float   # 1인가구 적합도(정규화)
+    base_similarity: float          # 기본 유사도 점수
+    final_score: float              # 최종 추천 점수
+    boost_ratio: float              # 전체 부스팅 배수
+    behavior_boost: float           # 행동 기반 부스팅 배수
+    user_type: str                  # 추천 사용자 유형
+    recommendation_reason: str      # 추천 사유 요약
+    premium_score: float            # 정규화 전 1인가구 점수
+    appeal_score: float             # 어필 점수
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in RECORD_FIELDS}
+
+
+RECORD_FIELDS = tuple(field.name for field in fields(RecommendationRecord))
+
+
 class RecommendationDataBuilder:
     """
     추천 결과 데이터(딕셔너리)를 생성하는 클래스.
@@ -11,15 +40,27 @@ class RecommendationDataBuilder:
     """
 
     @staticmethod
-    def build(product: pd.Series, user_profile: Dict, is_preferred: bool, products_df: pd.DataFrame) -> Dict:
+    def build(product: pd.Series, user_profile: Dict, is_preferred: bool, products_df: pd.DataFrame,
+              behavior_boost: Optional[float] = None) -> Dict:
+        """
+        추천 결과 데이터(딕셔너리) 생성 - build_record 결과를 딕셔너리로 변환
+        """
+        return RecommendationDataBuilder.build_record(
+            product, user_profile, is_preferred, products_df, behavior_boost
+        ).to_dict()
+
+    @staticmethod
+    def build_record(product: pd.Series, user_profile: Dict, is_preferred: bool, products_df: pd.DataFrame,
+                     behavior_boost: Optional[float] = None) -> RecommendationRecord:
         """
-        추천 결과 데이터(딕셔너리) 생성.
+        추천 결과 데이터(RecommendationRecord) 생성.
 
         Args:
             product: 추천할 상품의 정보 (이름, 가격, 카테고리, 점수 등)
             user_profile: 사용자 행동 이력 등 개인화 정보
             is_preferred: 선호 카테고리 상품 여부
             products_df: 전체 상품 데이터
+            behavior_boost: BehaviorBooster.apply_batch로 미리 계산한 행동 기반 부스팅 배수 (없으면 여기서 계산)
 
         Returns:
             추천 결과로 사용할 구조화된 데이터
@@ -46,26 +87,96 @@ class RecommendationDataBuilder:
             boost_multiplier *= 2.0
 
         # 5. 사용자 행동(찜, 검색, 클릭 등) 기반 부스팅 적용
-        behavior_boost = BehaviorBooster.apply(product, user_profile, products_df)
+        if behavior_boost is None:
+            behavior_boost = BehaviorBooster.apply(product, user_profile, products_df)
         boost_multiplier *= behavior_boost
 
         # 6. 최종 추천 점수 산출
         final_score = base_similarity * boost_multiplier
 
-        # 7. 추천 결과를 하나의 딕셔너리로 구조화하여 반환
-        return {
-            'product_id': product['product_id'],                         # 상품 고유 ID
-            'name': product['name'],                             # 상품명
-            'price': product.get('price', 0),                    # 가격
-            'category_path': product.get('category_path', ''),   # 카테고리 경로
-            'large_category': product.get('large_category', '기타'), # 대분류
-            'single_household_score': normalized_score,          # 1인가구 적합도(정규화)
-            'base_similarity': base_similarity,                  # 기본 유사도 점수
-            'final_score': final_score,                          # 최종 추천 점수
-            'boost_ratio': boost_multiplier,                     # 전체 부스팅 배수
-            'behavior_boost': behavior_boost,                    # 행동 기반 부스팅 배수
-            'user_type': 'single_household_optimized',           # 추천 사용자 유형
-            'recommendation_reason': '선호/다양성/유사도/행동 반영', # 추천 사유 요약
-            'premium_score': flexible_score,                     # 정규화 전 1인가구 점수
-            'appeal_score': 10.0                                 # 어필 점수(고정)
-        }
\ No newline at end of file
+        # 7. 추천 결과를 하나의 레코드로 구조화하여 반환
+        return RecommendationRecord(
+            product_id=product['product_id'],
+            name=product['name'],
+            price=product.get('price', 0),
+            category_path=product.get('category_path', ''),
+            large_category=product.get('large_category', '기타'),
+            single_household_score=normalized_score,
+            base_similarity=base_similarity,
+            final_score=final_score,
+            boost_ratio=boost_multiplier,
+            behavior_boost=behavior_boost,
+            user_type='single_household_optimized',
+            recommendation_reason='선호/다양성/유사도/행동 반영',
+            premium_score=flexible_score,
+            appeal_score=10.0                       # 어필 점수(고정)
+        )
+
+
+class RecommendationBatchBuilder:
+    """
+    여러 사용자의 추천 결과를 컬럼별로 미리 할당한 배열에 모았다가 저장용 payload로 한 번에 변환하는 클래스
+    - 숫자 컬럼은 numpy 배열, 문자열 컬럼은 object 배열에 저장하고 변환 시 tolist()로 Python 기본 타입으로 변환
+    - 결과는 사용자별 DataFrame을 만든 뒤 to_dict(orient='records') 한 것과 같은 형식
+    """
+    INT_FIELDS = ('product_id',)
+    FLOAT_FIELDS = ('price', 'single_household_score', 'base_similarity', 'final_score',
+                    'boost_ratio', 'behavior_boost', 'premium_score', 'appeal_score')
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.user_ids: List = []
+        self.offsets: List[int] = [0]
+        # 가격이 모두 정수면 정수로 변환 (DataFrame 변환 시 int64 컬럼이 되는 것과 동일)
+        self.price_is_int = True
+        self.columns = self.allocate(max(capacity, 1))
+
+    def allocate(self, capacity: int) -> Dict[str, np.ndarray]:
+        columns = {}
+        for name in RECORD_FIELDS:
+            if name in self.INT_FIELDS:
+                columns[name] = np.empty(capacity, dtype=np.int64)
+            elif name in self.FLOAT_FIELDS:
+                columns[name] = np.empty(capacity, dtype=np.float64)
+            else:
+                columns[name] = np.empty(capacity, dtype=object)
+        return columns
+
+    def reserve(self, n: int):
+        """n개를 더 담을 수 있도록 배열 크기를 2배씩 늘림"""
+        capacity = len(self.columns['product_id'])
+        if self.size + n <= capacity:
+            return
+        while capacity < self.size + n:
+            capacity *= 2
+        grown = self.allocate(capacity)
+        for name, column in self.columns.items():
+            grown[name][:self.size] = column[:self.size]
+        self.columns = grown
+
+    def add(self, user_id, records: List[RecommendationRecord]):
+        """사용자 한 명의 추천 결과 추가"""
+        self.reserve(len(records))
+        start = self.size
+        for name, column in self.columns.items():
+            column[start:start + len(records)] = [getattr(record, name) for record in records]
+        self.price_is_int = self.price_is_int and all(
+            isinstance(record.price, (int, np.integer)) for record in records
+        )
+        self.size += len(records)
+        self.user_ids.append(user_id)
+        self.offsets.append(self.size)
+
+    def to_payloads(self) -> Dict[object, List[Dict]]:
+        """
+        {user_id: 추천 결과 딕셔너리 리스트} 형태로 한 번에 변환
+        """
+        values = {name: column[:self.size] for name, column in self.columns.items()}
+        if self.price_is_int:
+            values['price'] = values['price'].astype(np.int64)
+        rows = list(zip(*(values[name].tolist() for name in RECORD_FIELDS)))
+
+        payloads = {}
+        for user_id, start, end in zip(self.user_ids, self.offsets[:-1], self.offsets[1:]):
+            payloads[user_id] = [dict(zip(RECORD_FIELDS, row)) for row in rows[start:end]]
+        return payloads
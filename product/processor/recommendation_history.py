@@ -1,16 +1,137 @@
+import os
+import json
+import sqlite3
+import datetime
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, Optional
+
 import pandas as pd
 
+from config.product_config import HISTORY_MAX_USERS, HISTORY_FLUSH_EVERY
+
 class RecommendationHistoryManager:
 
     """
-    사용자별 추천 히스토리 관리 클래스 
-    - 사용자가 이미 추천받았던 상품을 반복해서 추천하는 것을 방지하기 위해 필요 
+    사용자별 추천 히스토리 관리 클래스
+    - 사용자가 이미 추천받았던 상품을 반복해서 추천하는 것을 방지하기 위해 필요
+    - 사용자별 히스토리는 추천 순서를 유지하는 deque (최근 추천이 뒤쪽)
+    - 메모리에는 최근 사용한 사용자 max_users명까지만 보관 (LRU)
+    - db_path를 주면 SQLite(WAL)에 저장해서 프로세스 재시작 후에도 유지
+      - 사용자별로 처음 조회할 때 읽어오고(lazy load), 변경된 사용자는 모아서 한 번에 저장
     """
-    def __init__(self):
-        # 사용자별 추천 히스토리를 저장하는 딕셔너리
-        # {user_id: set(추천된 상품 ID)}
-        self.history = {}
-    
+    # 히스토리 상품 수가 MAX_HISTORY를 초과하면 최근 KEEP_RECENT개만 남김
+    MAX_HISTORY = 15
+    KEEP_RECENT = 8
+
+    def __init__(self, db_path: Optional[str] = None, max_users: int = HISTORY_MAX_USERS,
+                 flush_every: int = HISTORY_FLUSH_EVERY):
+        # 사용자별 추천 히스토리를 저장하는 딕셔너리 (최근 사용 순)
+        # {user_id: deque(추천된 상품 ID)}
+        self.history = OrderedDict()
+        self.max_users = max_users
+        self.db_path = db_path
+        self.flush_every = flush_every
+
+        # 저장되지 않은 변경 사용자 - {user_id: deque}
+        self.dirty = {}
+        self._conn = None
+        self._conn_pid = None
+        if db_path:
+            self.init_db()
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        프로세스별 SQLite 연결
+        - fork된 worker 프로세스는 부모의 연결을 공유하지 않고 새로 연결
+        """
+        if self._conn is None or self._conn_pid != os.getpid():
+            self._conn = sqlite3.connect(self.db_path, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def init_db(self):
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with self.connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS recommendation_history ("
+                "user_id TEXT PRIMARY KEY, product_ids TEXT NOT NULL, updated_at TEXT NOT NULL)"
+            )
+
+    def load(self, user_id) -> deque:
+        """메모리에 있으면 그대로, 없으면 DB에서 읽어서(없으면 빈 히스토리) 메모리에 등록"""
+        if user_id in self.history:
+            self.history.move_to_end(user_id)
+            return self.history[user_id]
+
+        items = deque()
+        if user_id in self.dirty:
+            # 메모리에서 밀려났지만 아직 저장되지 않은 사용자
+            items = self.dirty[user_id]
+        elif self.db_path:
+            row = self.connection().execute(
+                "SELECT product_ids FROM recommendation_history WHERE user_id = ?", (str(user_id),)
+            ).fetchone()
+            if row:
+                items = deque(json.loads(row[0]))
+
+        self.history[user_id] = items
+        if len(self.history) > self.max_users:
+            # 가장 오래 사용하지 않은 사용자 제거 (변경 사항은 dirty에 남아 있어 flush 시 저장됨)
+            self.history.popitem(last=False)
+        return items
+
+    def preload(self, user_ids: Iterable, chunk_size: int = 500):
+        """
+        메모리에 없는 사용자들의 히스토리를 DB에서 묶음 조회로 미리 읽기 (배치 추천용)
+        """
+        if not self.db_path:
+            return
+        missing = [user_id for user_id in user_ids if user_id not in self.history and user_id not in self.dirty]
+        conn = self.connection()
+        for start in range(0, len(missing), chunk_size):
+            chunk = missing[start:start + chunk_size]
+            rows = dict(conn.execute(
+                "SELECT user_id, product_ids FROM recommendation_history "
+                f"WHERE user_id IN ({','.join('?' * len(chunk))})",
+                [str(user_id) for user_id in chunk]
+            ).fetchall())
+            for user_id in chunk:
+                product_ids = rows.get(str(user_id))
+                self.history[user_id] = deque(json.loads(product_ids)) if product_ids else deque()
+                if len(self.history) > self.max_users:
+                    self.history.popitem(last=False)
+
+    def snapshot(self, user_ids: Iterable) -> Dict:
+        """사용자들의 현재 히스토리 사본 (추천 결과 저장 실패 시 rollback용)"""
+        user_ids = list(user_ids)
+        self.preload(user_ids)
+        return {user_id: list(self.load(user_id)) for user_id in user_ids}
+
+    def rollback(self, snapshot: Dict):
+        """
+        snapshot 시점의 히스토리로 되돌림
+        - 추천은 했지만 저장되지 않은 사용자의 추천 결과를 히스토리에서 제외
+        """
+        for user_id, product_ids in snapshot.items():
+            items = self.load(user_id)
+            items.clear()
+            items.extend(product_ids)
+            if self.db_path:
+                self.dirty[user_id] = items
+
+    def forget(self, user_ids: Iterable):
+        """
+        저장된 사용자들을 메모리에서 제거 - 다른 프로세스가 DB에 갱신한 히스토리를 다음 조회 때 다시 읽음
+        - 아직 저장되지 않은 변경분(dirty)이 있는 사용자는 유지
+        """
+        for user_id in user_ids:
+            if user_id not in self.dirty:
+                self.history.pop(user_id, None)
+
     def update(self, user_id: int, recommendations_df: pd.DataFrame):
         """
         추천 히스토리 업데이트 및 크기 제한
@@ -19,21 +140,68 @@ class RecommendationHistoryManager:
             user_id: 추천을 받은 사용자 ID
             recommendations_df: 새로 추천된 상품들의 DataFrame
         """
-        # 해당 사용자의 히스토리가 없으면 빈 set으로 초기화
-        if user_id not in self.history:
-            self.history[user_id] = set()
-        
-        # 새로 추천된 상품 ID들을 히스토리에 추가
-        new_product_ids = set(recommendations_df['product_id'].tolist())
-        self.history[user_id].update(new_product_ids)
+        self.add(user_id, recommendations_df['product_id'].tolist())
+
+    def add(self, user_id: int, product_ids: Iterable):
+        """
+        추천된 상품 ID 목록으로 히스토리 업데이트 (DataFrame 없이 사용하는 배치 추천용)
+        - 이미 있는 상품을 다시 추천하면 가장 최근 위치로 이동
+        """
+        items = self.load(user_id)
+
+        # 새로 추천된 상품 ID들을 추천 순서대로 히스토리 뒤쪽에 추가
+        for product_id in product_ids:
+            product_id = int(product_id)
+            if product_id in items:
+                items.remove(product_id)
+            items.append(product_id)
 
         # 히스토리의 크기가 15개를 초과하면, 최근 8개만 남기고 나머지는 삭제
-        if len(self.history[user_id]) > 15:
-            history_list = list(self.history[user_id])
-            self.history[user_id] = set(history_list[-8:])
+        if len(items) > self.MAX_HISTORY:
+            recent = list(items)[-self.KEEP_RECENT:]
+            items.clear()
+            items.extend(recent)
+
+        if self.db_path:
+            self.dirty[user_id] = items
+            if len(self.dirty) >= self.flush_every:
+                self.flush()
 
     def get(self, user_id: int) -> set:
         """
-        해당 사용자의 추천 히스토리 반환
+        해당 사용자의 추천 히스토리 반환 (상품 ID 집합)
+        """
+        return set(self.load(user_id))
+
+    def get_ordered(self, user_id: int) -> list:
+        """
+        해당 사용자의 추천 히스토리를 추천 순서대로 반환 (오래된 것부터)
         """
-        return self.history.get(user_id, set())
\ No newline at end of file
+        return list(self.load(user_id))
+
+    def flush(self):
+        """변경된 사용자 히스토리를 DB에 한 번에 저장"""
+        if not self.db_path or not self.dirty:
+            return
+        now = datetime.datetime.now().isoformat(timespec='seconds')
+        rows = [(str(user_id), json.dumps(list(items)), now) for user_id, items in self.dirty.items()]
+        with self.connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO recommendation_history (user_id, product_ids, updated_at) VALUES (?, ?, ?)",
+                rows
+            )
+        self.dirty = {}
+
+    def close(self):
+        self.flush()
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def stats(self) -> Dict:
+        return {
+            'users_in_memory': len(self.history),
+            'max_users': self.max_users,
+            'pending_writes': len(self.dirty),
+            'db_path': self.db_path,
+        }
@@ -2,7 +2,8 @@ from utils.storage.s3_manager import S3Manager
 from utils.storage.opensearch_manager import OpenSearchManager
 from product.transformer.recommendation_transformer import RecommendationTransformer
 from config.opensearch_config import OPENSEARCH_CONFIG
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from datetime import datetime, timedelta
 logger = logging.getLogger(__name__)
@@ -40,6 +41,44 @@ class RecommendationRepository:
             logger.error(f"Failed to save recommendation to S3: {str(e)}")
             return False
 
+    def save_batch_to_opensearch(self, items: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        OpenSearch에 추천 데이터 여러 건을 bulk 저장
+
+        Args:
+            items: (doc_id, recommendation_data) 튜플 리스트
+
+        Returns:
+            int: 저장 성공 건수
+        """
+        try:
+            docs = [(doc_id, self.transformer.to_core_data(doc_id, data)) for doc_id, data in items]
+            success, errors = self.opensearch.bulk_upload(docs)
+            if errors:
+                logger.error(f"Failed to save {len(errors)} recommendations to OpenSearch: {errors[:3]}")
+            return success
+
+        except Exception as e:
+            logger.error(f"Failed to bulk save recommendations to OpenSearch: {str(e)}")
+            return 0
+
+    def save_batch_to_s3(self, items: List[Tuple[str, Dict[str, Any]]], max_workers: int = 8) -> int:
+        """
+        S3에 추천 데이터 여러 건을 스레드로 동시에 저장 (boto3 client는 스레드 간 공유 가능)
+
+        Args:
+            items: (s3_key, recommendation_data) 튜플 리스트
+            max_workers: 동시 업로드 스레드 수
+
+        Returns:
+            int: 저장 성공 건수
+        """
+        if not items:
+            return 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda item: self.save_to_s3(item[0], item[1]), items)
+            return sum(results)
+
     
     def get_recommendation_from_opensearch(self, user_id: str) -> Dict:
             """최근 14일 이내에 생성된 추천 결과 중 가장 최근 문서를 OpenSearch에서 조회"""
@@ -0,0 +1,148 @@
+import time
+import datetime
+import threading
+from typing import Dict, Optional
+
+import boto3
+
+from config.product_config import FAISS_ARTIFACT_DIR, FAISS_S3_PREFIX, FAISS_REFRESH_INTERVAL_SEC
+from product.embedding.faiss_manager import FAISSIndexManager
+from product.embedding.index_artifact import IndexArtifact
+
+class IndexRefresher:
+    """
+    실행 중인 API에서 FAISS 인덱스를 재시작 없이 교체하는 백그라운드 refresher
+    - 주기적으로 S3의 최신 bundle manifest를 확인하고, checksum이 현재 인덱스와 다르면
+      요청 처리와 별개의 스레드에서 다운로드/로드한 뒤 서비스의 인덱스 참조를 한 번에 교체
+    - 교체 소요 시간, 교체 횟수, 현재 인덱스 생성 시각(나이), 마지막 오류를 status()로 제공
+    """
+
+    def __init__(
+            self,
+            service,
+            bucket: str = "team6-mlops-bucket",
+            s3_prefix: str = FAISS_S3_PREFIX,
+            artifact_dir: str = FAISS_ARTIFACT_DIR,
+            interval_sec: int = FAISS_REFRESH_INTERVAL_SEC
+        ):
+        self.service = service
+        self.bucket = bucket
+        self.s3_prefix = s3_prefix
+        self.artifact_dir = artifact_dir
+        self.interval_sec = interval_sec
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # 메트릭
+        self.check_count = 0
+        self.swap_count = 0
+        self.last_check_at: Optional[datetime.datetime] = None
+        self.last_swap_at: Optional[datetime.datetime] = None
+        self.last_swap_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def start(self):
+        """백그라운드 스레드 시작 (interval_sec <= 0이면 비활성화)"""
+        if self.interval_sec <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="faiss-index-refresher", daemon=True)
+        self._thread.start()
+        print(f"[INFO] FAISS 인덱스 refresher 시작: {self.interval_sec}초 간격")
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_sec):
+            self.refresh()
+
+    def latest_prefix(self) -> Optional[str]:
+        """
+        S3에서 manifest가 있는 가장 최신 bundle 경로 검색
+        - bundle 경로는 {s3_prefix}/{YYYY-MM-DD}_index 형식이라 이름 역순이 최신순
+        """
+        s3 = boto3.client('s3')
+        paginator = s3.get_paginator('list_objects_v2')
+        prefixes = []
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{self.s3_prefix}/", Delimiter='/'):
+            prefixes.extend(p['Prefix'].rstrip('/') for p in page.get('CommonPrefixes', []))
+
+        for prefix in sorted(prefixes, reverse=True):
+            try:
+                s3.head_object(Bucket=self.bucket, Key=f"{prefix}/{IndexArtifact.MANIFEST_FILE}")
+                return prefix
+            except Exception:
+                # manifest가 아직 업로드되지 않은(미완성) bundle이거나 이전 형식의 인덱스
+                continue
+        return None
+
+    def refresh(self) -> bool:
+        """
+        최신 bundle을 확인하고 현재 인덱스와 다르면 로드 후 교체
+
+        Returns:
+            bool: 인덱스 교체 여부
+        """
+        self.check_count += 1
+        self.last_check_at = datetime.datetime.now()
+        try:
+            prefix = self.latest_prefix()
+            if prefix is None:
+                return False
+
+            start = time.perf_counter()
+            # checksum이 같으면 download는 로컬 manifest를 그대로 반환
+            manifest = IndexArtifact.download(self.artifact_dir, self.bucket, prefix)
+            current = self.service.index_manifest or {}
+            if manifest.get('checksum') == current.get('checksum'):
+                return False
+
+            # 새 manager에 로드한 뒤 참조만 교체 - 기존 인덱스로 처리 중인 요청은 그대로 완료됨
+            # (기존 인덱스 파일은 교체 시 삭제되지만 memory-map은 프로세스가 참조를 놓을 때까지 유효)
+            faiss_manager = FAISSIndexManager()
+            IndexArtifact.load(
+                self.artifact_dir, faiss_manager, model_name=self.service.embedding_generator.embedding_id
+            )
+            self.service.swap_index(faiss_manager, manifest)
+
+            self.swap_count += 1
+            self.last_swap_at = datetime.datetime.now()
+            self.last_swap_seconds = time.perf_counter() - start
+            self.last_error = None
+            print(f"[INFO] FAISS 인덱스 교체 완료: s3://{self.bucket}/{prefix} "
+                  f"(카탈로그 {manifest.get('catalog_version')}, {self.last_swap_seconds:.2f}초)")
+            return True
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"[WARN] FAISS 인덱스 갱신 실패, 기존 인덱스를 계속 사용합니다: {e}")
+            return False
+
+    def index_age_seconds(self) -> Optional[float]:
+        """현재 인덱스 bundle 생성 후 경과 시간(초)"""
+        manifest = self.service.index_manifest
+        if not manifest or not manifest.get('created_at'):
+            return None
+        created_at = datetime.datetime.fromisoformat(manifest['created_at'])
+        return (datetime.datetime.now() - created_at).total_seconds()
+
+    def status(self) -> Dict:
+        """refresher 상태 및 메트릭"""
+        manifest = self.service.index_manifest or {}
+        return {
+            'running': bool(self._thread and self._thread.is_alive()),
+            'interval_sec': self.interval_sec,
+            'catalog_version': manifest.get('catalog_version'),
+            'index_created_at': manifest.get('created_at'),
+            'index_age_sec': self.index_age_seconds(),
+            'ntotal': manifest.get('ntotal'),
+            'check_count': self.check_count,
+            'swap_count': self.swap_count,
+            'last_check_at': self.last_check_at.isoformat(timespec='seconds') if self.last_check_at else None,
+            'last_swap_at': self.last_swap_at.isoformat(timespec='seconds') if self.last_swap_at else None,
+            'last_swap_sec': self.last_swap_seconds,
+            'last_error': self.last_error,
+        }
@@ -1,38 +1,55 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+import pandas as pd
 
 from config.opensearch_mappings import PRODUCT_MAPPING
+from config.product_config import FAISS_ARTIFACT_DIR, FAISS_S3_PREFIX
 from product.processor.data_processor import DataProcessor
 from product.processor.category_processor import CategoryProcessor
 from product.processor.product_score_processor import ProductSingleScoreProcessor
 from product.embedding.embedding_generator import EmbeddingGenerator
 from product.embedding.faiss_manager import FAISSIndexManager
+from product.embedding.index_artifact import IndexArtifact
 from product.repository.recommendation_repository import RecommendationRepository
 from product.service.recommendation_saver import RecommendationSaver
 
+@dataclass(frozen=True)
+class ServingState:
+    """요청 하나가 함께 사용하는 FAISS 인덱스, 상품 카탈로그, bundle manifest - 항상 한 번에 교체"""
+    faiss_manager: FAISSIndexManager
+    scored_df: pd.DataFrame
+    manifest: Optional[Dict[str, Any]]
+
 class NewUserRecommendationService:
     def __init__(self):
         
         self.dp = DataProcessor()
-        if not self.dp.load_db_data():
-            raise RuntimeError("DB 데이터 로드 실패")
-        categories_with_text = CategoryProcessor.make_category_text(self.dp.categories)
-        joined_df = ProductSingleScoreProcessor.join(self.dp.products, categories_with_text)
-        self.scored_df = ProductSingleScoreProcessor.calc_score(joined_df)
+        scored_df = self.load_catalog()
 
         # 임베딩 및 FAISS 인덱스 준비
         self.embedding_generator = EmbeddingGenerator()
         # 상품 임베딩은 여기서 새로 만들지 않음!
-        self.faiss_manager = FAISSIndexManager()
+        faiss_manager = FAISSIndexManager()
 
         yesterday_str = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-    
 
-        self.faiss_manager.auto_load_index(
-            local_path='faiss.index',
-            bucket="team6-mlops-bucket",
-            s3_key=f"faiss_index/{yesterday_str}_index/faiss.index"
-        )
+        # 어제 bundle을 로컬과 동기화(checksum이 같으면 다운로드 생략) 후 memory-map으로 로드
+        manifest = None
+        try:
+            IndexArtifact.download(FAISS_ARTIFACT_DIR, "team6-mlops-bucket", f"{FAISS_S3_PREFIX}/{yesterday_str}_index")
+            manifest = IndexArtifact.load(
+                FAISS_ARTIFACT_DIR, faiss_manager, model_name=self.embedding_generator.embedding_id
+            )
+        except Exception as e:
+            # bundle이 없는 이전 형식의 인덱스 파일
+            print(f"[WARN] 인덱스 bundle 로드 실패({e}), 인덱스 파일로 대체합니다.")
+            faiss_manager.auto_load_index(
+                local_path='faiss.index',
+                bucket="team6-mlops-bucket",
+                s3_key=f"{FAISS_S3_PREFIX}/{yesterday_str}_index/faiss.index"
+            )
+        self.state = ServingState(faiss_manager, scored_df, manifest)
 
         # 저장소 및 saver 준비
         self.repository = RecommendationRepository(
@@ -42,16 +59,51 @@ class NewUserRecommendationService:
         )
         self.saver = RecommendationSaver()
     
+    def load_catalog(self) -> pd.DataFrame:
+        """DB에서 상품/카테고리를 읽어 1인가구 점수를 계산한 추천 대상 카탈로그 생성"""
+        if not self.dp.load_db_data():
+            raise RuntimeError("DB 데이터 로드 실패")
+        categories_with_text = CategoryProcessor.make_category_text(self.dp.categories)
+        joined_df = ProductSingleScoreProcessor.join(self.dp.products, categories_with_text)
+        return ProductSingleScoreProcessor.calc_score(joined_df)
+
+    @property
+    def faiss_manager(self) -> FAISSIndexManager:
+        return self.state.faiss_manager
+
+    @property
+    def scored_df(self) -> pd.DataFrame:
+        return self.state.scored_df
+
+    @property
+    def index_manifest(self) -> Optional[Dict[str, Any]]:
+        return self.state.manifest
+
+    def swap_index(self, faiss_manager: FAISSIndexManager, manifest: Dict[str, Any]):
+        """
+        새로 로드한 인덱스와 그 시점의 카탈로그로 교체 (IndexRefresher 스레드에서 호출)
+        - 카탈로그를 다시 읽은 뒤 (인덱스, 카탈로그, manifest)를 참조 하나로 대입하므로
+          요청은 항상 같은 시점의 인덱스와 카탈로그를 사용하고, 진행 중인 요청은 기존 묶음으로 완료됨
+        - 카탈로그 로드에 실패하면 기존 카탈로그를 유지 (매핑되지 않는 상품은 추천 시 더 깊게 검색해서 채움)
+        """
+        try:
+            scored_df = self.load_catalog()
+        except Exception as e:
+            print(f"[WARN] 상품 카탈로그 재로드 실패, 기존 카탈로그를 유지합니다: {e}")
+            scored_df = self.state.scored_df
+        self.state = ServingState(faiss_manager, scored_df, manifest)
+
     def recommend(self, new_user_info: Dict[str, Any], top_k: int = 4) -> List[Dict[str, Any]]:
         """
         신규 사용자 추천 생성 및 저장
         """
+        # 요청 처리 중 인덱스가 교체되어도 한 요청은 같은 인덱스/카탈로그를 사용하도록 참조를 한 번만 읽음
+        state = self.state
         return self.saver.recommend_for_new_user(
             new_user_info,
-            self.scored_df,
-            self.faiss_manager,
+            state.scored_df,
+            state.faiss_manager,
             self.embedding_generator,
             self.repository,
             top_k
         )
-    
\ No newline at end of file
@@ -0,0 +1,233 @@
+import time
+import datetime
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from config.product_config import (
+    CATEGORY_POOL_CACHE_DIR, FAISS_S3_PREFIX, REALTIME_ARTIFACT_DIR,
+    REALTIME_RECOMMENDATION_ENABLED, REALTIME_TIMEOUT_MS, REALTIME_SAVE_RESULTS
+)
+from product.core.recommendation_engine import RecommendationEngine
+from product.embedding.embedding_generator import EmbeddingGenerator
+from product.embedding.faiss_manager import FAISSIndexManager
+from product.embedding.index_artifact import IndexArtifact
+from product.service.index_refresher import IndexRefresher
+from product.transformer.recommendation_transformer import RecommendationTransformer
+
+class RealtimeRecommendationService:
+    """
+    기존 사용자 실시간 추천 서비스
+    - API 프로세스 메모리에 추천 엔진(상품 데이터, 카테고리 pool, FAISS 인덱스, 사용자 프로필)을 준비해두고,
+      최근 추천 문서가 없는 사용자의 top-k를 요청 시점에 바로 계산
+    - 엔진 준비(warm-up)는 백그라운드 스레드에서 진행하고, 준비 전에는 실시간 추천을 생략
+    - 엔진은 스레드 안전하지 않아서 lock으로 한 번에 한 요청씩 처리하고,
+      timeout_ms 안에 lock을 얻지 못하면 실시간 추천을 생략 (지연 시간 목표 유지)
+    - 느린 추천 단계는 엔진 파이프라인의 단계별 예산으로 건너뜀
+    - warm-up 후에는 전용 bundle 디렉토리의 IndexRefresher가 새 bundle을 감지하면
+      새 인덱스와 그 시점의 상품/사용자 프로필로 엔진을 다시 만들어 교체
+    """
+    LATENCY_WINDOW = 1000  # 지연 시간 통계에 사용할 최근 요청 수
+
+    def __init__(
+            self,
+            pipeline_service=None,
+            repository=None,
+            enabled: bool = REALTIME_RECOMMENDATION_ENABLED,
+            timeout_ms: float = REALTIME_TIMEOUT_MS,
+            save_results: bool = REALTIME_SAVE_RESULTS,
+            bucket: str = "team6-mlops-bucket",
+            artifact_dir: str = REALTIME_ARTIFACT_DIR,
+            cache_dir: Optional[str] = CATEGORY_POOL_CACHE_DIR
+        ):
+        """
+        Args:
+            pipeline_service: 상품 점수/사용자 프로필 생성에 사용할 RecommendationService (warm-up용)
+            repository: 실시간 추천 결과 저장용 RecommendationRepository (None이면 저장하지 않음)
+            enabled: 실시간 추천 활성화 여부
+            timeout_ms: 요청당 엔진 대기 시간 한도
+            save_results: 실시간 추천 결과를 백그라운드로 저장할지 여부
+            artifact_dir: 로컬 bundle 디렉토리 (같은 프로세스의 다른 인덱스 사용처와 겹치지 않는 경로)
+            cache_dir: 카테고리 pool 적합도 점수 디스크 캐시 경로 (None이면 메모리 캐시만 사용)
+        """
+        self.pipeline_service = pipeline_service
+        self.repository = repository
+        self.enabled = enabled
+        self.timeout_ms = timeout_ms
+        self.save_results = save_results and repository is not None
+        self.bucket = bucket
+        self.artifact_dir = artifact_dir
+        self.cache_dir = cache_dir
+
+        self.engine: Optional[RecommendationEngine] = None
+        self.embedding_generator: Optional[EmbeddingGenerator] = None
+        self.index_manifest = None
+        self.ready_at: Optional[datetime.datetime] = None
+        self._lock = threading.Lock()
+        self._warm_thread: Optional[threading.Thread] = None
+        self._save_executor = ThreadPoolExecutor(max_workers=1) if self.save_results else None
+        self.refresher = IndexRefresher(self, bucket=bucket, artifact_dir=artifact_dir)
+
+        # 메트릭 (요청 스레드들이 동시에 갱신하므로 엔진 lock과 별개인 metrics lock으로 보호)
+        self._metrics_lock = threading.Lock()
+        self.counts = {'requests': 0, 'served': 0, 'not_ready': 0, 'busy': 0, 'unknown_user': 0, 'over_budget': 0, 'errors': 0}
+        self.latencies_ms = deque(maxlen=self.LATENCY_WINDOW)
+        self.warm_up_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def start(self):
+        """백그라운드 warm-up 시작 (비활성화 상태면 아무것도 하지 않음)"""
+        if not self.enabled or (self._warm_thread and self._warm_thread.is_alive()):
+            return
+        self._warm_thread = threading.Thread(target=self.warm_up, name="realtime-engine-warm-up", daemon=True)
+        self._warm_thread.start()
+        print("[INFO] 실시간 추천 엔진 warm-up 시작")
+
+    def warm_up(self):
+        """상품 점수, 사용자 프로필, FAISS 인덱스를 준비해서 추천 엔진 생성 후 인덱스 refresher 시작"""
+        start = time.perf_counter()
+        try:
+            self.embedding_generator = EmbeddingGenerator()
+            faiss_manager = FAISSIndexManager()
+            manifest = self.load_index(faiss_manager, self.embedding_generator.embedding_id)
+            self.set_engine(self.build_engine(faiss_manager), manifest)
+            self.warm_up_seconds = time.perf_counter() - start
+            print(f"[INFO] 실시간 추천 엔진 준비 완료: 사용자 {len(self.engine.user_profiles)}명, "
+                  f"상품 {len(self.engine.products_df)}개, {self.warm_up_seconds:.1f}초")
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"[WARN] 실시간 추천 엔진 준비 실패, 저장된 추천 결과만 제공합니다: {e}")
+            return
+        self.refresher.start()
+
+    def build_engine(self, faiss_manager: FAISSIndexManager) -> RecommendationEngine:
+        """
+        현재 상품 점수/사용자 프로필과 주어진 인덱스로 추천 엔진 생성
+        - 교체 시에는 기존 엔진의 추천 히스토리를 이어서 사용
+        """
+        scored_df = self.pipeline_service.category_score_pipeline()
+        user_profiles = self.pipeline_service.user_profile_pipeline(scored_df)
+        history_manager = self.engine.history_manager if self.engine is not None else None
+        engine = RecommendationEngine(
+            scored_df, faiss_manager, self.embedding_generator, user_profiles,
+            history_manager=history_manager, cache_dir=self.cache_dir
+        )
+        # 사용자 임베딩은 엔진 생성 시 고유 쿼리 텍스트별로 한 번에 계산
+        # - 요청 처리 중(엔진 lock 안)에 SBERT 인코딩을 하지 않도록 미리 준비
+        if self.embedding_generator is not None:
+            engine.set_user_embeddings(*self.embedding_generator.generate_user_embeddings(user_profiles))
+        return engine
+
+    def load_index(self, faiss_manager: FAISSIndexManager, model_name: str) -> Dict:
+        """오늘 또는 어제 FAISS bundle을 전용 디렉토리에 동기화 후 memory-map으로 로드"""
+        last_error = None
+        for days_ago in (0, 1):
+            date_str = (datetime.datetime.now() - datetime.timedelta(days=days_ago)).strftime("%Y-%m-%d")
+            try:
+                IndexArtifact.download(self.artifact_dir, self.bucket, f"{FAISS_S3_PREFIX}/{date_str}_index")
+                return IndexArtifact.load(self.artifact_dir, faiss_manager, model_name=model_name)
+            except Exception as e:
+                last_error = e
+        raise RuntimeError(f"FAISS 인덱스 bundle 로드 실패: {last_error}")
+
+    def swap_index(self, faiss_manager: FAISSIndexManager, manifest: Dict):
+        """
+        새 bundle 인덱스로 엔진 교체 (IndexRefresher 스레드에서 호출)
+        - 엔진은 요청 처리와 별개로 새로 만들고, 교체만 lock 안에서 진행
+        - 엔진 생성에 실패하면 예외를 그대로 올려서 refresher가 기존 엔진을 유지하고 다음 주기에 재시도
+        """
+        self.set_engine(self.build_engine(faiss_manager), manifest)
+        print(f"[INFO] 실시간 추천 엔진 교체 완료: 카탈로그 {manifest.get('catalog_version')}")
+
+    def set_engine(self, engine: RecommendationEngine, manifest: Optional[Dict] = None):
+        """준비된 엔진으로 교체 - 처리 중인 요청이 끝난 뒤 교체"""
+        with self._lock:
+            self.engine = engine
+            self.index_manifest = manifest
+            self.ready_at = datetime.datetime.now()
+
+    def is_ready(self) -> bool:
+        return self.engine is not None
+
+    def recommend(self, user_id: int, top_k: int = 4) -> Optional[Dict[str, Any]]:
+        """
+        사용자 추천을 바로 계산해서 OpenSearch 조회 결과와 같은 형식으로 반환
+
+        Returns:
+            Optional[Dict]: {"status": "success", "data": ..., "timestamp": ..., "source": "realtime"}
+                - 비활성화/준비 전/엔진 사용 중(timeout)/알 수 없는 사용자면 None
+        """
+        if not self.enabled:
+            return None
+        self.count('requests')
+        if not self.is_ready():
+            self.count('not_ready')
+            return None
+
+        start = time.perf_counter()
+        if not self._lock.acquire(timeout=self.timeout_ms / 1000):
+            self.count('busy')
+            return None
+        try:
+            recommendations = self.engine.recommend(user_id, top_k=top_k)
+        except Exception as e:
+            self.count('errors')
+            self.last_error = str(e)
+            print(f"[WARN] 사용자 {user_id} 실시간 추천 실패: {e}")
+            return None
+        finally:
+            self._lock.release()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._metrics_lock:
+            self.latencies_ms.append(elapsed_ms)
+            if elapsed_ms > self.timeout_ms:
+                self.counts['over_budget'] += 1
+        if recommendations.empty:
+            self.count('unknown_user')
+            return None
+
+        rec_result = recommendations.to_dict(orient='records')
+        doc_id, s3_key, recommendation_data = RecommendationTransformer.existing_user_document(user_id, rec_result)
+        if self.save_results:
+            self._save_executor.submit(self.save, doc_id, s3_key, recommendation_data)
+
+        self.count('served')
+        return {
+            "status": "success",
+            "data": RecommendationTransformer.to_core_data(doc_id, recommendation_data),
+            "timestamp": recommendation_data["run_id"].removeprefix("run_id_"),
+            "source": "realtime"
+        }
+
+    def count(self, name: str):
+        with self._metrics_lock:
+            self.counts[name] += 1
+
+    def save(self, doc_id: str, s3_key: str, recommendation_data: Dict[str, Any]):
+        """다음 조회부터는 저장된 문서를 사용하도록 S3/OpenSearch에 저장"""
+        self.repository.save_to_s3(s3_key=s3_key, recommendation_data=recommendation_data)
+        self.repository.save_to_opensearch(doc_id, recommendation_data)
+
+    def status(self) -> Dict:
+        """실시간 추천 상태 및 지연 시간 메트릭"""
+        with self._metrics_lock:
+            counts = dict(self.counts)
+            latencies = np.array(self.latencies_ms)
+        return {
+            'enabled': self.enabled,
+            'ready': self.is_ready(),
+            'ready_at': self.ready_at.isoformat(timespec='seconds') if self.ready_at else None,
+            'warm_up_sec': self.warm_up_seconds,
+            'catalog_version': (self.index_manifest or {}).get('catalog_version'),
+            'timeout_ms': self.timeout_ms,
+            **counts,
+            'p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else None,
+            'p99_ms': float(np.percentile(latencies, 99)) if len(latencies) else None,
+            'stages': self.engine.pipeline.get_stats() if self.engine is not None else None,
+            'index_refresh': self.refresher.status(),
+            'last_error': self.last_error,
+        }
@@ -1,10 +1,12 @@
 from typing import List, Dict, Any
+import numpy as np
 import pandas as pd
 import datetime
 import logging
 
 from product.repository.recommendation_repository import RecommendationRepository
 from product.feature.user_profile import UserProfiler
+from product.transformer.recommendation_transformer import RecommendationTransformer
 
 logger = logging.getLogger(__name__)
 
@@ -30,9 +32,9 @@ class RecommendationSaver:
         # 신규 사용자 임베딩 벡터 생성
         user_embedding, query_text = embedding_generator.generate_user_embedding(new_user_profile)
 
-        # FAISS 인덱스에서 유사 상품 Top-K 검색
-        scores, indices = faiss_manager.search(user_embedding, k=top_k)
-        recommended_products = products_df.iloc[indices].copy()
+        # FAISS 인덱스에서 유사 상품 Top-K 검색 후 product_id 기준으로 상품 행 매핑
+        scores, positions = self.search_mapped(faiss_manager, user_embedding, pd.Index(products_df['product_id']), top_k)
+        recommended_products = products_df.iloc[positions].copy()
         recommended_products['faiss_score'] = scores
 
         # Timestamp 컬럼을 문자열로 변환
@@ -66,6 +68,26 @@ class RecommendationSaver:
 
         return rec_result
 
+    @staticmethod
+    def search_mapped(faiss_manager, user_embedding, product_index: pd.Index, top_k: int):
+        """
+        카탈로그에 매핑되는 상품이 top_k개 모일 때까지 검색 깊이를 2배씩 늘려가며 검색
+        - 인덱스와 카탈로그 시점이 달라서 매핑되지 않는 상품이 있어도 top_k개를 채움
+        - 인덱스 전체를 검색해도 부족하면 매핑된 상품만 반환
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (유사도 점수 배열, 상품 데이터프레임 행 위치 배열)
+        """
+        ntotal = faiss_manager.index.ntotal
+        depth = min(top_k, ntotal)
+        while True:
+            scores, labels = faiss_manager.search(user_embedding, k=max(depth, 1))
+            positions = faiss_manager.resolve_positions(labels, product_index)
+            found = np.flatnonzero(positions >= 0)[:top_k]
+            if len(found) >= top_k or depth >= ntotal:
+                return scores[found], positions[found]
+            depth = min(depth * 2, ntotal)
+
     def recommend_for_existing_user(
             user_id: int,
             engine,
@@ -78,22 +100,14 @@ class RecommendationSaver:
         # 추천 엔진 실행
         recommendations = engine.recommend(user_id, top_k=top_k)
         rec_result = recommendations.to_dict(orient='records')
-        
-
-        # S3 키 생성
-        now = datetime.datetime.now()
-        today = now.strftime("%Y%m%d_%H%M%S")
-        doc_id = f"user_{user_id}_{today}"
-        s3_key = f"recommendations/user_{user_id}/product_{today}.json"
-        experiment_id = 2
-        run_id = f"run_id_{today}"
+        return RecommendationSaver.save_for_existing_user(user_id, rec_result, repository)
 
-        recommendation_data = {
-            "user_id": user_id,
-            "recommendations": rec_result,
-            "experiment_id": experiment_id,
-            "run_id": run_id
-        }
+    @staticmethod
+    def save_for_existing_user(user_id: int, rec_result: List[Dict[str, Any]], repository) -> List[Dict[str, Any]]:
+        """
+        기존 사용자 추천 결과 저장 - recommend_all로 미리 만든 결과도 같은 형식으로 저장
+        """
+        doc_id, s3_key, recommendation_data = RecommendationTransformer.existing_user_document(user_id, rec_result)
 
         # S3와 opensearch에 저장
         repository.save_to_s3(s3_key=s3_key, recommendation_data=recommendation_data)
@@ -101,4 +115,4 @@ class RecommendationSaver:
         print(f"기존 사용자 {user_id} 추천 결과 S3/Opensearch 저장 완료")
         print(f"{doc_id}")
 
-        return rec_result
\ No newline at end of file
+        return rec_result
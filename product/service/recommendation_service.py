@@ -3,14 +3,22 @@ from typing import Dict, Any, List
 import pandas as pd
 
 from config.opensearch_mappings import PRODUCT_MAPPING
+from config.product_config import (
+    EMBEDDING_CACHE_DIR, FAISS_ARTIFACT_DIR, FAISS_S3_PREFIX, RECOMMENDATION_WORKERS,
+    RECOMMENDATION_HISTORY_DB
+)
 from product.processor.data_processor import DataProcessor
 from product.processor.category_processor import CategoryProcessor
 from product.processor.product_score_processor import ProductSingleScoreProcessor
 from product.feature.user_profile import UserProfiler
 from product.embedding.embedding_generator import EmbeddingGenerator
+from product.embedding.embedding_cache import EmbeddingCache
 from product.embedding.faiss_manager import FAISSIndexManager
+from product.embedding.index_artifact import IndexArtifact
 from product.core.recommendation_engine import RecommendationEngine
-from product.service.recommendation_saver import RecommendationSaver
+from product.processor.recommendation_history import RecommendationHistoryManager
+from product.service.recommendation_sink import RecommendationBatchSink
+from product.service.sharded_runner import ShardedRecommendationRunner
 from product.repository.recommendation_repository import RecommendationRepository
 
 class RecommendationService:
@@ -24,15 +32,14 @@ class RecommendationService:
         self.scored_df=None
         self.user_profiles = None
         self.product_embeddings = None
+        self.product_texts = None
         self.user_embedding = None
+        self.user_embeddings = None
+        self.user_embedding_rows = None
         self.faiss_manager = None
         self.embedding_generator = None
         self.engine = None
-        self.repository = RecommendationRepository(
-            s3_bucket="team6-mlops-bucket",
-            opensearch_index="recommendations-v2",
-            mapping=PRODUCT_MAPPING
-        )
+        self.repository = self.create_repository()
     
     def category_score_pipeline(self) -> pd.DataFrame:
         """
@@ -62,60 +69,91 @@ class RecommendationService:
         self.user_profiles = user_profiles
         return user_profiles
     
-    def embedding_pipeline(self, scored_df: pd.DataFrame, user_profile: Dict):
+    def embedding_pipeline(self, scored_df: pd.DataFrame, user_profiles: Dict):
         """
-        상품 임베딩 및 단일 사용자 임베딩 벡터를 생성
+        상품 임베딩 및 전체 사용자 임베딩 벡터를 생성
+        - 상품 임베딩은 디스크 캐시를 사용해 새로 추가/변경된 상품만 인코딩
+        - 사용자 임베딩은 고유 쿼리 텍스트만 배치로 한 번에 인코딩
         """
         embedding_generator = EmbeddingGenerator()
-        product_embeddings, _ = embedding_generator.generate_product_embeddings(scored_df)
-        user_embedding, _ = embedding_generator.generate_user_embedding(user_profile)
+        embedding_cache = EmbeddingCache(EMBEDDING_CACHE_DIR, embedding_generator.embedding_id)
+        product_embeddings, product_texts = embedding_generator.generate_product_embeddings(scored_df, cache=embedding_cache)
+        user_embeddings, user_embedding_rows = embedding_generator.generate_user_embeddings(user_profiles)
         self.embedding_generator = embedding_generator
         self.product_embeddings = product_embeddings
-        self.user_embedding = user_embedding
+        self.product_texts = product_texts
+        self.user_embeddings = user_embeddings
+        self.user_embedding_rows = user_embedding_rows
+        # 인덱스 검색 확인용 샘플 사용자 임베딩
+        self.user_embedding = user_embeddings[:1]
     
-    def faiss_pipeline(self, product_embeddings, user_embedding, local_path='faiss.index'):
+    def faiss_pipeline(self, product_embeddings, user_embedding, product_ids, artifact_dir=FAISS_ARTIFACT_DIR,
+                       categories=None):
         """
-        FAISS 인덱스를 구축하고, S3와 로컬에 저장 및 복구를 수행
+        product_id 기반 FAISS 인덱스를 구축하고, bundle(인덱스 + product_id + manifest)로
+        로컬에 한 번 저장한 뒤 S3에 한 번 업로드 - 재로드/재다운로드 없이 메모리의 인덱스를 그대로 사용
+        - categories(상품별 large_category)를 주면 카테고리별 sub-index도 구축 (추천 엔진 전용, bundle 미포함)
         """
         today_str = datetime.datetime.now().strftime("%Y-%m-%d")
         bucket = "team6-mlops-bucket"
-        s3_key = f"faiss_index/{today_str}_index/faiss.index"
+        s3_prefix = f"{FAISS_S3_PREFIX}/{today_str}_index"
 
         faiss_manager = FAISSIndexManager()
-        faiss_manager.build_index(product_embeddings)
-        faiss_manager.save_index_to_local(local_path)
-        faiss_manager.load_index_from_local(local_path)
-        if bucket and s3_key:
-            faiss_manager.save_index_to_S3(local_path, bucket, s3_key)
-            faiss_manager.load_index_from_s3(local_path, bucket, s3_key)
-        faiss_manager.auto_load_index(local_path, bucket, s3_key)
+        faiss_manager.build_index(product_embeddings, product_ids=product_ids)
+
+        model_name = self.embedding_generator.embedding_id if self.embedding_generator else None
+        catalog_version = IndexArtifact.catalog_version(product_ids, self.product_texts or [])
+        IndexArtifact.write(faiss_manager, artifact_dir, model_name, catalog_version)
+        IndexArtifact.upload(artifact_dir, bucket, s3_prefix)
+
+        if categories is not None:
+            faiss_manager.build_category_indexes(product_embeddings, product_ids, categories)
+
         faiss_manager.search(user_embedding, k=4)
         self.faiss_manager = faiss_manager
 
 
-    def recommendation_engine_pipeline(self, scored_df, user_profiles, faiss_manager, embedding_generator):
+    def recommendation_engine_pipeline(self, scored_df, user_profiles, faiss_manager, embedding_generator,
+                                       user_embeddings=None, user_embedding_rows=None):
         """
         추천 엔진
+        - 미리 계산한 사용자 임베딩이 있으면 FAISS fallback에서 재사용
         """
         engine = RecommendationEngine(
             products_df=scored_df,
             faiss_manager=faiss_manager,
             embedding_generator=embedding_generator,
-            user_profiles=user_profiles
+            user_profiles=user_profiles,
+            history_manager=RecommendationHistoryManager(RECOMMENDATION_HISTORY_DB)
         )
+        if user_embeddings is not None:
+            engine.set_user_embeddings(user_embeddings, user_embedding_rows)
         self.engine = engine
     
-    def save_all_user_recommendations(self, user_profiles, engine, repository, top_k=4):
+    def create_repository(self) -> RecommendationRepository:
+        return RecommendationRepository(
+            s3_bucket="team6-mlops-bucket",
+            opensearch_index="recommendations-v2",
+            mapping=PRODUCT_MAPPING
+        )
+
+    def save_all_user_recommendations(self, user_profiles, engine, repository=None, top_k=4, workers=RECOMMENDATION_WORKERS):
         """
         모든 사용자에 대해 추천을 생성하고, S3/Opensearch에 저장
+        - 사용자 ID를 shard로 나눠 worker 프로세스에서 recommend_all로 배치 생성 (엔진은 fork로 공유)
+        - shard마다 자체 repository로 묶음 저장 (repository를 주면 worker 1개일 때 그대로 사용)
         """
-        for user_id in user_profiles.keys():
-            RecommendationSaver.recommend_for_existing_user(
-                user_id=user_id,
-                engine=engine,
-                repository=repository,
-                top_k=top_k
-            )
+        def sink_factory():
+            shard_repository = repository if repository is not None and workers == 1 else self.create_repository()
+            return RecommendationBatchSink(shard_repository)
+
+        runner = ShardedRecommendationRunner(engine, sink_factory, workers=workers)
+        try:
+            # shard가 하나라도 실패하면 RuntimeError - flow 실패로 처리
+            return runner.run(list(user_profiles.keys()), top_k=top_k)
+        finally:
+            # 이번 실행에서 저장된 사용자의 추천 히스토리 저장 (다음 실행에서 중복 추천 방지)
+            engine.history_manager.flush()
     
     def run_full_pipeline(self):
         """
@@ -127,14 +165,17 @@ class RecommendationService:
         self.faiss_pipeline(
             self.product_embeddings, 
             self.user_embedding,
-            local_path='faiss.index'
+            product_ids=scored_df['product_id'].to_numpy(),
+            categories=scored_df['large_category'].to_numpy()
         )
         # 추천 엔진 준비
         self.recommendation_engine_pipeline(
             scored_df,
             user_profiles,
             self.faiss_manager,
-            self.embedding_generator
+            self.embedding_generator,
+            user_embeddings=self.user_embeddings,
+            user_embedding_rows=self.user_embedding_rows
         )
         # 추천 결과 저장소 준비 및 전체 사용자 추천 결과 저장
         self.save_all_user_recommendations(
@@ -0,0 +1,60 @@
+import time
+from typing import Any, Dict, List
+
+from config.product_config import SINK_BATCH_SIZE, SINK_S3_WORKERS
+from product.transformer.recommendation_transformer import RecommendationTransformer
+
+class RecommendationBatchSink:
+    """
+    기존 사용자 추천 결과를 모아서 S3/OpenSearch에 묶음 저장하는 sink
+    - 문서 형식은 RecommendationSaver.save_for_existing_user와 같음 (RecommendationTransformer.existing_user_document)
+    - batch_size건마다 S3는 스레드로 동시 업로드, OpenSearch는 bulk API 한 번으로 저장
+    """
+
+    def __init__(self, repository, batch_size: int = SINK_BATCH_SIZE, s3_workers: int = SINK_S3_WORKERS):
+        self.repository = repository
+        self.batch_size = batch_size
+        self.s3_workers = s3_workers
+        self.buffer = []
+        self.buffer_user_ids = []
+
+        # 메트릭 (written_user_ids: 저장이 끝난 사용자 - 중간에 실패해도 이미 저장된 사용자는 히스토리에 반영)
+        self.written = 0
+        self.written_user_ids = []
+        self.s3_saved = 0
+        self.opensearch_saved = 0
+        self.write_seconds = 0.0
+
+    def write(self, user_id: int, rec_result: List[Dict[str, Any]]):
+        self.buffer.append(RecommendationTransformer.existing_user_document(user_id, rec_result))
+        self.buffer_user_ids.append(user_id)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        start = time.perf_counter()
+        documents, self.buffer = self.buffer, []
+        user_ids, self.buffer_user_ids = self.buffer_user_ids, []
+        self.s3_saved += self.repository.save_batch_to_s3(
+            [(s3_key, data) for _, s3_key, data in documents], max_workers=self.s3_workers
+        )
+        self.opensearch_saved += self.repository.save_batch_to_opensearch(
+            [(doc_id, data) for doc_id, _, data in documents]
+        )
+        self.written += len(documents)
+        self.written_user_ids.extend(user_ids)
+        self.write_seconds += time.perf_counter() - start
+
+    def close(self):
+        self.flush()
+
+    def stats(self) -> Dict:
+        return {
+            'written': self.written,
+            'written_user_ids': self.written_user_ids,
+            's3_saved': self.s3_saved,
+            'opensearch_saved': self.opensearch_saved,
+            'write_sec': self.write_seconds,
+        }
@@ -0,0 +1,195 @@
+import os
+import sys
+import time
+import warnings
+import multiprocessing
+from typing import Callable, Dict, List, Optional
+
+import faiss
+
+from config.product_config import RECOMMENDATION_WORKERS, RECOMMENDATION_SHARD_SIZE
+
+# fork 전에 부모 프로세스에서 채워두는 공유 상태 - worker는 fork 시점의 메모리를 copy-on-write로 그대로 사용
+# (상품 카탈로그, 카테고리 pool 배열, FAISS 인덱스를 pickle/복사 없이 읽기 전용으로 공유)
+_SHARED: Dict = {}
+
+def _init_worker():
+    # worker 여러 개가 동시에 검색하므로 FAISS(OpenMP)는 프로세스당 1스레드로 제한
+    faiss.omp_set_num_threads(1)
+
+def _run_shard(task) -> Dict:
+    shard_no, user_ids = task
+    return ShardedRecommendationRunner.run_shard(
+        _SHARED['engine'], _SHARED['sink_factory'], shard_no, user_ids, _SHARED['top_k']
+    )
+
+class ShardedRecommendationRunner:
+    """
+    전체 사용자 추천을 사용자 ID shard 단위로 여러 worker 프로세스에서 나눠 실행하는 클래스
+    - 추천 엔진(상품 데이터, pool, FAISS 인덱스)은 부모 프로세스에서 한 번 준비하고 fork로 공유
+    - shard마다 sink_factory로 자체 저장 sink(S3/OpenSearch client 포함)를 만들어 묶음 저장
+    - worker별 추천 히스토리 갱신은 부모 엔진에 다시 반영해서 단일 프로세스 실행과 같은 상태 유지
+      (저장에 실패한 사용자는 히스토리에 남기지 않음, DB를 쓰면 worker가 직접 저장하고 부모는 다시 쓰지 않음)
+    - shard별 진행 상황과 소요 시간 요약 출력, 실패한 shard가 있으면 모든 shard를 마친 뒤 RuntimeError
+
+    fork 안전성:
+    - 부모 프로세스에는 엔진 준비 중 생긴 스레드(pyarrow/OpenMP 스레드 풀, S3 전송 스레드, Prefect 로그 스레드 등)가
+      남아 있을 수 있고, fork된 worker에는 fork를 호출한 스레드만 복사되어 다른 스레드가 잡고 있던 lock은 풀리지 않음
+    - worker는 fork 시점 메모리의 엔진으로 numpy/FAISS 연산만 하고(OpenMP는 1스레드로 재설정해서 스레드 풀 미사용),
+      저장 client는 sink_factory로 worker 안에서 새로 만들기 때문에 부모 스레드의 lock/스레드 풀을 사용하지 않음
+    - 이 조건에서만 fork를 사용하므로 Python의 multi-threaded fork DeprecationWarning은 pool 생성 구간에서만 무시함
+      (worker에서 부모가 만든 client/스레드 풀을 쓰도록 바꾸면 이 가정이 깨짐)
+    """
+
+    def __init__(
+            self,
+            engine,
+            sink_factory: Callable,
+            workers: int = RECOMMENDATION_WORKERS,
+            shard_size: int = RECOMMENDATION_SHARD_SIZE
+        ):
+        """
+        Args:
+            engine: 준비된 RecommendationEngine
+            sink_factory: 인자 없이 호출하면 write/close/stats를 가진 저장 sink를 반환하는 함수 (worker 안에서 호출)
+            workers: worker 프로세스 수 (0이면 CPU 코어 수, 1이면 현재 프로세스에서 실행)
+            shard_size: shard당 사용자 수
+        """
+        self.engine = engine
+        self.sink_factory = sink_factory
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = max(1, shard_size)
+
+    @staticmethod
+    def split_shards(user_ids: List[int], shard_size: int) -> List[List[int]]:
+        return [user_ids[start:start + shard_size] for start in range(0, len(user_ids), shard_size)]
+
+    @staticmethod
+    def run_shard(engine, sink_factory: Callable, shard_no: int, user_ids: List[int], top_k: int) -> Dict:
+        """
+        shard 하나의 추천 생성 및 저장
+        - 실패하면 이미 저장된 사용자의 추천 결과만 남기고, 나머지 사용자의 히스토리는 shard 시작 시점으로 되돌림
+
+        Returns:
+            Dict: shard 번호, pid, 사용자 수, 단계별 소요 시간, 저장 건수, 오류, 저장된 사용자별 추천 상품 ID
+        """
+        summary = {
+            'shard': shard_no, 'pid': os.getpid(), 'users': len(user_ids),
+            'recommend_sec': 0.0, 'write_sec': 0.0, 'written': 0, 'error': None, 'recommended_ids': {},
+        }
+        start = time.perf_counter()
+        history = engine.history_manager
+        snapshot = history.snapshot(user_ids)
+        results, sink = {}, None
+        try:
+            results = engine.recommend_all(user_ids, top_k=top_k)
+            summary['recommend_sec'] = time.perf_counter() - start
+
+            sink = sink_factory()
+            for user_id, rec_result in results.items():
+                sink.write(user_id, rec_result)
+            sink.close()
+        except Exception as e:
+            summary['error'] = str(e)
+            print(f"[WARN] shard {shard_no} 처리 실패 (사용자 {len(user_ids)}명): {e}")
+
+        stats = sink.stats() if sink is not None else {}
+        if summary['error'] is None:
+            written_ids = set(results)
+        else:
+            # sink가 중간까지 저장한 사용자 (저장된 사용자를 알 수 없는 sink면 모두 미저장으로 처리)
+            written_ids = set(stats.get('written_user_ids', [])) & set(results)
+        history.rollback({user_id: items for user_id, items in snapshot.items() if user_id not in written_ids})
+        # flush_every 미만으로 남은 변경분도 worker 종료 전에 저장 (DB를 쓰는 경우)
+        history.flush()
+
+        summary['write_sec'] = stats.get('write_sec', max(time.perf_counter() - start - summary['recommend_sec'], 0.0))
+        summary['written'] = stats.get('written', len(written_ids))
+        summary['recommended_ids'] = {
+            user_id: [rec['product_id'] for rec in results[user_id]] for user_id in results if user_id in written_ids
+        }
+        summary['total_sec'] = time.perf_counter() - start
+        return summary
+
+    def run(self, user_ids: List[int], top_k: int = 4) -> List[Dict]:
+        """
+        전체 사용자 추천 실행
+
+        Returns:
+            List[Dict]: shard 번호 순 shard별 실행 요약
+
+        Raises:
+            RuntimeError: 실패한 shard가 있는 경우 (성공한 shard의 저장/히스토리 반영은 끝난 뒤)
+        """
+        shards = self.split_shards(list(user_ids), self.shard_size)
+        workers = min(self.workers, len(shards))
+        print(f"[INFO] 전체 사용자 추천 시작: 사용자 {len(user_ids)}명, shard {len(shards)}개, worker {max(workers, 1)}개")
+
+        start = time.perf_counter()
+        summaries = []
+        if workers <= 1:
+            for shard_no, shard in enumerate(shards):
+                summaries.append(self.run_shard(self.engine, self.sink_factory, shard_no, shard, top_k))
+                self.report_progress(summaries, len(shards), start)
+        else:
+            _SHARED.update(engine=self.engine, sink_factory=self.sink_factory, top_k=top_k)
+            # fork 직전에 출력 버퍼를 비워서 worker가 부모의 미출력 내용을 중복 출력하지 않도록 함
+            sys.stdout.flush()
+            sys.stderr.flush()
+            try:
+                with warnings.catch_warnings():
+                    # 클래스 docstring의 fork 안전성 조건 참고
+                    warnings.filterwarnings('ignore', message=r'.*multi-threaded.*fork', category=DeprecationWarning)
+                    pool = multiprocessing.get_context('fork').Pool(workers, initializer=_init_worker)
+                with pool:
+                    for summary in pool.imap_unordered(_run_shard, enumerate(shards)):
+                        summaries.append(summary)
+                        self.report_progress(summaries, len(shards), start)
+            finally:
+                _SHARED.clear()
+
+            # worker에서 갱신된 추천 히스토리를 부모 엔진에 반영
+            history = self.engine.history_manager
+            if history.db_path:
+                # worker가 이미 DB에 저장했으므로 다시 쓰지 않고, 부모 메모리의 이전 값만 버려서 다음 조회 때 DB에서 읽음
+                history.forget(user_ids)
+            else:
+                for summary in summaries:
+                    for user_id, product_ids in summary['recommended_ids'].items():
+                        history.add(user_id, product_ids)
+
+        summaries.sort(key=lambda summary: summary['shard'])
+        self.print_summary(summaries, time.perf_counter() - start)
+
+        failed = [summary for summary in summaries if summary['error']]
+        if failed:
+            raise RuntimeError(
+                f"전체 사용자 추천 중 shard {len(failed)}개 실패: "
+                + ", ".join(f"shard {summary['shard']}({summary['error']})" for summary in failed[:5])
+            )
+        return summaries
+
+    @staticmethod
+    def report_progress(summaries: List[Dict], n_shards: int, start: float):
+        summary = summaries[-1]
+        done_users = sum(s['users'] for s in summaries)
+        status = f"오류: {summary['error']}" if summary['error'] else f"저장 {summary['written']}건"
+        print(f"[INFO] shard {summary['shard']} 완료 ({len(summaries)}/{n_shards}, 누적 사용자 {done_users}명, "
+              f"{time.perf_counter() - start:.1f}초) - pid {summary['pid']}, 추천 {summary['recommend_sec']:.2f}초, "
+              f"저장 {summary['write_sec']:.2f}초, {status}")
+
+    @staticmethod
+    def print_summary(summaries: List[Dict], elapsed: float):
+        users = sum(s['users'] for s in summaries)
+        written = sum(s['written'] for s in summaries)
+        failed = [s['shard'] for s in summaries if s['error']]
+        recommend_sec = sum(s['recommend_sec'] for s in summaries)
+        write_sec = sum(s['write_sec'] for s in summaries)
+        slowest: Optional[Dict] = max(summaries, key=lambda s: s['total_sec'], default=None)
+
+        print(f"[INFO] 전체 사용자 추천 완료: 사용자 {users}명, 저장 {written}건, {elapsed:.1f}초 "
+              f"({users / elapsed if elapsed > 0 else 0:.0f}명/초)")
+        print(f"[INFO] shard 합계 - 추천 {recommend_sec:.1f}초, 저장 {write_sec:.1f}초"
+              + (f", 가장 느린 shard {slowest['shard']} ({slowest['total_sec']:.1f}초)" if slowest else ""))
+        if failed:
+            print(f"[WARN] 실패한 shard: {failed}")
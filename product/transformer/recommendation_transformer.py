@@ -1,4 +1,31 @@
+import datetime
+from typing import Any, Dict, List, Tuple
+
 class RecommendationTransformer:
+    @staticmethod
+    def existing_user_document(user_id: int, rec_result: List[Dict[str, Any]]) -> Tuple[str, str, Dict[str, Any]]:
+        """
+        기존 사용자 추천 결과의 저장 문서 생성
+
+        Returns:
+            (doc_id, s3_key, recommendation_data)
+        """
+        # S3 키 생성
+        now = datetime.datetime.now()
+        today = now.strftime("%Y%m%d_%H%M%S")
+        doc_id = f"user_{user_id}_{today}"
+        s3_key = f"recommendations/user_{user_id}/product_{today}.json"
+        experiment_id = 2
+        run_id = f"run_id_{today}"
+
+        recommendation_data = {
+            "user_id": user_id,
+            "recommendations": rec_result,
+            "experiment_id": experiment_id,
+            "run_id": run_id
+        }
+        return doc_id, s3_key, recommendation_data
+
     @staticmethod
     def to_core_data(doc_id: str, recommendation_data: dict) -> dict:
         """S3 데이터를 OpenSearch 형식으로 변환"""
@@ -0,0 +1,69 @@
+"""
+CategoryPoolBuilder pool 생성 시간 벤치마크
+
+기존 방식(카테고리별 str.contains + apply)과 전체 카탈로그 점수 1회 계산 방식의
+처음 생성(cold), 디스크 캐시 사용, 메모리 캐시 사용 시 소요 시간과 결과 일치 여부를 출력한다.
+
+    PYTHONPATH=. python test/benchmark/bench_category_pool.py --products 200000
+"""
+import argparse
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+from product.feature.single_household_score import SingleHouseHoldScoreCalculator
+from product.processor.category_pool import CategoryPoolBuilder
+
+CATEGORIES = ['신선식품', '가공식품', '주방용품', '생활용품', '기타']
+NAME_WORDS = ['미니', '혼밥', '소포장', '즉석', '간편', '실리콘', '밀키트', '대용량', '프리미엄', '']
+
+def make_products(n_products: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    words = np.array(NAME_WORDS, dtype=object)
+    names = rng.choice(words, size=n_products) + " " + rng.choice(words, size=n_products) + \
+        " 상품" + np.arange(n_products).astype(str).astype(object)
+    return pd.DataFrame({
+        'product_id': np.arange(n_products) + 1,
+        'name': names,
+        'price': rng.integers(500, 60000, size=n_products),
+        'large_category': rng.choice(CATEGORIES, size=n_products, p=[0.25, 0.3, 0.2, 0.2, 0.05]),
+    })
+
+def legacy_build(products_df: pd.DataFrame) -> dict:
+    """기존 CategoryPoolBuilder.build"""
+    category_pools = {}
+    for category in CategoryPoolBuilder.TARGET_CATEGORIES:
+        cat_products = products_df[products_df['large_category'].str.contains(category, na=False)].copy()
+        if not cat_products.empty:
+            cat_products['flexible_single_score'] = cat_products.apply(SingleHouseHoldScoreCalculator.calculate, axis=1)
+            threshold = cat_products['flexible_single_score'].quantile(0.3)
+            qualified = cat_products[cat_products['flexible_single_score'] >= threshold]
+            category_pools[category] = qualified.sample(n=min(len(qualified), 80), random_state=42).reset_index(drop=True)
+    return category_pools
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def run(n_products: int):
+    products_df = make_products(n_products)
+    expected, legacy_time = timed(lambda: legacy_build(products_df))
+    print(f"상품 {n_products}개")
+    print(f"{'mode':<16}{'time(s)':>10}{'match':>8}")
+    print(f"{'legacy':<16}{legacy_time:>10.3f}{'-':>8}")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for mode in ('cold', 'disk_cache', 'memory_cache'):
+            if mode != 'memory_cache':
+                CategoryPoolBuilder._score_cache = {}
+            pools, elapsed = timed(lambda: CategoryPoolBuilder.build(products_df, cache_dir=cache_dir))
+            match = pools.keys() == expected.keys() and all(pools[c].equals(expected[c]) for c in expected)
+            print(f"{mode:<16}{elapsed:>10.3f}{str(match):>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=200_000)
+    args = parser.parse_args()
+    run(args.products)
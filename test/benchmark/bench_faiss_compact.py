@@ -0,0 +1,80 @@
+"""
+FAISS compact 모드(차원 축소 + float16/8bit 저장) 메모리 절감 / recall 손실 벤치마크
+
+float32 원본 차원 flat 인덱스를 기준으로 각 compact 설정의 인덱스 크기, 절감률,
+recall@k, 배치 검색 시간을 출력한다. SBERT 임베딩처럼 앞쪽 주성분에 분산이 몰린
+합성 임베딩을 사용한다.
+
+    PYTHONPATH=. python test/benchmark/bench_faiss_compact.py --n 100000 --k 10
+"""
+import argparse
+import time
+import numpy as np
+
+from product.embedding.faiss_manager import FAISSIndexManager
+
+# (이름, index_type, index_params)
+CONFIGS = [
+    ('flat fp16', 'flat', {'storage': 'fp16'}),
+    ('flat sq8', 'flat', {'storage': 'sq8'}),
+    ('pca384 fp32', 'flat', {'reduce_dim': 384}),
+    ('pca384 fp16', 'flat', {'reduce_dim': 384, 'storage': 'fp16'}),
+    ('pca256 fp16', 'flat', {'reduce_dim': 256, 'storage': 'fp16'}),
+    ('pca256 sq8', 'flat', {'reduce_dim': 256, 'storage': 'sq8'}),
+    ('pca128 sq8', 'flat', {'reduce_dim': 128, 'storage': 'sq8'}),
+    ('trunc384 fp16', 'flat', {'reduce_dim': 384, 'reduce_method': 'truncate', 'storage': 'fp16'}),
+    ('hnsw fp16', 'hnsw', {'storage': 'fp16'}),
+    ('hnsw pca256 sq8', 'hnsw', {'reduce_dim': 256, 'storage': 'sq8'}),
+]
+
+def make_embeddings(n: int, dim: int, n_clusters: int = 200, seed: int = 42) -> np.ndarray:
+    """카테고리별로 뭉쳐 있고, 차원별 분산이 점점 작아지는 합성 임베딩 생성"""
+    rng = np.random.default_rng(seed)
+    spectrum = (1.0 / np.sqrt(1 + np.arange(dim) / 16)).astype(np.float32)
+    rotation, _ = np.linalg.qr(np.random.default_rng(0).normal(size=(dim, dim)))
+    centers = rng.normal(size=(n_clusters, dim)).astype(np.float32) * spectrum
+    labels = rng.integers(0, n_clusters, size=n)
+    x = centers[labels] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32) * spectrum
+    x = x @ rotation.astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+def recall_at_k(result: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(r) & set(t)) for r, t in zip(result, truth))
+    return hits / truth.size
+
+def run(n: int, dim: int, n_queries: int, k: int):
+    embeddings = make_embeddings(n, dim)
+    queries = make_embeddings(n_queries, dim, seed=7)
+    product_ids = np.arange(n)
+
+    # float32 원본 차원 정확 검색을 기준으로 사용
+    full = FAISSIndexManager('flat')
+    full.build_index(embeddings, product_ids=product_ids)
+    _, truth = full.search_batch(queries, k)
+    full_bytes = full.memory_bytes()
+
+    print(f"상품 {n}개, 차원 {dim}, 쿼리 {n_queries}개, k={k}")
+    print(f"기준 flat float32: {full_bytes / 2**20:.1f}MB")
+    print(f"{'index':<18}{'size(MB)':>10}{'saved':>8}{'recall@k':>10}{'build(s)':>10}{'search(ms)':>12}")
+    for name, index_type, params in CONFIGS:
+        manager = FAISSIndexManager(index_type, params)
+        start = time.perf_counter()
+        manager.build_index(embeddings, product_ids=product_ids)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, labels = manager.search_batch(queries, k)
+        search_time = (time.perf_counter() - start) * 1000
+
+        size = manager.memory_bytes()
+        print(f"{name:<18}{size / 2**20:>10.1f}{1 - size / full_bytes:>8.1%}"
+              f"{recall_at_k(labels, truth):>10.3f}{build_time:>10.2f}{search_time:>12.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FAISS compact 모드 메모리/recall 벤치마크")
+    parser.add_argument('--n', type=int, default=50000, help="상품(벡터) 수")
+    parser.add_argument('--dim', type=int, default=768, help="임베딩 차원 (ko-sroberta: 768)")
+    parser.add_argument('--queries', type=int, default=500, help="쿼리 수")
+    parser.add_argument('--k', type=int, default=10, help="recall@k의 k")
+    args = parser.parse_args()
+    run(args.n, args.dim, args.queries, args.k)
@@ -0,0 +1,75 @@
+"""
+FAISS 인덱스 타입별 recall@k / 검색 지연시간 벤치마크
+
+합성 임베딩(클러스터 구조를 가진 L2 정규화 벡터)으로 각 인덱스를 구축하고
+정확 검색(flat) 결과 대비 recall@k와 단일 쿼리 p50/p99 지연시간을 출력한다.
+
+    PYTHONPATH=. python test/benchmark/bench_faiss_index.py --n 100000 --k 10
+"""
+import argparse
+import time
+import numpy as np
+
+from product.embedding.faiss_manager import FAISSIndexManager
+
+# (이름, index_type, index_params)
+CONFIGS = [
+    ('flat', 'flat', {}),
+    ('hnsw ef=32', 'hnsw', {'ef_search': 32}),
+    ('hnsw ef=64', 'hnsw', {'ef_search': 64}),
+    ('hnsw ef=128', 'hnsw', {'ef_search': 128}),
+    ('ivf_flat nprobe=4', 'ivf_flat', {'nprobe': 4}),
+    ('ivf_flat nprobe=16', 'ivf_flat', {'nprobe': 16}),
+    ('ivf_flat nprobe=64', 'ivf_flat', {'nprobe': 64}),
+    ('ivf_pq nprobe=16', 'ivf_pq', {'nprobe': 16}),
+    ('ivf_pq nprobe=64', 'ivf_pq', {'nprobe': 64}),
+]
+
+def make_embeddings(n: int, dim: int, n_clusters: int = 200, seed: int = 42) -> np.ndarray:
+    """SBERT 상품 임베딩처럼 카테고리별로 뭉쳐 있는 합성 임베딩 생성"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, size=n)
+    x = centers[labels] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+def recall_at_k(result: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(r) & set(t)) for r, t in zip(result, truth))
+    return hits / truth.size
+
+def run(n: int, dim: int, n_queries: int, k: int):
+    embeddings = make_embeddings(n, dim)
+    queries = make_embeddings(n_queries, dim, seed=7)
+
+    # 정확 검색 결과를 정답으로 사용
+    flat = FAISSIndexManager('flat')
+    flat.build_index(embeddings)
+    truth = np.stack([flat.search(q, k)[1] for q in queries])
+
+    print(f"상품 {n}개, 차원 {dim}, 쿼리 {n_queries}개, k={k}")
+    print(f"{'index':<22}{'build(s)':>10}{'recall@k':>10}{'p50(ms)':>10}{'p99(ms)':>10}")
+    for name, index_type, params in CONFIGS:
+        manager = FAISSIndexManager(index_type, params)
+        start = time.perf_counter()
+        manager.build_index(embeddings)
+        build_time = time.perf_counter() - start
+
+        latencies, results = [], []
+        for q in queries:
+            start = time.perf_counter()
+            _, indices = manager.search(q, k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            results.append(indices)
+
+        p50, p99 = np.percentile(latencies, [50, 99])
+        recall = recall_at_k(np.stack(results), truth)
+        print(f"{name:<22}{build_time:>10.2f}{recall:>10.3f}{p50:>10.3f}{p99:>10.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FAISS 인덱스 타입별 recall/지연시간 벤치마크")
+    parser.add_argument('--n', type=int, default=50000, help="상품(벡터) 수")
+    parser.add_argument('--dim', type=int, default=768, help="임베딩 차원 (ko-sroberta: 768)")
+    parser.add_argument('--queries', type=int, default=500, help="쿼리 수")
+    parser.add_argument('--k', type=int, default=10, help="recall@k의 k")
+    args = parser.parse_args()
+    run(args.n, args.dim, args.queries, args.k)
@@ -0,0 +1,75 @@
+"""
+1인가구 키워드 점수 계산 벤치마크 - 기존 행 단위 apply vs 열 단위(KeywordMatcher) 계산
+
+합성 상품명/가격/카테고리로 ProductSingleScoreProcessor.calc_score와
+SingleHouseHoldScoreCalculator 점수를 두 방식으로 계산해서 소요 시간과 결과 일치 여부를 출력한다.
+
+    PYTHONPATH=. python test/benchmark/bench_keyword_score.py --rows 1000000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from product.feature.single_household_score import SingleHouseHoldScoreCalculator
+from product.processor.product_score_processor import ProductSingleScoreProcessor
+
+CATEGORIES = ['신선식품', '가공식품', '주방용품', '생활용품', '기타']
+NAME_WORDS = ['미니', '혼밥', '소포장', '개별포장', '1인분', '즉석', '간편', '실리콘', '밀키트', '소량',
+              '휴대용', '대용량', '프리미엄', '가정용', '', '']
+
+def make_products(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    words = np.array(NAME_WORDS, dtype=object)
+    first, second = rng.choice(words, size=n_rows), rng.choice(words, size=n_rows)
+    names = first + " " + second + " 상품" + np.arange(n_rows).astype(str).astype(object)
+    return pd.DataFrame({
+        'name': names,
+        'price': rng.integers(500, 60000, size=n_rows),
+        'large_category': rng.choice(CATEGORIES, size=n_rows),
+    })
+
+def legacy_calc_score(products_df: pd.DataFrame) -> pd.Series:
+    """기존 ProductSingleScoreProcessor.calc_score의 행 단위 계산"""
+    def score(row):
+        name = str(row.get('name', '')).lower()
+        price = float(row.get('price', 0))
+        s = 0
+        for kw in ProductSingleScoreProcessor.PRIMARY_KEYWORDS:
+            if kw in name:
+                s += 3
+        for kw in ProductSingleScoreProcessor.SECONDARY_KEYWORDS:
+            if kw in name:
+                s += 1.5
+        if price < 10000:
+            s += 1
+        elif price < 30000:
+            s += 0.5
+        return min(s, 10)
+    return products_df.apply(score, axis=1)
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def run(n_rows: int):
+    products_df = make_products(n_rows)
+    print(f"상품 {n_rows}개")
+    print(f"{'score':<28}{'apply(s)':>10}{'vectorized(s)':>15}{'speedup':>10}{'match':>8}")
+
+    legacy, legacy_time = timed(lambda: legacy_calc_score(products_df))
+    result, fast_time = timed(lambda: ProductSingleScoreProcessor.calc_score(products_df)['single_household_score'])
+    match = result.dtype == legacy.dtype and result.equals(legacy)
+    print(f"{'single_household_score':<28}{legacy_time:>10.2f}{fast_time:>15.2f}{legacy_time / fast_time:>9.1f}x{str(match):>8}")
+
+    legacy, legacy_time = timed(lambda: products_df.apply(SingleHouseHoldScoreCalculator.calculate, axis=1))
+    result, fast_time = timed(lambda: SingleHouseHoldScoreCalculator.calculate_batch(products_df))
+    match = result.equals(legacy)
+    print(f"{'flexible_single_score':<28}{legacy_time:>10.2f}{fast_time:>15.2f}{legacy_time / fast_time:>9.1f}x{str(match):>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.rows)
@@ -0,0 +1,125 @@
+"""
+사용자 활동 로그 로드 벤치마크 - 기존 전체 로드(json.loads) vs 스트리밍 파싱(ActivityLogReader)
+
+합성 JSON 배열 로그 파일(기본 2GB)을 임시 디렉토리에 만들고, 방식별로 별도 프로세스에서
+처리 시간, 처리량(MB/s), 최대 메모리(peak RSS)를 출력한다. 두 방식을 모두 실행하면 결과 일치 여부도 확인한다.
+기존 방식은 파일 크기의 수 배 메모리가 필요하므로 --legacy-max-mb 이하 파일에서만 실행한다.
+
+    PYTHONPATH=. python test/benchmark/bench_log_stream.py --size-mb 2048
+    PYTHONPATH=. python test/benchmark/bench_log_stream.py --size-mb 256 --legacy-max-mb 512
+"""
+import os
+import json
+import time
+import argparse
+import resource
+import tempfile
+import multiprocessing as mp
+import numpy as np
+import pandas as pd
+
+from config.product_config import LOG_STREAM_CHUNK_BYTES
+from product.processor.activity_log_reader import ActivityLogReader
+
+KEYWORDS = ['미니 냄비', '혼밥', '밀키트', '소포장 쌀', '1인용 프라이팬', '간편식']
+CATEGORIES = ['신선식품 > 과일', '가공식품 > 즉석식품', '주방용품 > 조리도구', '생활용품 > 세제']
+
+def write_logs(path: str, size_mb: int, seed: int = 42) -> int:
+    """size_mb 크기의 합성 로그 JSON 배열 파일 생성 (message는 S3 로그처럼 JSON 문자열)"""
+    rng = np.random.default_rng(seed)
+    target = size_mb << 20
+    written, records = 0, 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[\n')
+        while written < target:
+            lines = []
+            for user_id, kind, value in zip(rng.integers(1, 100_000, 10_000), rng.integers(0, 2, 10_000), rng.integers(0, 50_000, 10_000)):
+                if kind == 0:
+                    msg = {'event_type': 'search', 'user_id': int(user_id), 'search_keyword': KEYWORDS[value % len(KEYWORDS)],
+                           'searched_at': '2025-08-01T10:00:00', 'search_result_count': int(value % 100)}
+                else:
+                    msg = {'event_type': 'click', 'user_id': int(user_id), 'item_id': int(value), 'item_name': f"상품{value}",
+                           'clicked_at': '2025-08-01T10:00:01', 'item_category': CATEGORIES[value % len(CATEGORIES)],
+                           'item_price': int(value) * 10}
+                lines.append(json.dumps({'message': json.dumps(msg, ensure_ascii=False), 'level': 'INFO'}, ensure_ascii=False))
+            block = ('' if records == 0 else ',\n') + ',\n'.join(lines)
+            f.write(block)
+            written += len(block.encode('utf-8'))
+            records += len(lines)
+        f.write('\n]\n')
+    return records
+
+def file_chunks(path: str, chunk_size: int = LOG_STREAM_CHUNK_BYTES):
+    with open(path, 'rb') as f:
+        yield from iter(lambda: f.read(chunk_size), b'')
+
+def legacy_load(path: str):
+    """기존 load_log_data: 전체 다운로드 → json.loads → 이벤트 분리 → 정제"""
+    with open(path, 'rb') as f:
+        logs = json.loads(f.read().decode('utf-8'))
+    search, click = [], []
+    for log in logs:
+        msg = log.get('message', {})
+        if isinstance(msg, str):
+            try:
+                msg = json.loads(msg)
+            except Exception:
+                continue
+        if not isinstance(msg, dict):
+            continue
+        if msg.get('event_type') == 'search':
+            search.append(msg)
+        elif msg.get('event_type') == 'click':
+            click.append(msg)
+    search_rows = [{'user_id': int(log['user_id']), 'keyword': str(log['search_keyword']).strip(),
+                    'searched_at': log.get('searched_at', ''), 'search_result_count': int(log.get('search_result_count', 0))}
+                   for log in search]
+    click_rows = [{'user_id': int(log['user_id']), 'product_id': int(log['item_id']), 'item_name': str(log.get('item_name', '')),
+                   'clicked_at': log.get('clicked_at', ''), 'item_category': str(log.get('item_category', '')),
+                   'item_price': int(log.get('item_price', 0))} for log in click]
+    return pd.DataFrame(search_rows), pd.DataFrame(click_rows)
+
+def run_mode(mode: str, path: str, result_dir: str, queue):
+    start = time.perf_counter()
+    if mode == 'stream':
+        search_df, click_df = ActivityLogReader().read(file_chunks(path))
+    else:
+        search_df, click_df = legacy_load(path)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    search_df.to_pickle(os.path.join(result_dir, f"{mode}_search.pkl"))
+    click_df.to_pickle(os.path.join(result_dir, f"{mode}_click.pkl"))
+    queue.put((mode, elapsed, peak_mb, len(search_df), len(click_df)))
+
+def run(size_mb: int, legacy_max_mb: int):
+    ctx = mp.get_context('fork')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'user_activity_logs.json')
+        start = time.perf_counter()
+        records = write_logs(path, size_mb)
+        file_mb = os.path.getsize(path) / (1 << 20)
+        print(f"합성 로그 {records}건, {file_mb:.0f}MB 생성 ({time.perf_counter() - start:.1f}초)")
+
+        modes = ['stream'] + (['legacy'] if size_mb <= legacy_max_mb else [])
+        print(f"{'mode':<10}{'time(s)':>10}{'MB/s':>10}{'peak RSS(MB)':>15}{'search':>12}{'click':>12}")
+        for mode in modes:
+            queue = ctx.Queue()
+            process = ctx.Process(target=run_mode, args=(mode, path, tmp_dir, queue))
+            process.start()
+            mode, elapsed, peak_mb, n_search, n_click = queue.get()
+            process.join()
+            print(f"{mode:<10}{elapsed:>10.1f}{file_mb / elapsed:>10.1f}{peak_mb:>15.0f}{n_search:>12}{n_click:>12}")
+
+        if 'legacy' in modes:
+            match = all(
+                pd.read_pickle(os.path.join(tmp_dir, f"stream_{name}.pkl")).equals(pd.read_pickle(os.path.join(tmp_dir, f"legacy_{name}.pkl")))
+                for name in ('search', 'click')
+            )
+            print(f"결과 일치: {match}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--legacy-max-mb", type=int, default=512, help="기존 방식을 실행할 최대 파일 크기")
+    args = parser.parse_args()
+    run(args.size_mb, args.legacy_max_mb)
@@ -0,0 +1,74 @@
+"""
+SBERT 인코더 backend별 처리량/지연시간 및 torch 대비 cosine 일치도 벤치마크
+
+- 처리량: 상품 카탈로그 인코딩처럼 batch_size=32로 인코딩할 때 초당 문장 수
+- 지연시간: 신규 사용자 요청처럼 쿼리 1개를 인코딩할 때 p50/p99
+- 일치도: torch backend 임베딩과의 cosine 유사도 (평균/최소)
+
+    PYTHONPATH=. python test/benchmark/bench_onnx_encoder.py --n 2000
+"""
+import argparse
+import time
+import numpy as np
+from sklearn.preprocessing import normalize
+
+from config.product_config import EMBEDDING_MODEL_NAME
+from product.embedding.embedding_generator import EmbeddingGenerator
+
+NAMES = ['미니 밥솥', '혼밥 도시락', '소포장 사과', '1인용 냄비', '즉석 카레', '컴팩트 가습기', '개별포장 견과', '실리콘 주걱']
+CATEGORIES = ['가공식품 즉석식품 카레', '신선식품 과일 사과', '주방용품 조리도구 냄비', '생활용품 가전 가습기']
+
+def make_texts(n: int, seed: int = 42) -> list:
+    """상품명 + 카테고리 텍스트 형태의 합성 문장 생성"""
+    rng = np.random.default_rng(seed)
+    return [
+        f"{rng.choice(NAMES)} {rng.integers(1, 1000)}g {rng.choice(CATEGORIES)}"
+        for _ in range(n)
+    ]
+
+def measure(generator: EmbeddingGenerator, texts: list, n_single: int) -> dict:
+    # 워밍업
+    generator.model.encode(texts[:32], batch_size=32)
+
+    start = time.perf_counter()
+    embeddings = generator.model.encode(texts, batch_size=32)
+    throughput = len(texts) / (time.perf_counter() - start)
+
+    latencies = []
+    for text in texts[:n_single]:
+        start = time.perf_counter()
+        generator.model.encode([text])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return {
+        'embeddings': normalize(np.asarray(embeddings), norm='l2', axis=1),
+        'throughput': throughput,
+        'p50': p50,
+        'p99': p99,
+    }
+
+def run(n: int, n_single: int):
+    texts = make_texts(n)
+    backends = [
+        ('torch', EmbeddingGenerator(EMBEDDING_MODEL_NAME, backend='torch')),
+        ('onnx fp32', EmbeddingGenerator(EMBEDDING_MODEL_NAME, backend='onnx', quantize=False)),
+        ('onnx int8', EmbeddingGenerator(EMBEDDING_MODEL_NAME, backend='onnx', quantize=True)),
+    ]
+
+    results = {name: measure(generator, texts, n_single) for name, generator in backends}
+    reference = results['torch']['embeddings']
+
+    print(f"모델 {EMBEDDING_MODEL_NAME}, 문장 {n}개, 단일 쿼리 {n_single}회")
+    print(f"{'backend':<12}{'texts/s':>10}{'p50(ms)':>10}{'p99(ms)':>10}{'cos mean':>10}{'cos min':>10}")
+    for name, result in results.items():
+        cosine = (result['embeddings'] * reference).sum(axis=1)
+        print(f"{name:<12}{result['throughput']:>10.1f}{result['p50']:>10.2f}{result['p99']:>10.2f}"
+              f"{cosine.mean():>10.4f}{cosine.min():>10.4f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SBERT 인코더 backend 벤치마크")
+    parser.add_argument('--n', type=int, default=2000, help="처리량 측정 문장 수")
+    parser.add_argument('--single', type=int, default=200, help="단일 쿼리 지연시간 측정 횟수")
+    args = parser.parse_args()
+    run(args.n, args.single)
@@ -0,0 +1,129 @@
+"""
+실시간 추천(RealtimeRecommendationService) 동시 요청 지연 시간 벤치마크
+
+합성 상품 카탈로그/사용자로 운영과 같은 경로(RealtimeRecommendationService.build_engine)로 추천 엔진을 만들고,
+동시 요청 스레드 수별로 요청 지연 시간 p50/p90/p99, 처리량, timeout으로 생략된 요청 수를 출력한다.
+
+- --encoder torch/onnx: 실제 EmbeddingGenerator로 상품/사용자 임베딩 생성
+  (운영처럼 build_engine에서 사용자 임베딩을 미리 계산하고, 그 시간을 함께 출력)
+- --encoder none(기본): 인코더 없이 임의 임베딩 사용 - 모델이 없는 환경에서 엔진/lock 지연 시간만 측정
+
+    PYTHONPATH=. python test/benchmark/bench_realtime_recommendation.py --threads 1 4 16 --requests 2000
+    PYTHONPATH=. python test/benchmark/bench_realtime_recommendation.py --encoder torch --products 5000 --users 2000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+from product.core.recommendation_engine import RecommendationEngine
+from product.embedding.embedding_generator import EmbeddingGenerator
+from product.embedding.faiss_manager import FAISSIndexManager
+from product.service.realtime_recommendation_service import RealtimeRecommendationService
+
+CATEGORIES = ['신선식품', '가공식품', '주방용품', '생활용품', '기타']
+NAME_WORDS = ['미니', '혼밥', '소포장', '즉석', '간편', '실리콘', '대용량', '프리미엄', '가정용', '']
+
+class SyntheticPipelineService:
+    """build_engine에 합성 상품/사용자 프로필을 돌려주는 pipeline service"""
+    def __init__(self, products_df, user_profiles):
+        self.products_df = products_df
+        self.user_profiles = user_profiles
+
+    def category_score_pipeline(self):
+        return self.products_df
+
+    def user_profile_pipeline(self, scored_df):
+        return self.user_profiles
+
+def make_catalog(n_products: int, n_users: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    categories = rng.choice(CATEGORIES, size=n_products, p=[0.25, 0.3, 0.2, 0.2, 0.05])
+    products_df = pd.DataFrame({
+        'id': np.arange(n_products) + 1,
+        'product_id': np.arange(n_products) + 1,
+        'name': [f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)} 상품{i}" for i in range(n_products)],
+        'price': rng.integers(500, 60000, size=n_products),
+        'large_category': categories,
+        'category_path': [f"{c} > 기타 > 기타" for c in categories],
+    })
+    user_profiles = {
+        user_id: {
+            'user_id': user_id,
+            'base_interest_category': str(rng.choice(CATEGORIES[:4])),
+            'favorite_product_ids': rng.integers(1, n_products + 1, size=3).tolist(),
+            'search_keywords': [str(rng.choice(NAME_WORDS[:6]))],
+            'clicked_categories': [str(rng.choice(CATEGORIES[:4]))],
+        }
+        for user_id in range(1, n_users + 1)
+    }
+    return products_df, user_profiles
+
+def make_engine(service: RealtimeRecommendationService, n_products: int, n_users: int, dim: int, seed: int = 42) -> RecommendationEngine:
+    """service.embedding_generator가 있으면 실제 인코더로, 없으면 임의 임베딩으로 엔진 생성"""
+    products_df, user_profiles = make_catalog(n_products, n_users, seed)
+    service.pipeline_service = SyntheticPipelineService(products_df, user_profiles)
+    if service.embedding_generator is not None:
+        embeddings = service.embedding_generator.encode_texts(service.embedding_generator.build_product_texts(products_df))
+    else:
+        embeddings = np.random.default_rng(seed).normal(size=(n_products, dim)).astype(np.float32)
+    product_ids = products_df['product_id'].to_numpy()
+    faiss_manager = FAISSIndexManager('flat')
+    faiss_manager.build_index(embeddings, product_ids=product_ids)
+    faiss_manager.build_category_indexes(embeddings, product_ids, products_df['large_category'].to_numpy())
+
+    # 운영 warm-up/교체와 같은 경로 (인코더가 있으면 사용자 임베딩을 여기서 미리 계산)
+    start = time.perf_counter()
+    engine = service.build_engine(faiss_manager)
+    if service.embedding_generator is not None:
+        print(f"엔진 생성 {time.perf_counter() - start:.2f}초 (사용자 임베딩 사전 계산 포함)")
+    else:
+        engine.set_user_embeddings(
+            np.random.default_rng(seed + 1).normal(size=(n_users, dim)).astype(np.float32),
+            {user_id: user_id - 1 for user_id in user_profiles}
+        )
+    return engine
+
+def run(n_products: int, n_users: int, dim: int, threads_list, n_requests: int, timeout_ms: float, encoder: str):
+    service = RealtimeRecommendationService(enabled=True, timeout_ms=timeout_ms, save_results=False, cache_dir=None)
+    if encoder != 'none':
+        service.embedding_generator = EmbeddingGenerator(backend=encoder)
+    service.set_engine(make_engine(service, n_products, n_users, dim))
+    user_ids = np.random.default_rng(0).integers(1, n_users + 1, size=n_requests).tolist()
+
+    def request(user_id):
+        start = time.perf_counter()
+        result = service.recommend(user_id)
+        return (time.perf_counter() - start) * 1000, result is not None
+
+    # warm-up 요청 (lazy 초기화/캐시 제외)
+    for user_id in user_ids[:50]:
+        service.recommend(user_id)
+
+    print(f"상품 {n_products}개, 사용자 {n_users}명, 요청 {n_requests}개, timeout {timeout_ms}ms, 인코더 {encoder}")
+    print(f"{'threads':<9}{'p50(ms)':>9}{'p90(ms)':>9}{'p99(ms)':>9}{'max(ms)':>9}{'req/s':>9}{'served':>8}{'skipped':>9}")
+    for threads in threads_list:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(request, user_ids))
+        elapsed = time.perf_counter() - start
+
+        latencies = np.array([latency for latency, _ in results])
+        served = sum(ok for _, ok in results)
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        print(f"{threads:<9}{p50:>9.2f}{p90:>9.2f}{p99:>9.2f}{latencies.max():>9.2f}"
+              f"{n_requests / elapsed:>9.0f}{served:>8}{n_requests - served:>9}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="실시간 추천 동시 요청 지연 시간 벤치마크")
+    parser.add_argument('--products', type=int, default=20000, help="상품 수")
+    parser.add_argument('--users', type=int, default=5000, help="사용자 수")
+    parser.add_argument('--dim', type=int, default=64, help="임베딩 차원")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 16], help="동시 요청 스레드 수")
+    parser.add_argument('--requests', type=int, default=2000, help="스레드 수별 요청 수")
+    parser.add_argument('--timeout-ms', type=float, default=200, help="요청당 엔진 대기 시간 한도")
+    parser.add_argument('--encoder', choices=['none', 'torch', 'onnx'], default='none',
+                        help="임베딩 인코더 backend (none이면 임의 임베딩)")
+    args = parser.parse_args()
+    run(args.products, args.users, args.dim, args.threads, args.requests, args.timeout_ms, args.encoder)
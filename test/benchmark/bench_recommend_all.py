@@ -0,0 +1,92 @@
+"""
+RecommendationEngine 사용자별 추천(recommend) vs 배치 추천(recommend_all) 처리량 벤치마크
+
+합성 상품 카탈로그/임베딩/사용자 프로필로 같은 조건의 엔진 두 개를 만들고,
+추천을 여러 회차 반복해서(이전 추천 히스토리 반영) 초당 사용자 수와 결과 일치 여부를 출력한다.
+
+    PYTHONPATH=. python test/benchmark/bench_recommend_all.py --products 20000 --users 5000
+"""
+import argparse
+import json
+import time
+import numpy as np
+import pandas as pd
+
+from product.core.recommendation_engine import RecommendationEngine
+from product.embedding.faiss_manager import FAISSIndexManager
+
+CATEGORIES = ['신선식품', '가공식품', '주방용품', '생활용품', '기타']
+NAME_WORDS = ['미니', '혼밥', '소포장', '즉석', '간편', '실리콘', '대용량', '프리미엄', '가정용', '']
+
+def make_catalog(n_products: int, dim: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    categories = rng.choice(CATEGORIES, size=n_products, p=[0.25, 0.3, 0.2, 0.2, 0.05])
+    names = [f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)} 상품{i}" for i in range(n_products)]
+    products_df = pd.DataFrame({
+        'id': np.arange(n_products) + 1,
+        'product_id': np.arange(n_products) + 1,
+        'name': names,
+        'price': rng.integers(500, 60000, size=n_products),
+        'large_category': categories,
+        'category_path': [f"{c} > 기타 > 기타" for c in categories],
+    })
+    embeddings = rng.normal(size=(n_products, dim)).astype(np.float32)
+    return products_df, embeddings
+
+def make_users(n_users: int, n_products: int, dim: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    user_profiles = {}
+    for user_id in range(1, n_users + 1):
+        user_profiles[user_id] = {
+            'user_id': user_id,
+            'base_interest_category': str(rng.choice(CATEGORIES[:4])),
+            'favorite_product_ids': rng.integers(1, n_products + 1, size=3).tolist(),
+            'search_keywords': [str(rng.choice(NAME_WORDS[:6]))],
+            'clicked_categories': [str(rng.choice(CATEGORIES[:4]))],
+        }
+    user_embeddings = rng.normal(size=(n_users, dim)).astype(np.float32)
+    rows = {user_id: user_id - 1 for user_id in user_profiles}
+    return user_profiles, user_embeddings, rows
+
+def make_engine(products_df, embeddings, user_profiles, user_embeddings, rows) -> RecommendationEngine:
+    product_ids = products_df['product_id'].to_numpy()
+    faiss_manager = FAISSIndexManager('flat')
+    faiss_manager.build_index(embeddings, product_ids=product_ids)
+    faiss_manager.build_category_indexes(embeddings, product_ids, products_df['large_category'])
+    engine = RecommendationEngine(products_df, faiss_manager, None, user_profiles, cache_dir=None)
+    engine.set_user_embeddings(user_embeddings, rows)
+    return engine
+
+def run(n_products: int, n_users: int, dim: int, rounds: int, top_k: int):
+    products_df, embeddings = make_catalog(n_products, dim)
+    user_profiles, user_embeddings, rows = make_users(n_users, n_products, dim)
+    user_ids = list(user_profiles)
+
+    single_engine = make_engine(products_df, embeddings, user_profiles, user_embeddings, rows)
+    batch_engine = make_engine(products_df, embeddings, user_profiles, user_embeddings, rows)
+
+    print(f"상품 {n_products}개, 사용자 {n_users}명, 회차 {rounds}, top_k={top_k}")
+    print(f"{'round':<8}{'recommend(users/s)':>20}{'recommend_all(users/s)':>24}{'speedup':>10}{'match':>8}")
+    for round_no in range(1, rounds + 1):
+        start = time.perf_counter()
+        single = {u: single_engine.recommend(u, top_k).to_dict(orient='records') for u in user_ids}
+        single_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = batch_engine.recommend_all(user_ids, top_k)
+        batch_time = time.perf_counter() - start
+
+        # 저장 payload(JSON) 기준으로 비교 - 값뿐 아니라 int/float 타입까지 같아야 함
+        match = all(json.dumps(single[u], ensure_ascii=False) == json.dumps(batch[u], ensure_ascii=False) for u in user_ids)
+        print(f"{round_no:<8}{n_users / single_time:>20.1f}{n_users / batch_time:>24.1f}"
+              f"{single_time / batch_time:>9.1f}x{str(match):>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="recommend vs recommend_all 처리량 벤치마크")
+    parser.add_argument('--products', type=int, default=20000, help="상품 수")
+    parser.add_argument('--users', type=int, default=2000, help="사용자 수")
+    parser.add_argument('--dim', type=int, default=64, help="임베딩 차원")
+    parser.add_argument('--rounds', type=int, default=3, help="반복 회차 (이전 추천 히스토리 반영)")
+    parser.add_argument('--top-k', type=int, default=4, help="사용자별 추천 개수")
+    args = parser.parse_args()
+    run(args.products, args.users, args.dim, args.rounds, args.top_k)
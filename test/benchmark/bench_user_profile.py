@@ -0,0 +1,103 @@
+"""
+UserProfiler.create_user_profiles 벤치마크 - 기존 사용자별 로그 필터링 vs 로그 1회 그룹화
+
+합성 사용자/검색/클릭/찜 로그로 두 방식의 프로필 생성 시간과 결과 일치 여부를 출력한다.
+기존 방식은 사용자 수 × 로그 행 수에 비례하므로 --legacy-users명만 실행해서 전체 시간을 추정한다.
+
+    PYTHONPATH=. python test/benchmark/bench_user_profile.py --users 100000 --logs 2000000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from product.feature.user_profile import UserProfiler
+
+CATEGORIES = ['신선식품', '가공식품', '주방용품', '생활용품', '기타']
+KEYWORDS = ['미니 냄비', '혼밥', '밀키트', '소포장 쌀', '1인용 프라이팬', '간편식']
+
+def make_data(n_users: int, n_products: int, n_logs: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    products = pd.DataFrame({
+        'product_id': np.arange(n_products) + 1,
+        'large_category': rng.choice(CATEGORIES, size=n_products),
+    })
+    users = pd.DataFrame({
+        'user_id': np.arange(n_users) + 1,
+        'interest_category': rng.choice(CATEGORIES[:4], size=n_users),
+        'birth': rng.choice(['1990-01-01', '2001-05-05', '1980-12-12'], size=n_users),
+        'gender': rng.choice(['M', 'F'], size=n_users),
+    })
+    click_ids = rng.integers(1, n_products + 1, size=n_logs)
+    search_logs = pd.DataFrame({
+        'user_id': rng.integers(1, n_users + 1, size=n_logs),
+        'keyword': rng.choice(KEYWORDS, size=n_logs),
+    })
+    click_logs = pd.DataFrame({
+        'user_id': rng.integers(1, n_users + 1, size=n_logs),
+        'product_id': click_ids,
+        'item_category': [f"{c} > 기타 > 기타" for c in products['large_category'].to_numpy()[click_ids - 1]],
+    })
+    favorite_products = pd.DataFrame({
+        'user_id': rng.integers(1, n_users + 1, size=n_logs // 4),
+        'product_id': rng.integers(1, n_products + 1, size=n_logs // 4),
+    })
+    return products, users, search_logs, click_logs, favorite_products
+
+def legacy_create_user_profiles(profiler: UserProfiler, users_df: pd.DataFrame) -> dict:
+    """기존 UserProfiler.create_user_profiles (사용자마다 전체 로그 필터링)"""
+    profiles = {}
+    for _, user in users_df.iterrows():
+        user_id = user['user_id']
+        age = UserProfiler.calculate_age(user.get('birth', None))
+        user_searches = profiler.filter_by_user(profiler.search_logs, user_id)
+        user_clicks = profiler.filter_by_user(profiler.click_logs, user_id)
+        user_favorites = profiler.filter_by_user(profiler.favorite_products, user_id)
+        search_keywords = user_searches['keyword'].dropna().tolist()[:10]
+        clicked_product_ids = user_clicks['product_id'].dropna().tolist()[:20]
+        favorite_product_ids = user_favorites['product_id'].dropna().astype(int).tolist()[:10]
+        total_actions = len(search_keywords) + len(clicked_product_ids) + len(favorite_product_ids)
+        profiles[user_id] = {
+            'user_id': user_id,
+            'base_interest_category': user.get('interest_category', None),
+            'age_group': UserProfiler.get_age_group(age),
+            'gender': user.get('gender', None),
+            'user_type': profiler.get_user_type(total_actions),
+            'search_keywords': search_keywords,
+            'clicked_product_ids': clicked_product_ids,
+            'favorite_product_ids': favorite_product_ids,
+            'favorite_categories': profiler.extract_categories_from_products(favorite_product_ids),
+            'clicked_categories': profiler.extract_categories_from_clicks(user_clicks),
+            'total_actions': total_actions,
+            'search_count': len(search_keywords),
+            'click_count': len(clicked_product_ids),
+            'favorite_count': len(favorite_product_ids)
+        }
+    return profiles
+
+def run(n_users: int, n_products: int, n_logs: int, legacy_users: int):
+    products, users, search_logs, click_logs, favorite_products = make_data(n_users, n_products, n_logs)
+    profiler = UserProfiler(products, search_logs, click_logs, favorite_products)
+    print(f"사용자 {n_users}명, 상품 {n_products}개, 검색/클릭 로그 각 {n_logs}행, 찜 {n_logs // 4}행")
+
+    start = time.perf_counter()
+    profiles = profiler.create_user_profiles(users)
+    grouped_time = time.perf_counter() - start
+
+    sample_users = users.head(legacy_users)
+    start = time.perf_counter()
+    expected = legacy_create_user_profiles(profiler, sample_users)
+    legacy_time = (time.perf_counter() - start) * n_users / len(sample_users)
+
+    match = all(profiles[user_id] == profile for user_id, profile in expected.items())
+    print(f"{'legacy(추정, s)':<18}{'grouped(s)':>12}{'speedup':>10}{'match':>8}")
+    print(f"{legacy_time:<18.1f}{grouped_time:>12.2f}{legacy_time / grouped_time:>9.0f}x{str(match):>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--logs", type=int, default=2_000_000)
+    parser.add_argument("--legacy-users", type=int, default=200, help="기존 방식으로 실행해볼 사용자 수")
+    args = parser.parse_args()
+    run(args.users, args.products, args.logs, args.legacy_users)
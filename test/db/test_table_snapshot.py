@@ -0,0 +1,97 @@
+import datetime
+import sqlite3
+import tempfile
+import numpy as np
+import pandas as pd
+
+from utils.storage.table_snapshot import TableSnapshotStore
+
+class SQLiteTableManager:
+    """MySQLManager와 같은 read_table/execute_query를 제공하는 SQLite 테스트 DB (datetime 컬럼은 pymysql처럼 datetime으로 반환)"""
+    DATETIME_COLUMNS = ['updated_at']
+
+    def __init__(self):
+        self.conn = sqlite3.connect(':memory:')
+        self.queries = []
+
+    def execute_query(self, query: str, params=None) -> pd.DataFrame:
+        self.queries.append(query)
+        params = [p.isoformat(sep=' ') if isinstance(p, datetime.datetime) else p for p in (params or [])]
+        cursor = self.conn.execute(query.replace('%s', '?'), params)
+        rows = [dict(zip([c[0] for c in cursor.description], row)) for row in cursor.fetchall()]
+        df = pd.DataFrame(rows)
+        for column in self.DATETIME_COLUMNS:
+            if column in df:
+                df[column] = pd.to_datetime(df[column])
+        return df
+
+    def read_table(self, table_name: str) -> pd.DataFrame:
+        return self.execute_query(f"SELECT * FROM {table_name}")
+
+SPECS = {
+    'users': {'primary_key': 'user_id', 'watermark': 'updated_at', 'categoricals': ['gender']},
+    'categories': {'primary_key': 'category_id', 'watermark': None},
+}
+
+def make_db(n_users: int = 500, seed: int = 0) -> SQLiteTableManager:
+    rng = np.random.default_rng(seed)
+    db = SQLiteTableManager()
+    db.conn.execute("CREATE TABLE users (user_id INTEGER PRIMARY KEY, nickname TEXT, gender TEXT, birth TEXT, score REAL, updated_at TEXT)")
+    db.conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?, ?, ?)", [
+        (int(user_id), f"사용자{user_id}", str(rng.choice(['M', 'F'])), '1995-01-01', float(rng.random()),
+         f"2025-08-01 {user_id % 24:02d}:00:00")
+        for user_id in rng.permutation(n_users) + 1
+    ])
+    db.conn.execute("CREATE TABLE categories (category_id INTEGER PRIMARY KEY, large_category TEXT)")
+    db.conn.executemany("INSERT INTO categories VALUES (?, ?)", [(i, f"대분류{i % 5}") for i in range(1, 51)])
+    db.conn.execute("CREATE TABLE group_boards (group_board_id INTEGER, title TEXT)")
+    return db
+
+def expected_table(db: SQLiteTableManager, table_name: str) -> pd.DataFrame:
+    """전체 다시 읽기 결과 (스냅샷과 같은 dtype 변환/정렬)"""
+    spec = SPECS[table_name]
+    df = TableSnapshotStore.compact_dtypes(db.read_table(table_name), spec)
+    return TableSnapshotStore.sort_by_key(df, spec)
+
+def test_table_snapshot_incremental_refresh():
+    db = make_db()
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        store = TableSnapshotStore(db, snapshot_dir=snapshot_dir, specs=SPECS, min_refresh_sec=0)
+
+        users = store.read_table('users')
+        assert store.last_refresh['users']['mode'] == 'full', "처음에는 전체 읽기"
+        assert users['user_id'].dtype == np.int32 and isinstance(users['gender'].dtype, pd.CategoricalDtype), "dtype 변환 오류"
+        pd.testing.assert_frame_equal(users, expected_table(db, 'users'))
+
+        # 변경/추가/삭제 후 증분 갱신 (워터마크 여유 시간 안의 변경도 반영)
+        db.conn.execute("UPDATE users SET nickname = '변경', updated_at = '2025-08-02 00:00:00' WHERE user_id IN (3, 7)")
+        db.conn.execute("UPDATE users SET gender = 'F', updated_at = '2025-08-01 22:58:00' WHERE user_id = 11")
+        db.conn.execute("INSERT INTO users VALUES (9999, '신규', 'X', '2000-01-01', 0.5, '2025-08-02 01:00:00')")
+        db.conn.execute("DELETE FROM users WHERE user_id IN (5, 6)")
+        users = store.read_table('users')
+        assert store.last_refresh['users']['mode'] == 'incremental', "증분 갱신이 아님"
+        assert 'WHERE `updated_at` >= %s' in db.queries[-2], "워터마크 조회 오류"
+        pd.testing.assert_frame_equal(users, expected_table(db, 'users'))
+
+        # primary key 워터마크 (추가만 되는 테이블)
+        store.read_table('categories')
+        db.conn.execute("INSERT INTO categories VALUES (51, '대분류 신규')")
+        categories = store.read_table('categories')
+        assert store.last_refresh['categories'] == {**store.last_refresh['categories'], 'mode': 'incremental', 'changed_rows': 1}
+        pd.testing.assert_frame_equal(categories, expected_table(db, 'categories'))
+
+        # 최근에 갱신된 스냅샷은 DB 조회 없이 사용
+        cached_store = TableSnapshotStore(db, snapshot_dir=snapshot_dir, specs=SPECS, min_refresh_sec=3600)
+        query_count = len(db.queries)
+        pd.testing.assert_frame_equal(cached_store.read_table('users'), users)
+        assert len(db.queries) == query_count and cached_store.last_refresh['users']['mode'] == 'cached', "스냅샷 재사용 오류"
+
+        # 규칙이 바뀌면 전체 다시 읽기, 규칙이 없는 테이블은 DB에서 그대로 읽기
+        changed_specs = {**SPECS, 'users': {'primary_key': 'user_id', 'watermark': 'updated_at'}}
+        changed_store = TableSnapshotStore(db, snapshot_dir=snapshot_dir, specs=changed_specs, min_refresh_sec=0)
+        assert changed_store.read_table('users')['gender'].dtype != 'category' and changed_store.last_refresh['users']['mode'] == 'full'
+        assert store.read_table('group_boards').empty and 'group_boards' not in store.last_refresh
+    print("TableSnapshotStore 테스트 통과")
+
+if __name__ == "__main__":
+    test_table_snapshot_incremental_refresh()
@@ -0,0 +1,115 @@
+import json
+import numpy as np
+import pandas as pd
+
+from product.processor.activity_log_reader import ActivityLogReader
+from utils.storage.json_stream import JsonArrayStream
+
+def chunked(data: bytes, size: int):
+    return (data[start:start + size] for start in range(0, len(data), size))
+
+def make_logs(n: int = 2000, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    logs = []
+    for i in range(n):
+        kind = rng.integers(0, 10)
+        if kind < 4:
+            msg = {'event_type': 'search', 'user_id': str(rng.integers(1, 50)), 'search_keyword': rng.choice(['미니 냄비', ' 혼밥 ', '', '밀키트🍲']),
+                   'searched_at': '2025-08-01T10:00:00', 'search_result_count': int(rng.integers(0, 100))}
+        elif kind < 8:
+            msg = {'event_type': 'click', 'user_id': int(rng.integers(1, 50)), 'item_id': int(rng.integers(1, 500)),
+                   'item_name': '1인용 프라이팬 "특가"', 'clicked_at': '2025-08-01T10:00:01',
+                   'item_category': '주방용품 > 조리도구', 'item_price': rng.choice([12000, 8900.5, '3000'])}
+        elif kind == 8:
+            # 필수 값 누락/변환 실패
+            msg = rng.choice([{'event_type': 'click', 'user_id': 1}, {'event_type': 'search', 'user_id': 'x', 'search_keyword': 'a'},
+                              {'event_type': 'view', 'user_id': 1}])
+        else:
+            msg = rng.choice(['{"event_type": "search", "user_id": 3, "search_keyword": "소포장"}', '{broken', '[1, 2]'])
+        # message는 문자열(JSON) 또는 딕셔너리
+        logs.append({'message': json.dumps(msg, ensure_ascii=False) if rng.random() < 0.5 and isinstance(msg, dict) else msg})
+    logs.append({'no_message': True})
+    return logs
+
+def legacy_read(logs: list):
+    """기존 split_by_event + clean_search_logs + clean_click_logs"""
+    search, click = [], []
+    for log in logs:
+        msg = log.get('message', {})
+        if isinstance(msg, str):
+            try:
+                msg = json.loads(msg)
+            except Exception:
+                continue
+        if not isinstance(msg, dict):
+            continue
+        if msg.get('event_type') == 'search':
+            search.append(msg)
+        elif msg.get('event_type') == 'click':
+            click.append(msg)
+
+    search_rows, click_rows = [], []
+    for log in search:
+        try:
+            keyword = str(log['search_keyword']).strip()
+            if not keyword:
+                continue
+            search_rows.append({'user_id': int(log['user_id']), 'keyword': keyword, 'searched_at': log.get('searched_at', ''),
+                                'search_result_count': int(log.get('search_result_count', 0))})
+        except Exception:
+            continue
+    for log in click:
+        try:
+            click_rows.append({'user_id': int(log['user_id']), 'product_id': int(log['item_id']), 'item_name': str(log.get('item_name', '')),
+                               'clicked_at': log.get('clicked_at', ''), 'item_category': str(log.get('item_category', '')),
+                               'item_price': int(log.get('item_price', 0))})
+        except Exception:
+            continue
+    return pd.DataFrame(search_rows), pd.DataFrame(click_rows)
+
+def test_json_array_stream():
+    data = '[ 1, 23 ,456, "가나다", {"a": [1, {"b": null}]}, -7.5e3, true ]'.encode('utf-8')
+    expected = json.loads(data)
+    for size in (1, 2, 3, 7, len(data)):
+        assert list(JsonArrayStream.iter_items(chunked(data, size))) == expected, f"chunk {size} 파싱 오류"
+    assert list(JsonArrayStream.iter_items([b' [ ] \n'])) == [], "빈 배열 오류"
+
+    for bad in (b'{"a": 1}', b'[1, 2', b'[1 2]', b'[1], 2', b''):
+        try:
+            list(JsonArrayStream.iter_items(chunked(bad, 2)))
+            assert False, f"잘못된 JSON 배열을 통과시킴: {bad!r}"
+        except ValueError:
+            pass
+    print("JsonArrayStream 테스트 통과")
+
+def test_activity_log_reader_matches_legacy():
+    logs = make_logs()
+    data = json.dumps(logs, ensure_ascii=False, indent=1).encode('utf-8')
+    expected_search, expected_click = legacy_read(logs)
+
+    for chunk_size, chunk_rows in ((5, 3), (4096, 100), (len(data), 100_000)):
+        search_df, click_df = ActivityLogReader(chunk_rows=chunk_rows).read(chunked(data, chunk_size))
+        pd.testing.assert_frame_equal(search_df, expected_search)
+        pd.testing.assert_frame_equal(click_df, expected_click)
+
+    # 타임스탬프가 숫자(epoch)인 로그도 기존과 같은 dtype으로 추론 (int64/float64)
+    numeric_logs = [
+        {'message': {'event_type': 'search', 'user_id': 1, 'search_keyword': '미니', 'searched_at': 1754000000 + i,
+                     'search_result_count': 3}} for i in range(5)
+    ] + [
+        {'message': {'event_type': 'click', 'user_id': 2, 'item_id': 7, 'clicked_at': 1754000000.5 + i}} for i in range(5)
+    ]
+    expected_search, expected_click = legacy_read(numeric_logs)
+    search_df, click_df = ActivityLogReader(chunk_rows=2).read([json.dumps(numeric_logs).encode('utf-8')])
+    assert search_df['searched_at'].dtype == np.int64 and click_df['clicked_at'].dtype == np.float64, "숫자 타임스탬프 dtype 오류"
+    pd.testing.assert_frame_equal(search_df, expected_search)
+    pd.testing.assert_frame_equal(click_df, expected_click)
+
+    # 이벤트가 없으면 기존과 같이 컬럼 없는 빈 DataFrame
+    search_df, click_df = ActivityLogReader().read([b'[{"message": {"event_type": "view"}}]'])
+    assert search_df.shape == (0, 0) and click_df.shape == (0, 0), "빈 로그 처리 오류"
+    print("ActivityLogReader 테스트 통과")
+
+if __name__ == "__main__":
+    test_json_array_stream()
+    test_activity_log_reader_matches_legacy()
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from product.feature.behavior_booster import BehaviorBooster
+
+def make_products(n: int = 200, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    words = ['미니', '혼밥', '소포장', '즉석', '실리콘', '대용량', 'Mini']
+    categories = rng.choice(['신선식품', '가공식품', '주방용품', '생활용품', '기타'], size=n)
+    return pd.DataFrame({
+        'product_id': rng.integers(1, n, size=n),  # 중복 product_id 포함
+        'name': [f"{rng.choice(words)} 상품{i}" for i in range(n)],
+        'large_category': categories,
+    })
+
+def test_apply_batch_matches_apply():
+    products_df = make_products()
+    booster = BehaviorBooster(products_df)
+    rng = np.random.default_rng(1)
+
+    profiles = [
+        {},
+        {'favorite_product_ids': [1, 2, 3, 999], 'search_keywords': ['MINI', '혼밥', '즉석'], 'clicked_categories': ['주방용품']},
+        {'favorite_product_ids': [999], 'search_keywords': [], 'clicked_categories': ['없는카테고리']},
+    ]
+    for _ in range(30):
+        profiles.append({
+            'favorite_product_ids': rng.integers(1, 250, size=rng.integers(0, 5)).tolist(),
+            'search_keywords': rng.choice(['미니', '소포장', '냄비', 'mini'], size=rng.integers(0, 3)).tolist(),
+            'clicked_categories': rng.choice(['신선식품', '가공식품', '주방용품'], size=rng.integers(0, 3)).tolist(),
+        })
+
+    for profile in profiles:
+        candidates = rng.choice(len(products_df), size=40, replace=False)
+        expected = [BehaviorBooster.apply(products_df.iloc[idx], profile, products_df) for idx in candidates]
+        result = booster.apply_batch(candidates, profile)
+        assert np.array_equal(result, np.array(expected)), f"부스팅 배수 불일치: {profile}"
+
+    assert booster.apply_batch(np.array([], dtype=int), profiles[1]).shape == (0,), "빈 후보 처리 오류"
+    print("BehaviorBooster.apply_batch 테스트 통과")
+
+if __name__ == "__main__":
+    test_apply_batch_matches_apply()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+from product.feature.single_household_score import SingleHouseHoldScoreCalculator
+from product.processor.category_pool import CategoryPoolBuilder
+
+CATEGORIES = ['신선식품', '가공식품', '주방용품', '생활용품', '기타', '가공식품/즉석', None]
+NAME_WORDS = ['미니', '혼밥', '소포장', '즉석', '간편', '실리콘', '밀키트', '대용량', '']
+
+def make_products(n: int = 2000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'product_id': np.arange(n) + 100,
+        'name': [f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)} 상품{i}" for i in range(n)],
+        'price': rng.integers(500, 40000, size=n),
+        'large_category': rng.choice(np.array(CATEGORIES, dtype=object), size=n),
+    }, index=rng.permutation(n))
+
+def legacy_build(products_df: pd.DataFrame) -> dict:
+    """기존 카테고리별 str.contains + apply pool 생성"""
+    category_pools = {}
+    for category in ['신선식품', '가공식품', '주방용품', '생활용품']:
+        cat_products = products_df[products_df['large_category'].str.contains(category, na=False)].copy()
+        if not cat_products.empty:
+            cat_products['flexible_single_score'] = cat_products.apply(SingleHouseHoldScoreCalculator.calculate, axis=1)
+            threshold = cat_products['flexible_single_score'].quantile(0.3)
+            qualified = cat_products[cat_products['flexible_single_score'] >= threshold]
+            category_pools[category] = qualified.sample(n=min(len(qualified), 80), random_state=42).reset_index(drop=True)
+    return category_pools
+
+def test_category_pool_matches_legacy():
+    products_df = make_products()
+    expected = legacy_build(products_df)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        CategoryPoolBuilder._score_cache = {}
+        pools = CategoryPoolBuilder.build(products_df, cache_dir=cache_dir)
+        assert pools.keys() == expected.keys(), "카테고리 목록 오류"
+        for category, pool in pools.items():
+            pd.testing.assert_frame_equal(pool, expected[category])
+        assert len(os.listdir(cache_dir)) == 1, "점수 디스크 캐시 저장 오류"
+
+        # 디스크 캐시로 다시 생성해도 같은 결과
+        CategoryPoolBuilder._score_cache = {}
+        cached = CategoryPoolBuilder.build(products_df, cache_dir=cache_dir)
+        for category, pool in cached.items():
+            pd.testing.assert_frame_equal(pool, expected[category])
+
+        # 카탈로그가 바뀌면 새로 계산
+        changed = products_df.copy()
+        changed.iloc[0, changed.columns.get_loc('name')] = '1인용 미니 밀키트'
+        assert CategoryPoolBuilder.catalog_hash(changed) != CategoryPoolBuilder.catalog_hash(products_df), "카탈로그 해시 오류"
+        CategoryPoolBuilder.build(changed, cache_dir=cache_dir)
+        # 이전 카탈로그 점수 파일은 삭제하고 새 카탈로그 파일만 유지
+        assert os.listdir(cache_dir) == [f"single_score_{CategoryPoolBuilder.catalog_hash(changed)}.npy"], "이전 점수 캐시 정리 오류"
+    print("CategoryPoolBuilder 테스트 통과")
+
+if __name__ == "__main__":
+    test_category_pool_matches_legacy()
@@ -0,0 +1,43 @@
+import tempfile
+import numpy as np
+
+from product.embedding.embedding_cache import EmbeddingCache
+
+def test_embedding_cache():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        model_name = 'jhgan/ko-sroberta-multitask'
+        texts = ['미니 밥솥 주방용품', '1인용 도시락 가공식품', '소포장 사과 신선식품']
+        keys = [EmbeddingCache.make_key(t) for t in texts]
+        vectors = np.random.default_rng(0).random((3, 8)).astype(np.float32)
+
+        # 1. 빈 캐시에 저장
+        cache = EmbeddingCache(cache_dir, model_name)
+        assert not cache.lookup(keys).any(), "빈 캐시에서 hit 발생"
+        cache.put(keys, vectors)
+        cache.save()
+
+        # 2. 새 인스턴스에서 memory-map으로 다시 로드
+        cache = EmbeddingCache(cache_dir, model_name)
+        assert cache.lookup(keys).all(), "저장된 키가 hit 되지 않음"
+        assert np.allclose(cache.get(keys[::-1]), vectors[::-1]), "조립된 임베딩 순서 오류"
+        print("캐시 통계:", cache.stats())
+
+        # 3. 사라진 상품 제거 + 신규 상품 추가
+        new_key = EmbeddingCache.make_key('혼밥 라면 가공식품')
+        cache.put([new_key], np.ones((1, 8), dtype=np.float32))
+        evicted = cache.evict(keys[1:] + [new_key])
+        cache.save()
+        assert evicted == 1, "제거 개수 오류"
+
+        cache = EmbeddingCache(cache_dir, model_name)
+        assert len(cache) == 3, "캐시 크기 오류"
+        assert keys[0] not in cache, "제거된 키가 남아 있음"
+        assert np.allclose(cache.get([new_key]), 1.0), "신규 임베딩 저장 오류"
+
+        # 4. 다른 모델의 캐시는 분리됨
+        other = EmbeddingCache(cache_dir, 'paraphrase-multilingual-MiniLM-L12-v2')
+        assert len(other) == 0, "모델별 캐시가 분리되지 않음"
+    print("EmbeddingCache 테스트 통과")
+
+if __name__ == "__main__":
+    test_embedding_cache()
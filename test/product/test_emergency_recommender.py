@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from product.core.emergency_recommender import EmergencyRecommender
+
+def make_products(n: int = 500, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'product_id': np.arange(n) + 100,
+        'name': [f"상품{i}" for i in range(n)],
+        'price': rng.integers(0, 50000, size=n),
+        'large_category': rng.choice(['신선식품', '가공식품', '주방용품'], size=n),
+        'category_path': ['기타 > 기타 > 기타'] * n,
+    })
+
+def test_emergency_recommend():
+    products_df = make_products()
+    recommender = EmergencyRecommender(products_df)
+    eligible_ids = set(products_df.loc[products_df['price'].between(1000, 25000), 'product_id'])
+
+    used = set(list(eligible_ids)[:100])
+    for user_id in range(50):
+        recs = recommender.recommend(4, used, user_id)
+        ids = [rec.product_id for rec in recs]
+        assert len(ids) == 4 and len(set(ids)) == 4, "추천 개수/중복 오류"
+        assert set(ids) <= eligible_ids - used, "가격대/사용 상품 제외 오류"
+        assert ids == [rec.product_id for rec in recommender.recommend(4, used, user_id)], "사용자별 결과가 고정되지 않음"
+
+    # 적정 가격대 후보가 거의 모두 사용된 경우 남은 후보에서 선택
+    remaining = set(list(eligible_ids)[:2])
+    recs = recommender.recommend(4, eligible_ids - remaining, 7)
+    assert {rec.product_id for rec in recs} == remaining, "남은 후보 선택 오류"
+
+    # 적정 가격대 후보가 모두 사용되면 전체 상품 중 앞쪽에서 선택
+    recs = recommender.recommend(3, eligible_ids, 7)
+    assert len(recs) == 3 and not {rec.product_id for rec in recs} & eligible_ids, "전체 상품 fallback 오류"
+
+    assert recommender.recommend(0, set(), 1) == [], "count 0 처리 오류"
+    print("EmergencyRecommender 테스트 통과")
+
+if __name__ == "__main__":
+    test_emergency_recommend()
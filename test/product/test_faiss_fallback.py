@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from product.core.faiss_fallback import FaissFallbackRecommender
+from product.embedding.faiss_manager import FAISSIndexManager
+
+def make_fallback(n: int = 2000, dim: int = 16, n_users: int = 50, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.normal(size=(n, dim)).astype(np.float32)
+    product_ids = np.arange(n) + 1000
+    categories = rng.choice(['신선식품', '가공식품', '주방용품'], size=n)
+    faiss_manager = FAISSIndexManager('flat')
+    faiss_manager.build_index(embeddings, product_ids=product_ids)
+    faiss_manager.build_category_indexes(embeddings, product_ids, categories)
+
+    # 인덱스 구축 이후 카탈로그에서 삭제된 상품 (앞쪽 10%)
+    products_df = pd.DataFrame({
+        'product_id': product_ids,
+        'name': [f"상품{i}" for i in range(n)],
+        'price': rng.integers(1000, 30000, size=n),
+        'large_category': categories,
+        'category_path': ['기타 > 기타 > 기타'] * n,
+    }).iloc[n // 10:].reset_index(drop=True)
+
+    fallback = FaissFallbackRecommender(products_df, faiss_manager, None, start_k=4, max_k=4096)
+    user_embeddings = rng.normal(size=(n_users // 2, dim)).astype(np.float32)
+    # 사용자 2명씩 같은 쿼리(임베딩 행) 공유
+    fallback.set_user_embeddings(user_embeddings, {user_id: user_id // 2 for user_id in range(n_users)})
+    return fallback, embeddings, product_ids, categories, user_embeddings
+
+def brute_force(embeddings, product_ids, query, count, exclude, catalog_ids, mask=None):
+    vectors = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    order = np.argsort(-(vectors @ (query / np.linalg.norm(query))), kind='stable')
+    result = []
+    for idx in order:
+        product_id = int(product_ids[idx])
+        if (mask is None or mask[idx]) and product_id in catalog_ids and product_id not in exclude:
+            result.append(product_id)
+            if len(result) == count:
+                break
+    return result
+
+def test_adaptive_depth_and_cache():
+    fallback, embeddings, product_ids, categories, user_embeddings = make_fallback()
+    catalog_ids = set(fallback.product_ids.tolist())
+    rng = np.random.default_rng(1)
+
+    profiles = [{'user_id': user_id} for user_id in range(50)]
+    counts = rng.integers(1, 6, size=50).tolist()
+    # 깊은 제외 집합 - 작은 깊이로는 부족해서 여러 번 깊이를 늘려야 함
+    excludes = [set(rng.choice(product_ids, size=int(rng.integers(0, 300)), replace=False).tolist()) for _ in profiles]
+
+    for category in (None, '가공식품'):
+        mask = None if category is None else (categories == category)
+        positions = fallback.candidate_positions(profiles, counts, excludes, category)
+        for row, profile in enumerate(profiles):
+            result = fallback.product_ids[positions[row]].tolist()
+            query = user_embeddings[profile['user_id'] // 2]
+            expected = brute_force(embeddings, product_ids, query, counts[row], excludes[row], catalog_ids, mask)
+            assert result == expected, f"검색 결과 불일치: user {profile['user_id']}, category {category}"
+
+    metrics = fallback.get_metrics()
+    assert metrics['fill_rate'] == 1.0, "fallback 결과 부족"
+    assert metrics['cached_queries'] == 50, "쿼리별 캐시 오류"  # 고유 쿼리 25개 × (전체 + 카테고리)
+    assert max(metrics['depth_counts']) > 4, "검색 깊이가 늘어나지 않음"
+
+    # 같은 쿼리 재요청은 검색 없이 캐시로 처리
+    searches = metrics['searches']
+    recs = fallback.recommend(profiles[0], counts[0], set(excludes[0]))
+    assert len(recs) == counts[0] and fallback.get_metrics()['searches'] == searches, "캐시 재사용 오류"
+    print("FAISS fallback 깊이 확장/캐시 테스트 통과")
+
+def test_cache_is_bounded():
+    fallback, embeddings, product_ids, _, user_embeddings = make_fallback(n_users=400)
+    fallback.cache_size = 30
+    catalog_ids = set(fallback.product_ids.tolist())
+
+    # 실시간 엔진처럼 사용자마다 다른 쿼리로 계속 요청해도 캐시는 cache_size개를 넘지 않음
+    for user_id in range(0, 400, 2):
+        fallback.recommend({'user_id': user_id}, 3, set())
+        assert len(fallback.rank_cache) <= 30, "캐시 크기 제한 초과"
+    metrics = fallback.get_metrics()
+    assert metrics['cached_queries'] == 30 and metrics['cache_evictions'] == 200 - 30, "LRU 제거 오류"
+
+    # 묶음의 고유 쿼리가 cache_size보다 많아도 결과는 같음 (재검색 루프 없음)
+    fallback.cache_size = 4
+    profiles = [{'user_id': user_id} for user_id in range(0, 400, 2)]
+    positions = fallback.candidate_positions(profiles, [5] * len(profiles), [set()] * len(profiles))
+    for profile, row_positions in zip(profiles, positions):
+        expected = brute_force(embeddings, product_ids, user_embeddings[profile['user_id'] // 2], 5, set(), catalog_ids)
+        assert fallback.product_ids[row_positions].tolist() == expected, "작은 캐시에서 검색 결과 불일치"
+    assert len(fallback.rank_cache) <= 4, "캐시 크기 제한 초과"
+    print("FAISS fallback 캐시 크기 제한 테스트 통과")
+
+def test_errors_are_counted():
+    fallback, *_ = make_fallback()
+    # 미리 계산된 임베딩도 embedding_generator도 없는 사용자는 오류로 기록
+    assert fallback.recommend({'user_id': 999}, 3, set()) == []
+    assert fallback.recommend_batch([{'user_id': 999}, {'user_id': 1}], [2, 2], [set(), set()])[0] == []
+    assert fallback.get_metrics()['errors'] == 2, "오류 카운터 오류"
+    print("FAISS fallback 오류 카운터 테스트 통과")
+
+if __name__ == "__main__":
+    test_adaptive_depth_and_cache()
+    test_cache_is_bounded()
+    test_errors_are_counted()
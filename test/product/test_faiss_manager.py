@@ -0,0 +1,201 @@
+import os
+import tempfile
+import numpy as np
+import faiss
+import pandas as pd
+
+from product.embedding.faiss_manager import FAISSIndexManager
+from product.embedding.index_artifact import IndexArtifact
+
+def make_embeddings(n: int, dim: int = 32, seed: int = 0) -> np.ndarray:
+    x = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+def test_id_mapped_index():
+    embeddings = make_embeddings(50)
+    product_ids = np.arange(1000, 1050)
+
+    manager = FAISSIndexManager('flat')
+    manager.build_index(embeddings, product_ids=product_ids)
+
+    # 1. 검색 결과는 product_id
+    _, labels = manager.search(embeddings[3], k=1)
+    assert labels[0] == 1003, "검색 결과가 product_id가 아님"
+
+    # 2. 삭제된 상품은 검색되지 않음
+    assert manager.remove([1003]) == 1, "삭제 개수 오류"
+    _, labels = manager.search(embeddings[3], k=5)
+    assert 1003 not in labels, "삭제된 상품이 검색됨"
+
+    # 3. upsert - 기존 상품 임베딩 교체 + 신규 상품 추가
+    new_vectors = make_embeddings(2, seed=1)
+    manager.upsert([1010, 2000], new_vectors)
+    _, labels = manager.search(new_vectors[0], k=1)
+    assert labels[0] == 1010, "upsert된 임베딩으로 검색되지 않음"
+    assert manager.index.ntotal == 50, "upsert 후 상품 수 오류"
+
+    # 4. product_id → 상품 행 위치 변환 (카탈로그에 없는 상품은 -1)
+    catalog = pd.Index([1010, 1020])
+    positions = manager.resolve_positions(np.array([1020, 2000, -1]), catalog)
+    assert positions.tolist() == [1, -1, -1], "행 위치 변환 오류"
+
+    # 5. 저장/로드 시 product_id 매핑 유지
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        local_path = os.path.join(tmp_dir, 'faiss.index')
+        manager.save_index_to_local(local_path)
+        loaded = FAISSIndexManager()
+        loaded.load_index_from_local(local_path)
+        assert loaded.id_mapped, "product_id 기반 인덱스로 로드되지 않음"
+        assert sorted(loaded.product_ids.tolist()) == sorted(manager.product_ids.tolist()), "product_id 목록 불일치"
+        _, labels = loaded.search(new_vectors[1], k=1)
+        assert labels[0] == 2000, "로드한 인덱스 검색 오류"
+    print("product_id 기반 FAISS 인덱스 테스트 통과")
+
+def test_batch_and_excluding_search():
+    embeddings = make_embeddings(200)
+    product_ids = np.arange(200) + 5000
+
+    manager = FAISSIndexManager('flat')
+    manager.build_index(embeddings, product_ids=product_ids)
+
+    # 1. batch 검색 결과는 단일 검색 결과와 같음
+    queries = make_embeddings(5, seed=2)
+    _, batch_labels = manager.search_batch(queries, k=10)
+    for query, labels in zip(queries, batch_labels):
+        assert (manager.search(query, k=10)[1] == labels).all(), "batch 검색 결과 불일치"
+
+    # 2. 제외 집합을 뺀 정확히 k개 반환, 나머지 순서는 유지
+    exclude = [set(batch_labels[0][:7].tolist()), set(), set(range(5000, 5190))]
+    _, labels = manager.search_excluding(queries[[0, 1, 2]], 5, exclude)
+    assert (labels >= 0).all(), "k개를 채우지 못함"
+    assert not set(labels[0]) & exclude[0], "제외 상품이 포함됨"
+    assert labels[0][:3].tolist() == batch_labels[0][7:10].tolist(), "유사도 순서 불일치"
+    assert (labels[1] == batch_labels[1][:5]).all(), "제외 집합이 없는 쿼리 결과 불일치"
+    assert set(labels[2]) <= set(range(5190, 5200)), "대량 제외 집합 처리 오류"
+
+    # 3. 인덱스 상품이 부족하면 -1로 채움
+    _, labels = manager.search_excluding(queries[0], 5, [set(range(5000, 5198))])
+    assert (labels[0] >= 0).sum() == 2 and (labels[0][2:] == -1).all(), "부족한 결과 처리 오류"
+    print("batch/제외 검색 테스트 통과")
+
+def test_index_artifact():
+    embeddings = make_embeddings(30)
+    product_ids = np.arange(30) + 100
+    texts = [f"상품 {pid}" for pid in product_ids]
+
+    manager = FAISSIndexManager('flat')
+    manager.build_index(embeddings, product_ids=product_ids)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        artifact_dir = os.path.join(tmp_dir, 'faiss_artifact')
+        version = IndexArtifact.catalog_version(product_ids, texts)
+        manifest = IndexArtifact.write(manager, artifact_dir, 'test-model', version)
+        assert manifest['ntotal'] == 30 and manifest['catalog_version'] == version, "manifest 정보 오류"
+        assert manifest['checksum'] == IndexArtifact.checksum(artifact_dir), "checksum 불일치"
+
+        # memory-map 로드 후 product_id로 검색, 읽기 전용
+        loaded = FAISSIndexManager()
+        IndexArtifact.load(artifact_dir, loaded, model_name='test-model')
+        _, labels = loaded.search(embeddings[5], k=1)
+        assert labels[0] == 105, "bundle 인덱스 검색 오류"
+        try:
+            loaded.add([999], embeddings[:1])
+            raise AssertionError("읽기 전용 인덱스가 수정됨")
+        except ValueError:
+            pass
+
+        # 다른 모델의 bundle은 로드 거부
+        try:
+            IndexArtifact.load(artifact_dir, FAISSIndexManager(), model_name='other-model')
+            raise AssertionError("모델 불일치 bundle이 로드됨")
+        except ValueError:
+            pass
+
+        # 재저장은 링크만 교체하고 이전 버전 디렉토리는 정리
+        manager.remove([100])
+        IndexArtifact.write(manager, artifact_dir, 'test-model', 'next')
+        assert os.path.islink(artifact_dir), "bundle 경로가 심볼릭 링크가 아님"
+        assert len(os.listdir(tmp_dir)) == 2, f"이전 버전 디렉토리가 남음: {os.listdir(tmp_dir)}"
+        reloaded = FAISSIndexManager()
+        assert IndexArtifact.load(artifact_dir, reloaded)['catalog_version'] == 'next', "교체된 bundle 로드 오류"
+        assert 100 not in reloaded.product_ids, "교체된 bundle 내용 오류"
+
+        # 이전 형식의 일반 디렉토리도 링크로 전환
+        legacy_dir = os.path.join(tmp_dir, 'legacy_artifact')
+        os.makedirs(legacy_dir)
+        IndexArtifact.write(manager, legacy_dir, 'test-model', version)
+        assert os.path.islink(legacy_dir) and IndexArtifact.read_manifest(legacy_dir)['ntotal'] == 29, "일반 디렉토리 전환 오류"
+    print("인덱스 bundle 테스트 통과")
+
+def test_compact_index():
+    embeddings = make_embeddings(500)
+    product_ids = np.arange(500) + 1
+
+    full = FAISSIndexManager('flat')
+    full.build_index(embeddings, product_ids=product_ids)
+
+    for params in ({'storage': 'fp16'},
+                   {'storage': 'sq8', 'reduce_dim': 16, 'reduce_method': 'pca'},
+                   {'storage': 'fp16', 'reduce_dim': 16, 'reduce_method': 'truncate'}):
+        compact = FAISSIndexManager('flat', params)
+        compact.build_index(embeddings, product_ids=product_ids)
+        assert compact.memory_bytes() < full.memory_bytes(), f"compact 인덱스가 더 작지 않음: {params}"
+
+        # 차원 축소/양자화 후에도 쿼리는 원본 차원으로 검색하고 product_id 반환
+        _, labels = compact.search(embeddings[7], k=1)
+        assert labels[0] == 8, f"compact 인덱스 검색 오류: {params}"
+
+        compact.remove([8])
+        _, labels = compact.search(embeddings[7], k=5)
+        assert 8 not in labels, f"compact 인덱스 삭제 오류: {params}"
+
+    # pq_m이 PQ 벡터 차원의 약수가 아니면 설정/구축 시점에 명확한 오류
+    for params, dim in (({'reduce_dim': 20, 'pq_m': 16}, 32), ({'pq_m': 12}, 32)):
+        try:
+            FAISSIndexManager('ivf_pq', params).build_index(make_embeddings(500, dim), product_ids=product_ids)
+            raise AssertionError(f"잘못된 pq_m 설정이 허용됨: {params}")
+        except ValueError as e:
+            assert 'pq_m' in str(e), f"pq_m 오류 메시지 누락: {e}"
+    print("compact 인덱스 테스트 통과")
+
+def test_category_indexes():
+    embeddings = make_embeddings(60)
+    product_ids = np.arange(60) + 1
+    categories = np.array(['신선식품', '가공식품', '주방용품'] * 20, dtype=object)
+
+    manager = FAISSIndexManager('flat')
+    manager.build_index(embeddings, product_ids=product_ids)
+    sizes = manager.build_category_indexes(embeddings, product_ids, categories)
+    assert sizes == {'신선식품': 20, '가공식품': 20, '주방용품': 20}, "카테고리별 상품 수 오류"
+
+    # 카테고리 안에서만 검색되고 제외 집합은 빠짐
+    _, labels = manager.search_category('가공식품', embeddings[1], k=5, exclude=[{2}])
+    assert len(labels[0]) == 5 and 2 not in labels[0], "제외 상품이 검색됨"
+    assert all(categories[pid - 1] == '가공식품' for pid in labels[0]), "다른 카테고리 상품이 검색됨"
+
+    # 자기 자신이 가장 가까운 상품
+    _, labels = manager.search_category('주방용품', embeddings[2], k=1)
+    assert labels[0][0] == 3, "카테고리 검색 결과 오류"
+
+    # sub-index가 없는 카테고리는 빈 결과
+    _, labels = manager.search_category('생활용품', embeddings[0], k=3)
+    assert (labels == -1).all(), "없는 카테고리에서 결과 반환"
+
+    # 카테고리 pool처럼 대분류에 카테고리명이 포함되면 같은 sub-index, 저장 형식은 전체 인덱스 설정을 따름
+    categories[::6] = '신선식품/수산'
+    compact = FAISSIndexManager('flat', {'storage': 'sq8'})
+    compact.build_index(embeddings, product_ids=product_ids)
+    sizes = compact.build_category_indexes(embeddings, product_ids, categories)
+    assert sizes['신선식품'] == 20, "포함 관계 카테고리 매칭 오류"
+    _, labels = compact.search_category('신선식품', embeddings[6], k=1)
+    assert labels[0][0] == 7, "포함 관계 카테고리 상품이 검색되지 않음"
+    sub_index = faiss.downcast_index(compact.category_indexes['신선식품'].index)
+    assert isinstance(sub_index, faiss.IndexScalarQuantizer), "sub-index 저장 형식 불일치"
+    print("카테고리 sub-index 테스트 통과")
+
+if __name__ == "__main__":
+    test_id_mapped_index()
+    test_batch_and_excluding_search()
+    test_index_artifact()
+    test_compact_index()
+    test_category_indexes()
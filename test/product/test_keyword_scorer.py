@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from product.feature.keyword_scorer import KeywordMatcher
+from product.feature.single_household_score import SingleHouseHoldScoreCalculator
+from product.processor.product_score_processor import ProductSingleScoreProcessor
+
+NAME_WORDS = ['1인용', '혼밥', '미니', '소포장', '개별포장', '1인분', '1인', '개별', '간편', '소량', '작은', '컴팩트',
+              '휴대용', '간단', '즉석', '소형', '포션', '1개입', '원룸', '밀키트', '실리콘', 'MINI', '대용량', '']
+CATEGORIES = ['가공식품', '주방용품', '신선식품', '가공식품/즉석', '기타']
+
+def make_products(n: int = 3000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    names = ["".join(rng.choice(NAME_WORDS, size=rng.integers(0, 4))) + f"상품{i}" for i in range(n)]
+    names[:4] = [None, np.nan, '미니미니 소포장개별포장', '1인분1인용혼밥']
+    price = rng.integers(0, 40000, size=n).astype(float)
+    price[:3] = [np.nan, 5000, 30000]
+    return pd.DataFrame({
+        'name': names,
+        'price': price,
+        'large_category': rng.choice(CATEGORIES, size=n),
+    })
+
+def legacy_processor_score(products_df: pd.DataFrame) -> pd.Series:
+    """기존 행 단위 calc_score"""
+    def score(row):
+        name = str(row.get('name', '')).lower()
+        price = float(row.get('price', 0))
+        s = 0
+        for kw in ProductSingleScoreProcessor.PRIMARY_KEYWORDS:
+            if kw in name:
+                s += 3
+        for kw in ProductSingleScoreProcessor.SECONDARY_KEYWORDS:
+            if kw in name:
+                s += 1.5
+        if price < 10000:
+            s += 1
+        elif price < 30000:
+            s += 0.5
+        return min(s, 10)
+    return products_df.apply(score, axis=1)
+
+def test_keyword_matcher():
+    matcher = KeywordMatcher(['개별', '개별포장', '포장', '1인', '1인용'])
+    matches = matcher.matches(pd.Series(['개별포장', '1인용 포장', '없음', '1인']))
+    expected = [[k in name for k in matcher.keywords] for name in ['개별포장', '1인용 포장', '없음', '1인']]
+    assert matches.tolist() == expected, "겹치는/접두어 키워드 매칭 오류"
+    assert matcher.count(matches, ['개별', '포장']).tolist() == [2, 1, 0, 0], "키워드 수 계산 오류"
+    assert matcher.matches(pd.Series([], dtype=object)).shape == (0, 5), "빈 입력 처리 오류"
+    print("KeywordMatcher 테스트 통과")
+
+def test_processor_score_matches_legacy():
+    products_df = make_products()
+    result = ProductSingleScoreProcessor.calc_score(products_df)['single_household_score']
+    expected = legacy_processor_score(products_df)
+    assert result.dtype == expected.dtype and result.tolist() == expected.tolist(), "상품 점수가 기존 계산과 다름"
+
+    # 1.5/0.5점이 없는 경우 기존처럼 정수 컬럼
+    int_df = pd.DataFrame({'name': ['미니 냄비', '대용량'], 'price': [500, 50000]})
+    result = ProductSingleScoreProcessor.calc_score(int_df)['single_household_score']
+    expected = legacy_processor_score(int_df)
+    assert result.dtype == expected.dtype and result.tolist() == expected.tolist(), "정수 점수 dtype 오류"
+    print("ProductSingleScoreProcessor.calc_score 테스트 통과")
+
+def test_single_household_batch_matches_legacy():
+    products_df = make_products()
+    result = SingleHouseHoldScoreCalculator.calculate_batch(products_df)
+    expected = products_df.apply(SingleHouseHoldScoreCalculator.calculate, axis=1)
+    assert result.index.equals(expected.index), "index 오류"
+    assert result.tolist() == expected.tolist(), "1인가구 점수가 기존 계산과 다름"
+    print("SingleHouseHoldScoreCalculator.calculate_batch 테스트 통과")
+
+if __name__ == "__main__":
+    test_keyword_matcher()
+    test_processor_score_matches_legacy()
+    test_single_household_batch_matches_legacy()
@@ -0,0 +1,58 @@
+import time
+
+from product.core.pipeline import RecommendationPipeline, PipelineStage, RequestContext
+
+def make_context(top_k: int = 4) -> RequestContext:
+    return RequestContext(user_id=1, user_profile={}, top_k=top_k, previous_recs=set())
+
+def add(n: int, delay: float = 0.0):
+    def run(context):
+        time.sleep(delay)
+        context.recommendations += [f"item{len(context.recommendations) + i}" for i in range(n)]
+        return n
+    return run
+
+def fail(context):
+    raise RuntimeError("검색 실패")
+
+def test_stage_budget_skip():
+    pipeline = RecommendationPipeline([
+        PipelineStage('slow', add(2, delay=0.02), budget_ms=5),
+        PipelineStage('fast', add(2), budget_ms=5),
+        PipelineStage('emergency', add(4, delay=0.02), budget_ms=5, skippable=False),
+    ])
+
+    # 첫 요청: 예산 초과를 아직 모르므로 실행, 이후 emergency는 이미 채워져서 실행 안 함
+    trace = pipeline.run(make_context())
+    assert [r.status for r in trace] == ['ok', 'ok', 'not_needed']
+    assert pipeline.stats['slow']['overruns'] == 1
+
+    # 다음 요청: 느린 단계는 건너뛰고 fallback 단계로 채움, 건너뛸 수 없는 단계는 예산을 넘어도 실행
+    context = make_context()
+    trace = pipeline.run(context)
+    assert [r.status for r in trace] == ['skipped', 'ok', 'ok'], trace
+    assert [r.yielded for r in trace] == [0, 2, 4] and len(context.recommendations) == 6
+
+    # 건너뛸 때마다 EWMA가 줄어서 결국 다시 실행
+    statuses = [pipeline.run(make_context())[0].status for _ in range(30)]
+    assert 'ok' in statuses, "건너뛴 단계가 다시 실행되지 않음"
+    print("파이프라인 예산 건너뜀 테스트 통과")
+
+def test_stage_error_falls_through():
+    pipeline = RecommendationPipeline([
+        PipelineStage('broken', fail, budget_ms=50),
+        PipelineStage('finalize', lambda context: len(context.recommendations), fills=False),
+        PipelineStage('fallback', add(3)),
+    ])
+    context = make_context(top_k=3)
+    trace = pipeline.run(context)
+    assert [r.status for r in trace] == ['error', 'ok', 'ok']
+    assert len(context.recommendations) == 3
+    stats = pipeline.get_stats()
+    assert stats['broken']['errors'] == 1 and stats['fallback']['yielded'] == 3
+    assert RecommendationPipeline.trace_to_dicts(trace)[2]['yielded'] == 3
+    print("파이프라인 오류 fallback 테스트 통과")
+
+if __name__ == "__main__":
+    test_stage_budget_skip()
+    test_stage_error_falls_through()
@@ -0,0 +1,57 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from product.embedding.faiss_manager import FAISSIndexManager
+from product.service.realtime_recommendation_service import RealtimeRecommendationService
+from test_sharded_runner import make_engine
+
+class FakePipelineService:
+    """엔진 재구축 시 현재 시점의 상품/사용자 프로필을 돌려주는 테스트용 pipeline service"""
+    def __init__(self, engine):
+        self.engine = engine
+        self.calls = 0
+
+    def category_score_pipeline(self):
+        self.calls += 1
+        return self.engine.products_df
+
+    def user_profile_pipeline(self, scored_df):
+        return self.engine.user_profiles
+
+def test_swap_index_rebuilds_engine():
+    source = make_engine(n_products=500, n_users=20)
+    pipeline_service = FakePipelineService(source)
+    service = RealtimeRecommendationService(pipeline_service=pipeline_service, enabled=True, save_results=False, cache_dir=None)
+    service.set_engine(service.build_engine(source.faiss_fallback.faiss_manager), {'catalog_version': 'v1', 'checksum': 'a'})
+    old_engine = service.engine
+
+    # refresher가 새 bundle을 로드하면 새 인덱스와 재로드한 카탈로그로 엔진 교체
+    new_index = FAISSIndexManager('flat')
+    new_index.build_index(np.random.default_rng(1).normal(size=(500, 32)), product_ids=source.products_df['product_id'])
+    service.swap_index(new_index, {'catalog_version': 'v2', 'checksum': 'b'})
+
+    assert service.engine is not old_engine and service.engine.faiss_fallback.faiss_manager is new_index, "엔진 교체 오류"
+    assert service.engine.history_manager is old_engine.history_manager, "교체 후 추천 히스토리 유실"
+    assert pipeline_service.calls == 2, "교체 시 카탈로그를 다시 읽지 않음"
+    assert service.status()['catalog_version'] == 'v2', "교체된 bundle 정보 오류"
+    assert service.refresher.artifact_dir == service.artifact_dir, "refresher bundle 디렉토리 불일치"
+    assert service.recommend(1, top_k=4) is not None, "교체된 엔진 추천 실패"
+    print("실시간 추천 엔진 교체 테스트 통과")
+
+def test_counters_under_concurrent_requests():
+    service = RealtimeRecommendationService(enabled=True, timeout_ms=10_000, save_results=False, cache_dir=None)
+    service.set_engine(make_engine(n_products=500, n_users=20))
+    user_ids = [user_id % 25 for user_id in range(400)]
+
+    # 여러 요청 스레드가 동시에 메트릭을 갱신해도 요청 수와 결과별 합계가 맞아야 함
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(service.recommend, user_ids))
+    status = service.status()
+    assert status['requests'] == len(user_ids), "요청 수 집계 누락"
+    assert status['served'] == sum(result is not None for result in results), "추천 성공 수 집계 오류"
+    assert status['served'] + status['unknown_user'] + status['busy'] + status['errors'] == len(user_ids), "결과별 합계 불일치"
+    print("실시간 추천 동시 요청 메트릭 테스트 통과")
+
+if __name__ == "__main__":
+    test_swap_index_rebuilds_engine()
+    test_counters_under_concurrent_requests()
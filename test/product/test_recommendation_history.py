@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+from product.processor.recommendation_history import RecommendationHistoryManager
+
+def test_ordered_trim():
+    manager = RecommendationHistoryManager()
+    manager.add(1, [1, 2, 3, 4])
+    manager.add(1, [5, 6, 2, 7])
+    assert manager.get_ordered(1) == [1, 3, 4, 5, 6, 2, 7], "추천 순서/재추천 이동 오류"
+
+    # 15개 초과 시 가장 최근 8개만 유지
+    for start in range(10, 30, 4):
+        manager.add(1, range(start, start + 4))
+    assert manager.get_ordered(1) == list(range(22, 30)), "최근 8개 유지 오류"
+    assert manager.get(1) == set(range(22, 30))
+    assert manager.get(2) == set(), "없는 사용자 조회 오류"
+    print("히스토리 순서/크기 제한 테스트 통과")
+
+def test_lru_and_sqlite_persistence():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'history.db')
+        manager = RecommendationHistoryManager(db_path, max_users=3, flush_every=2)
+        for user_id in range(10):
+            manager.add(user_id, [user_id * 10, user_id * 10 + 1])
+        assert len(manager.history) <= 3, "메모리 사용자 수 제한 오류"
+        # 메모리에서 밀려난 사용자도 DB 또는 미저장 변경분에서 다시 읽힘
+        assert manager.get_ordered(0) == [0, 1], "밀려난 사용자 조회 오류"
+        manager.add(0, [2])
+        manager.close()
+
+        # 재시작 후 lazy load / 묶음 조회
+        restarted = RecommendationHistoryManager(db_path)
+        assert restarted.get_ordered(0) == [0, 1, 2], "재시작 후 히스토리 유실"
+        restarted.preload(range(10))
+        assert all(restarted.get_ordered(u) == [u * 10, u * 10 + 1] for u in range(1, 10)), "preload 오류"
+
+        # 저장에 실패한 추천은 rollback으로 snapshot 시점 히스토리로 되돌림 (DB에도 반영)
+        snapshot = restarted.snapshot([1, 2])
+        restarted.add(1, [99])
+        restarted.add(2, [98])
+        restarted.rollback(snapshot)
+        restarted.close()
+        assert RecommendationHistoryManager(db_path).get_ordered(1) == [10, 11], "rollback 오류"
+    print("히스토리 LRU/SQLite 저장 테스트 통과")
+
+if __name__ == "__main__":
+    test_ordered_trim()
+    test_lru_and_sqlite_persistence()
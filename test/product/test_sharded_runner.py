@@ -0,0 +1,154 @@
+import os
+import json
+import tempfile
+import numpy as np
+import pandas as pd
+
+from product.core.recommendation_engine import RecommendationEngine
+from product.embedding.faiss_manager import FAISSIndexManager
+from product.processor.recommendation_history import RecommendationHistoryManager
+from product.service.sharded_runner import ShardedRecommendationRunner
+
+CATEGORIES = ['신선식품', '가공식품', '주방용품', '생활용품', '기타']
+
+def make_engine(n_products: int = 3000, n_users: int = 300, dim: int = 32, history_manager=None) -> RecommendationEngine:
+    rng = np.random.default_rng(0)
+    categories = rng.choice(CATEGORIES, size=n_products)
+    products_df = pd.DataFrame({
+        'id': np.arange(n_products) + 1,
+        'product_id': np.arange(n_products) + 1,
+        'name': [f"{rng.choice(['미니', '혼밥', '대용량', '즉석'])} 상품{i}" for i in range(n_products)],
+        'price': rng.integers(500, 60000, size=n_products),
+        'large_category': categories,
+        'category_path': [f"{c} > 기타 > 기타" for c in categories],
+    })
+    embeddings = rng.normal(size=(n_products, dim)).astype(np.float32)
+    faiss_manager = FAISSIndexManager('flat')
+    faiss_manager.build_index(embeddings, product_ids=products_df['product_id'].to_numpy())
+    faiss_manager.build_category_indexes(embeddings, products_df['product_id'].to_numpy(), categories)
+
+    user_profiles = {
+        user_id: {
+            'user_id': user_id,
+            'base_interest_category': str(rng.choice(CATEGORIES[:4])),
+            'favorite_product_ids': rng.integers(1, n_products, size=2).tolist(),
+            'search_keywords': ['미니'],
+            'clicked_categories': [str(rng.choice(CATEGORIES[:4]))],
+        }
+        for user_id in range(1, n_users + 1)
+    }
+    engine = RecommendationEngine(products_df, faiss_manager, None, user_profiles, history_manager=history_manager, cache_dir=None)
+    engine.set_user_embeddings(rng.normal(size=(n_users, dim)).astype(np.float32), {u: u - 1 for u in user_profiles})
+    return engine
+
+class FileSink:
+    """worker 프로세스별 파일에 추천 결과를 기록하는 테스트용 sink"""
+    def __init__(self, out_dir: str):
+        self.file = open(os.path.join(out_dir, f"{os.getpid()}.jsonl"), 'a', encoding='utf-8')
+        self.written = 0
+
+    def write(self, user_id, rec_result):
+        self.file.write(json.dumps({'user_id': user_id, 'recommendations': rec_result}, ensure_ascii=False) + "\n")
+        self.written += 1
+
+    def close(self):
+        self.file.close()
+
+    def stats(self):
+        return {'written': self.written}
+
+class FailingSink(FileSink):
+    """fail_user_id를 저장하려는 순간 실패하는 테스트용 sink - 그 전 사용자는 저장됨"""
+    def __init__(self, out_dir: str, fail_user_id: int):
+        super().__init__(out_dir)
+        self.fail_user_id = fail_user_id
+        self.written_user_ids = []
+
+    def write(self, user_id, rec_result):
+        if user_id == self.fail_user_id:
+            raise IOError("저장소 연결 끊김")
+        super().write(user_id, rec_result)
+        self.written_user_ids.append(user_id)
+
+    def stats(self):
+        return {'written': self.written, 'written_user_ids': self.written_user_ids}
+
+def read_results(out_dir: str) -> dict:
+    results = {}
+    for name in os.listdir(out_dir):
+        with open(os.path.join(out_dir, name), encoding='utf-8') as f:
+            for line in f:
+                row = json.loads(line)
+                results[row['user_id']] = row['recommendations']
+    return results
+
+def test_sharded_runner_matches_recommend_all():
+    user_ids = list(range(1, 301))
+    expected_engine = make_engine()
+    expected = json.loads(json.dumps(expected_engine.recommend_all(user_ids), ensure_ascii=False))
+
+    for workers in (1, 3):
+        engine = make_engine()
+        with tempfile.TemporaryDirectory() as out_dir:
+            runner = ShardedRecommendationRunner(engine, lambda: FileSink(out_dir), workers=workers, shard_size=70)
+            summaries = runner.run(user_ids)
+            results = read_results(out_dir)
+
+        assert [s['shard'] for s in summaries] == list(range(5)), "shard 요약 순서 오류"
+        assert all(s['error'] is None for s in summaries), "shard 실패"
+        assert sum(s['written'] for s in summaries) == len(user_ids), "저장 건수 불일치"
+        assert {str(k): v for k, v in results.items()} == {str(k): v for k, v in expected.items()}, \
+            f"worker {workers}개 추천 결과 불일치"
+        # worker에서 갱신된 히스토리가 부모 엔진에 반영되었는지 확인
+        for user_id in user_ids:
+            assert engine.history_manager.get(user_id) == expected_engine.history_manager.get(user_id), "히스토리 불일치"
+    print("ShardedRecommendationRunner 테스트 통과")
+
+def test_sharded_runner_history_db():
+    user_ids = list(range(1, 301))
+    expected_engine = make_engine()
+    expected_engine.recommend_all(user_ids)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'history.db')
+        # flush_every보다 적은 변경분만 남는 shard도 worker 종료 전에 저장되어야 함
+        engine = make_engine(history_manager=RecommendationHistoryManager(db_path, flush_every=1000))
+        runner = ShardedRecommendationRunner(engine, lambda: FileSink(tmp_dir), workers=3, shard_size=70)
+        runner.run(user_ids)
+
+        # 부모는 worker가 저장한 히스토리를 다시 쓰지 않음
+        assert not engine.history_manager.dirty, "부모 프로세스가 히스토리를 다시 저장함"
+        stored = RecommendationHistoryManager(db_path)
+        for user_id in user_ids:
+            expected = expected_engine.history_manager.get(user_id)
+            assert stored.get(user_id) == expected, "worker 히스토리가 DB에 저장되지 않음"
+            assert engine.history_manager.get(user_id) == expected, "부모 엔진 히스토리 불일치"
+    print("히스토리 DB 사용 shard 실행 테스트 통과")
+
+def test_sharded_runner_failed_shard():
+    user_ids = list(range(1, 301))
+    for workers in (1, 3):
+        engine = make_engine()
+        with tempfile.TemporaryDirectory() as out_dir:
+            runner = ShardedRecommendationRunner(engine, lambda: FailingSink(out_dir, 150), workers=workers, shard_size=70)
+            try:
+                runner.run(user_ids)
+                raise AssertionError("실패한 shard가 있는데 성공으로 끝남")
+            except RuntimeError as e:
+                assert 'shard 2(' in str(e), f"실패 shard 정보 누락: {e}"
+            results = read_results(out_dir)
+
+        # 실패한 shard 2(141~210)에서 실패 전에 저장된 사용자만 히스토리에 남음
+        assert set(results) == set(user_ids) - set(range(150, 211)), "저장된 사용자 오류"
+        for user_id in user_ids:
+            history = engine.history_manager.get(user_id)
+            if user_id in results:
+                assert history == {rec['product_id'] for rec in results[user_id]}, "저장된 사용자 히스토리 누락"
+            else:
+                assert not history, "저장되지 않은 사용자가 히스토리에 남음"
+    print("실패 shard 처리 테스트 통과")
+
+if __name__ == "__main__":
+    test_sharded_runner_matches_recommend_all()
+    test_sharded_runner_history_db()
+    test_sharded_runner_failed_shard()
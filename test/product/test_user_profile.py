@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+from product.feature.user_profile import UserProfiler
+
+CATEGORIES = ['신선식품', '가공식품', '주방용품', '생활용품', '']
+KEYWORDS = ['미니 냄비', '혼밥', '밀키트', '소포장 쌀', None]
+CATEGORY_PATHS = ['신선식품 > 과일 > 사과', ' 가공식품>즉석식품', '주방용품', '', '생활용품 > 세제']
+
+def make_data(n_users: int = 300, n_products: int = 200, n_logs: int = 3000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    products = pd.DataFrame({
+        'product_id': np.concatenate([np.arange(n_products), [5, 6]]),
+        'large_category': list(rng.choice(CATEGORIES, size=n_products)) + ['중복', '중복'],
+    })
+    users = pd.DataFrame({
+        'user_id': np.arange(n_users) + 1,
+        'interest_category': rng.choice(CATEGORIES[:4], size=n_users),
+        'birth': rng.choice(['1990-01-01', '2001-05-05', '1980-12-12', None], size=n_users),
+        'gender': rng.choice(['M', 'F'], size=n_users),
+    })
+    # 로그에는 users에 없는 사용자(0, n_users + 1)와 결측값도 포함
+    log_users = lambda: rng.integers(0, n_users + 2, size=n_logs)
+    search_logs = pd.DataFrame({
+        'user_id': log_users(),
+        'keyword': [KEYWORDS[i] for i in rng.integers(0, len(KEYWORDS), size=n_logs)],
+    })
+    click_ids = rng.integers(0, n_products, size=n_logs).astype(float)
+    click_ids[rng.random(n_logs) < 0.1] = np.nan
+    click_logs = pd.DataFrame({
+        'user_id': log_users(),
+        'product_id': click_ids,
+        'item_category': rng.choice(CATEGORY_PATHS, size=n_logs),
+    })
+    favorite_ids = rng.integers(0, n_products + 20, size=n_logs // 3).astype(float)
+    favorite_ids[rng.random(n_logs // 3) < 0.1] = np.nan
+    favorite_user_ids = rng.integers(0, n_users + 2, size=n_logs // 3).astype(float)
+    favorite_user_ids[:5] = np.nan
+    favorite_products = pd.DataFrame({'user_id': favorite_user_ids, 'product_id': favorite_ids})
+    return products, users, search_logs, click_logs, favorite_products
+
+def legacy_create_user_profiles(profiler: UserProfiler, users_df: pd.DataFrame) -> dict:
+    """기존 사용자별 전체 로그 필터링 방식"""
+    profiles = {}
+    for _, user in users_df.iterrows():
+        user_id = user['user_id']
+        age = UserProfiler.calculate_age(user.get('birth', None))
+        user_searches = profiler.filter_by_user(profiler.search_logs, user_id)
+        user_clicks = profiler.filter_by_user(profiler.click_logs, user_id)
+        user_favorites = profiler.filter_by_user(profiler.favorite_products, user_id)
+        search_keywords = user_searches['keyword'].dropna().tolist()[:10]
+        clicked_product_ids = user_clicks['product_id'].dropna().tolist()[:20]
+        favorite_product_ids = user_favorites['product_id'].dropna().astype(int).tolist()[:10]
+        total_actions = len(search_keywords) + len(clicked_product_ids) + len(favorite_product_ids)
+        profiles[user_id] = {
+            'user_id': user_id,
+            'base_interest_category': user.get('interest_category', None),
+            'age_group': UserProfiler.get_age_group(age),
+            'gender': user.get('gender', None),
+            'user_type': profiler.get_user_type(total_actions),
+            'search_keywords': search_keywords,
+            'clicked_product_ids': clicked_product_ids,
+            'favorite_product_ids': favorite_product_ids,
+            'favorite_categories': profiler.extract_categories_from_products(favorite_product_ids),
+            'clicked_categories': profiler.extract_categories_from_clicks(user_clicks),
+            'total_actions': total_actions,
+            'search_count': len(search_keywords),
+            'click_count': len(clicked_product_ids),
+            'favorite_count': len(favorite_product_ids)
+        }
+    return profiles
+
+def assert_same_profiles(profiles: dict, expected: dict):
+    assert list(profiles) == list(expected), "사용자 순서 오류"
+    for user_id, profile in expected.items():
+        assert list(profiles[user_id]) == list(profile), "프로필 키 오류"
+        for key, value in profile.items():
+            result = profiles[user_id][key]
+            assert result == value and type(result) is type(value), f"{user_id} {key}: {result!r} != {value!r}"
+            if isinstance(value, list):
+                assert [type(v) for v in result] == [type(v) for v in value], f"{user_id} {key} 값 타입 오류"
+
+def test_create_user_profiles_matches_legacy():
+    products, users, search_logs, click_logs, favorite_products = make_data()
+    profiler = UserProfiler(products, search_logs, click_logs, favorite_products)
+    profiles = profiler.create_user_profiles(users)
+    assert_same_profiles(profiles, legacy_create_user_profiles(profiler, users))
+
+    # 숫자 컬럼만 있는 사용자 데이터(행 단위 float 변환)와 중복 사용자
+    numeric_users = pd.DataFrame({'user_id': [3, 1, 3, 999], 'birth': [19900101.0, np.nan, 20000101.0, 19850101.0]})
+    assert_same_profiles(profiler.create_user_profiles(numeric_users), legacy_create_user_profiles(profiler, numeric_users))
+    print("UserProfiler.create_user_profiles 테스트 통과")
+
+if __name__ == "__main__":
+    test_create_user_profiles_matches_legacy()
@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+class CategoryMatcher:
+    """
+    대분류(large_category) 값과 추천 카테고리명의 매칭 규칙
+    - 카테고리 pool(CategoryPoolBuilder)과 FAISS 카테고리 sub-index(FAISSIndexManager)가 같은 규칙을 사용하도록 공유
+    """
+
+    @staticmethod
+    def positions(large_categories, category: str) -> np.ndarray:
+        """
+        대분류에 카테고리명이 포함된 상품의 행 위치 (예: '신선식품/수산'은 '신선식품'에 포함)
+        - 대분류를 categorical 코드로 변환해서, 포함 여부는 고유 대분류 값에 대해서만 검사
+          (str.contains(category, na=False)와 같음 - 결측/문자열이 아닌 값은 제외)
+        """
+        codes, values = pd.factorize(pd.Series(large_categories))
+        matching_codes = [code for code, value in enumerate(values) if isinstance(value, str) and category in value]
+        return np.flatnonzero(np.isin(codes, matching_codes))
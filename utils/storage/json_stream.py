@@ -0,0 +1,93 @@
+import re
+import json
+import codecs
+from itertools import chain
+from typing import Any, Iterable, Iterator
+
+class JsonArrayStream:
+    """
+    바이트 chunk로 들어오는 JSON 배열을 원소 단위로 파싱하는 클래스
+    - 전체 파일을 메모리에 올리지 않고, 아직 파싱하지 않은 부분(최대 chunk 1개 + 원소 1개)만 버퍼에 보관
+    - chunk 경계에서 잘린 UTF-8 문자는 incremental decoder가, 잘린 원소는 다음 chunk를 받은 뒤 다시 파싱
+    - 빠른 경로: 버퍼의 마지막 '}'까지를 '[...]'로 감싸서 json.loads 한 번으로 파싱
+      (잘린 위치가 문자열/중첩 객체 안이면 파싱이 실패하므로, 성공하면 항상 원소 경계에서 자른 것)
+      실패하면 해당 chunk는 원소 하나씩 파싱
+    """
+    WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+    # 파서 상태
+    START, FIRST, ITEM, SEPARATOR, END = range(5)
+
+    @classmethod
+    def iter_items(cls, chunks: Iterable[bytes], encoding: str = 'utf-8') -> Iterator[Any]:
+        """
+        Args:
+            chunks: JSON 배열 파일 내용의 바이트 chunk들 (순서대로)
+
+        Yields:
+            배열 원소 (json.loads와 같은 값)
+
+        Raises:
+            ValueError: JSON 배열 형식이 아니거나 파일이 중간에 끝난 경우
+        """
+        decoder = codecs.getincrementaldecoder(encoding)()
+        parser = json.JSONDecoder()
+        buffer, pos, state = '', 0, cls.START
+
+        for chunk in chain(chunks, [None]):
+            eof = chunk is None
+            buffer = buffer[pos:] + decoder.decode(b'' if eof else chunk, final=eof)
+            pos, fast = 0, True
+
+            while True:
+                pos = cls.WHITESPACE.match(buffer, pos).end()
+                if pos >= len(buffer):
+                    break
+                char = buffer[pos]
+
+                if state == cls.START:
+                    if char != '[':
+                        raise ValueError("JSON 배열 형식이 아닙니다.")
+                    pos, state = pos + 1, cls.FIRST
+                elif state == cls.FIRST and char == ']':
+                    pos, state = pos + 1, cls.END
+                elif state in (cls.FIRST, cls.ITEM):
+                    if fast:
+                        cut = buffer.rfind('}', pos) + 1
+                        try:
+                            items = json.loads('[' + buffer[pos:cut] + ']') if cut > pos else None
+                        except ValueError:
+                            items = None
+                        if items is None:
+                            fast = False
+                        else:
+                            yield from items
+                            pos, state = cut, cls.SEPARATOR
+                            continue
+
+                    try:
+                        item, end = parser.raw_decode(buffer, pos)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        break  # 원소가 chunk 경계에서 잘림
+                    # 원소 뒤의 ',' 또는 ']'까지 받은 뒤에만 확정
+                    # (숫자/리터럴은 '-7.5e'처럼 잘린 앞부분만으로도 파싱될 수 있으므로 다음 chunk를 기다림)
+                    if not eof:
+                        after = cls.WHITESPACE.match(buffer, end).end()
+                        if after >= len(buffer) or (buffer[pos] not in '{["' and buffer[after] not in ',]'):
+                            break
+                    yield item
+                    pos, state = end, cls.SEPARATOR
+                elif state == cls.SEPARATOR:
+                    if char == ',':
+                        pos, state = pos + 1, cls.ITEM
+                    elif char == ']':
+                        pos, state = pos + 1, cls.END
+                    else:
+                        raise ValueError(f"JSON 배열 구분자 오류: {char!r}")
+                else:
+                    raise ValueError("JSON 배열 뒤에 추가 데이터가 있습니다.")
+
+        if state != cls.END:
+            raise ValueError("JSON 배열이 끝나지 않았습니다.")
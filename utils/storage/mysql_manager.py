@@ -22,12 +22,12 @@ class MySQLManager:
             cursorclass=pymysql.cursors.DictCursor
         )
 
-    def execute_query(self, query: str) -> pd.DataFrame:
-        """SELECT 쿼리 결과를 DataFrame으로 반환"""
+    def execute_query(self, query: str, params=None) -> pd.DataFrame:
+        """SELECT 쿼리 결과를 DataFrame으로 반환 (params는 쿼리의 %s 자리에 바인딩)"""
         conn = self.get_connection()
         try:
             with conn.cursor() as cursor:
-                cursor.execute(query)
+                cursor.execute(query, params)
                 result = cursor.fetchall()
                 return pd.DataFrame(result)
         finally:
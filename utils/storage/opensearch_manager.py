@@ -1,4 +1,4 @@
-from opensearchpy import OpenSearch
+from opensearchpy import OpenSearch, helpers
 from config.opensearch_config import OPENSEARCH_CONFIG
 from config.opensearch_mappings import GROUP_RECOMMENDATION_MAPPING
 import logging
@@ -48,6 +48,27 @@ class OpenSearchManager:
         )
         logging.info(f"Uploaded recommendation data to OpenSearch index {self.index} with ID {doc_id}: {response}")
 
+    def bulk_upload(self, docs: list) -> tuple:
+        """
+        여러 문서를 bulk API 한 번으로 저장
+
+        Args:
+            docs (list): (doc_id, data) 튜플 리스트
+
+        Returns:
+            tuple: (성공 문서 수, 실패 항목 리스트)
+        """
+        if not docs:
+            return 0, []
+        self.create_index()  # 인덱스가 없으면 생성 (묶음당 한 번)
+        actions = [
+            {"_index": self.index, "_id": doc_id, "_source": data}
+            for doc_id, data in docs
+        ]
+        success, errors = helpers.bulk(self.client, actions, raise_on_error=False)
+        logging.info(f"Bulk uploaded {success}/{len(docs)} documents to OpenSearch index {self.index}")
+        return success, errors
+
     def get(self, doc_id: str) -> dict:
         try:
             response = self.client.get(index=self.index, id=doc_id)
@@ -1,7 +1,7 @@
 import boto3
 import json
 import logging
-from typing import List
+from typing import Iterator, List
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +30,20 @@ class S3Manager:
             logger.error(f"Failed to download from S3: {str(e)}")
             raise
 
+    def stream(self, key: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        """S3 객체를 chunk_size 바이트씩 읽어서 반환 (전체 내용을 메모리에 올리지 않음)"""
+        try:
+            response = self.s3.get_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            logger.error(f"Failed to download from S3: {str(e)}")
+            raise
+
+        body = response['Body']
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
     def list_objects(self, prefix: str) -> List[str]:
         """S3 버킷에서 prefix로 시작하는 객체 목록 조회"""
         try:
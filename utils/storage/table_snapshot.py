@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import datetime
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+
+from config.snapshot_config import (
+    TABLE_SNAPSHOT_DIR, TABLE_SNAPSHOT_SPECS, TABLE_SNAPSHOT_MIN_REFRESH_SEC,
+    TABLE_SNAPSHOT_FULL_REFRESH_HOURS, TABLE_SNAPSHOT_LOOKBACK_SEC
+)
+
+class TableSnapshotStore:
+    """
+    MySQL 테이블을 로컬 Parquet 스냅샷으로 보관하고 변경된 행만 다시 읽는 클래스
+    - 처음(또는 TABLE_SNAPSHOT_FULL_REFRESH_HOURS마다)에는 SELECT * 전체 읽기
+    - 이후에는 워터마크(updated_at 최댓값 또는 primary key 최댓값) 이후 변경된 행만 조회해서 primary key 기준으로 교체하고,
+      primary key 목록으로 삭제된 행을 제거
+    - 스냅샷은 primary key 순으로 정렬해서 저장하고, 정수 컬럼은 값 범위에 맞으면 int32, 지정한 컬럼만 category dtype으로 변환
+    - 스냅샷 파일은 임시 파일에 쓴 뒤 교체해서 다른 프로세스가 쓰는 도중의 파일을 읽지 않도록 함
+    - 규칙(TABLE_SNAPSHOT_SPECS)이 없는 테이블은 매번 DB에서 그대로 읽음
+    """
+    META_SUFFIX = '.meta.json'
+
+    def __init__(
+            self,
+            mysql,
+            snapshot_dir: str = TABLE_SNAPSHOT_DIR,
+            specs: Dict[str, Dict] = TABLE_SNAPSHOT_SPECS,
+            min_refresh_sec: float = TABLE_SNAPSHOT_MIN_REFRESH_SEC,
+            full_refresh_hours: float = TABLE_SNAPSHOT_FULL_REFRESH_HOURS,
+            lookback_sec: float = TABLE_SNAPSHOT_LOOKBACK_SEC
+        ):
+        """
+        Args:
+            mysql: MySQLManager (read_table, execute_query 사용)
+        """
+        self.mysql = mysql
+        self.snapshot_dir = snapshot_dir
+        self.specs = specs
+        self.min_refresh_sec = min_refresh_sec
+        self.full_refresh_hours = full_refresh_hours
+        self.lookback_sec = lookback_sec
+        self.last_refresh: Dict[str, Dict] = {}  # 테이블별 마지막 갱신 방식/행 수/소요 시간
+
+    def paths(self, table_name: str):
+        base = os.path.join(self.snapshot_dir, table_name)
+        return f"{base}.parquet", f"{base}{self.META_SUFFIX}"
+
+    def read_table(self, table_name: str) -> pd.DataFrame:
+        """
+        테이블 DataFrame 반환 (MySQLManager.read_table 대신 사용)
+        - 스냅샷이 최근에 갱신되었으면 그대로, 아니면 증분/전체 갱신 후 반환
+        - 스냅샷 읽기/쓰기에 실패하면 DB에서 전체를 읽어서 반환
+        """
+        spec = self.specs.get(table_name)
+        if spec is None:
+            return self.mysql.read_table(table_name)
+
+        start = time.perf_counter()
+        snapshot, meta = self.load(table_name, spec)
+        if snapshot is not None and time.time() - meta['refreshed_at'] < self.min_refresh_sec:
+            self.record(table_name, 'cached', 0, snapshot, start)
+            return snapshot
+
+        if snapshot is not None and time.time() - meta['full_refreshed_at'] < self.full_refresh_hours * 3600:
+            try:
+                df, changed = self.incremental_refresh(table_name, spec, snapshot)
+                if df is not None:
+                    self.save(table_name, spec, df, full_refreshed_at=meta['full_refreshed_at'])
+                    self.record(table_name, 'incremental', changed, df, start)
+                    return df
+            except Exception as e:
+                print(f"[WARN] {table_name} 스냅샷 증분 갱신 실패, 전체 다시 읽기: {e}")
+
+        df = self.compact_dtypes(self.mysql.read_table(table_name), spec)
+        df = self.sort_by_key(df, spec)
+        self.save(table_name, spec, df, full_refreshed_at=time.time())
+        self.record(table_name, 'full', len(df), df, start)
+        return df
+
+    def load(self, table_name: str, spec: Dict):
+        """저장된 스냅샷과 메타데이터 (없거나 규칙이 바뀌었거나 읽기에 실패하면 None)"""
+        data_path, meta_path = self.paths(table_name)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None, None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('spec') != spec:
+                return None, None
+            df = pd.read_parquet(data_path)
+            if len(df) != meta.get('rows'):
+                print(f"[WARN] {table_name} 스냅샷 행 수 불일치, 전체 다시 읽기")
+                return None, None
+            return df, meta
+        except Exception as e:
+            print(f"[WARN] {table_name} 스냅샷 로드 실패, 전체 다시 읽기: {e}")
+            return None, None
+
+    def save(self, table_name: str, spec: Dict, df: pd.DataFrame, full_refreshed_at: float):
+        """스냅샷과 메타데이터 저장 (실패해도 DataFrame은 그대로 사용)"""
+        data_path, meta_path = self.paths(table_name)
+        meta = {
+            'table': table_name,
+            'spec': spec,
+            'rows': len(df),
+            'refreshed_at': time.time(),
+            'full_refreshed_at': full_refreshed_at,
+        }
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            tmp_suffix = f".{os.getpid()}.tmp"
+            df.to_parquet(data_path + tmp_suffix, index=False)
+            with open(meta_path + tmp_suffix, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(data_path + tmp_suffix, data_path)
+            os.replace(meta_path + tmp_suffix, meta_path)
+        except Exception as e:
+            print(f"[WARN] {table_name} 스냅샷 저장 실패: {e}")
+
+    def incremental_refresh(self, table_name: str, spec: Dict, snapshot: pd.DataFrame):
+        """
+        워터마크 이후 변경된 행으로 스냅샷 갱신
+
+        Returns:
+            Tuple: (갱신된 DataFrame, 변경 행 수) - 증분 갱신을 할 수 없으면 (None, 0)
+        """
+        primary_key = spec['primary_key']
+        watermark_column = spec.get('watermark') or primary_key
+        if primary_key not in snapshot or watermark_column not in snapshot:
+            return None, 0
+
+        watermark = self.watermark(snapshot[watermark_column], use_lookback=watermark_column != primary_key)
+        if watermark is None:
+            changed = self.mysql.read_table(table_name)
+        else:
+            operator = '>' if watermark_column == primary_key else '>='
+            changed = self.mysql.execute_query(
+                f"SELECT * FROM `{table_name}` WHERE `{watermark_column}` {operator} %s", (watermark,)
+            )
+        if not changed.empty and set(changed.columns) != set(snapshot.columns):
+            # 컬럼 구성이 바뀌면 전체 다시 읽기
+            return None, 0
+
+        # 변경된 행 교체
+        df = snapshot
+        if not changed.empty:
+            changed = changed[list(snapshot.columns)]
+            df = pd.concat([snapshot[~snapshot[primary_key].isin(changed[primary_key])], changed], ignore_index=True)
+
+        # 삭제된 행 제거
+        keys = self.mysql.execute_query(f"SELECT `{primary_key}` FROM `{table_name}`")
+        key_values = keys[primary_key] if primary_key in keys else pd.Series([], dtype=object)
+        df = df[df[primary_key].isin(key_values)]
+
+        return self.sort_by_key(self.compact_dtypes(df, spec), spec), len(changed)
+
+    def watermark(self, values: pd.Series, use_lookback: bool) -> Optional[Any]:
+        """DB 조회 파라미터로 사용할 워터마크 값 (값이 없으면 None)"""
+        value = values.max() if len(values) else None
+        if value is None or pd.isna(value):
+            return None
+        if isinstance(value, pd.Timestamp):
+            value = value.to_pydatetime()
+        elif isinstance(value, np.generic):
+            value = value.item()
+        if use_lookback and isinstance(value, datetime.datetime):
+            value -= datetime.timedelta(seconds=self.lookback_sec)
+        return value
+
+    @staticmethod
+    def sort_by_key(df: pd.DataFrame, spec: Dict) -> pd.DataFrame:
+        primary_key = spec['primary_key']
+        if primary_key in df:
+            df = df.sort_values(primary_key, kind='stable')
+        return df.reset_index(drop=True)
+
+    @staticmethod
+    def compact_dtypes(df: pd.DataFrame, spec: Dict) -> pd.DataFrame:
+        """
+        메모리 절약용 dtype 변환
+        - int64 컬럼은 값이 int32 범위면 int32 (더 작은 정수형은 연산 시 overflow 위험이 있어 사용하지 않음)
+        - spec['categoricals']에 지정한 컬럼만 category
+        """
+        df = df.copy()
+        int32 = np.iinfo(np.int32)
+        for column in df.columns:
+            values = df[column]
+            if values.dtype == np.int64 and (values.empty or (values.min() >= int32.min and values.max() <= int32.max)):
+                df[column] = values.astype(np.int32)
+        for column in spec.get('categoricals', []):
+            if column in df and not isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype('category')
+        return df
+
+    def record(self, table_name: str, mode: str, changed: int, df: pd.DataFrame, start: float):
+        elapsed = time.perf_counter() - start
+        self.last_refresh[table_name] = {'mode': mode, 'changed_rows': changed, 'rows': len(df), 'seconds': elapsed}
+        print(f"[INFO] {table_name} 스냅샷 로드 ({mode}): {len(df)}행, 변경 {changed}행, {elapsed:.2f}초")